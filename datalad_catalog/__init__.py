@@ -62,6 +62,12 @@ command_suite = (
             "catalog-remove",
             "catalog_remove",
         ),
+        (
+            "datalad_catalog.export",
+            "Export",
+            "catalog-export",
+            "catalog_export",
+        ),
         (
             "datalad_catalog.tree",
             "Tree",
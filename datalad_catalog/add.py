@@ -14,6 +14,8 @@ from datalad_catalog.constraints import (
     metadata_constraint,
 )
 import datalad_catalog.constants as cnst
+from datalad_catalog.jsonl import json_loads
+from datalad_catalog.utils import md5hash
 from datalad_catalog.webcatalog import WebCatalog
 from datalad_next.commands import (
     EnsureCommandParameterization,
@@ -24,14 +26,19 @@ from datalad_next.commands import (
     get_status_dict,
 )
 from datalad_next.constraints import (
+    EnsureBool,
+    EnsureFloat,
+    EnsureInt,
     EnsurePath,
+    EnsureRange,
 )
 from datalad_next.exceptions import CapturedException
 
-import json
+from concurrent.futures import ProcessPoolExecutor
 from jsonschema import ValidationError
 import logging
 from pathlib import Path
+import pickle
 from typing import Union
 
 
@@ -39,6 +46,9 @@ __docformat__ = "restructuredtext"
 
 lgr = logging.getLogger("datalad.catalog.add")
 
+# Default number of records per batch when adding records in parallel
+PARALLEL_BATCH_SIZE = 1000
+
 
 class AddParameterValidator(EnsureCommandParameterization):
     """"""
@@ -49,6 +59,10 @@ class AddParameterValidator(EnsureCommandParameterization):
                 catalog=CatalogRequired() & EnsureWebCatalog(),
                 metadata=metadata_constraint,
                 config_file=EnsurePath(lexists=True),
+                batch_size=EnsureInt() & EnsureRange(min=1),
+                jobs=EnsureInt() & EnsureRange(min=1),
+                lock_timeout=EnsureFloat() & EnsureRange(min=0),
+                catalog_lock=EnsureBool(),
             ),
         )
 
@@ -90,6 +104,43 @@ class Add(ValidatedInterface):
             Default config is read from:
             'datalad_catalog/config/config.json'""",
         ),
+        batch_size=Parameter(
+            # cmdline argument definitions, incl aliases
+            args=("--batch-size",),
+            # documentation
+            doc="""Number of metadata records to add to the catalog in a
+            single batch. Records in a batch are merged per dataset-version
+            in memory, so that each metadata file in the catalog is written
+            only once per batch. By default, records are added one at a time
+            (or in batches of 1000 records if records are added in parallel).""",
+        ),
+        jobs=Parameter(
+            # cmdline argument definitions, incl aliases
+            args=("-J", "--jobs"),
+            # documentation
+            doc="""Number of parallel processes used to add metadata records
+            to the catalog. Records are distributed across processes based on
+            their dataset_id, so that all records of a given dataset are
+            always added by the same process. By default, records are added
+            in the current process.""",
+        ),
+        lock_timeout=Parameter(
+            # cmdline argument definitions, incl aliases
+            args=("--lock-timeout",),
+            # documentation
+            doc="""Maximum number of seconds to wait for another process
+            that is adding metadata of the same dataset-version to the
+            catalog. Records that could not be added in time are reported as
+            errors. By default, there is no timeout.""",
+        ),
+        catalog_lock=Parameter(
+            # cmdline argument definitions, incl aliases
+            args=("--catalog-lock",),
+            action="store_true",
+            # documentation
+            doc="""Lock the whole catalog while adding a batch of
+            records, instead of locking each dataset-version separately.""",
+        ),
     )
 
     _examples_ = [
@@ -125,6 +176,28 @@ class Add(ValidatedInterface):
                 "-c /tmp/my-cat -F path/to/dataset_config_file.json"
             ),
         ),
+        dict(
+            text="Add metadata from file to an existing catalog in bulk",
+            code_py=(
+                "catalog_add(catalog='/tmp/my-cat', "
+                "metadata='path/to/metadata.jsonl', batch_size=10000)"
+            ),
+            code_cmd=(
+                "datalad catalog-add "
+                "-c /tmp/my-cat -m path/to/metadata.jsonl --batch-size 10000"
+            ),
+        ),
+        dict(
+            text="Add metadata from file to an existing catalog using 8 processes",
+            code_py=(
+                "catalog_add(catalog='/tmp/my-cat', "
+                "metadata='path/to/metadata.jsonl', jobs=8)"
+            ),
+            code_cmd=(
+                "datalad catalog-add "
+                "-c /tmp/my-cat -m path/to/metadata.jsonl -J 8"
+            ),
+        ),
     ]
 
     @staticmethod
@@ -136,6 +209,10 @@ class Add(ValidatedInterface):
         catalog: Union[Path, WebCatalog],
         metadata,
         config_file=None,
+        batch_size: int = None,
+        jobs: int = None,
+        lock_timeout: float = None,
+        catalog_lock: bool = False,
     ):
         # Instantiate WebCatalog class if necessary
         if isinstance(catalog, WebCatalog):
@@ -144,102 +221,282 @@ class Add(ValidatedInterface):
             ctlg = WebCatalog(
                 location=catalog,
             )
+        # Concurrent processes adding to the same catalog are serialized
+        # per dataset-version (or catalog-wide) via lock files
+        if lock_timeout is not None:
+            ctlg.lock_timeout = lock_timeout
+        if catalog_lock:
+            ctlg.catalog_lock = True
+        lock_kwargs = dict(
+            lock_timeout=ctlg.lock_timeout, catalog_lock=ctlg.catalog_lock
+        )
 
         res_kwargs = dict(
             action="catalog_add",
             path=ctlg.location,
         )
 
+        # Complete or undo transactions of a previously interrupted run
+        ctlg.recover()
+
         # input validation allows for a JSON-serialized string
         # handled by EnsureJSON (which seems to return a dict)
         # -> turn this into a list for uniform processing below
         if isinstance(metadata, (str, dict)):
             metadata = [metadata]
+        if jobs is None:
+            jobs = 1
+        if batch_size is None:
+            batch_size = 1 if jobs == 1 else PARALLEL_BATCH_SIZE
+        # Records are either added in the current process, or distributed
+        # across worker processes that each own the records (and thus the
+        # Node instances) of a subset of all datasets
+        if jobs == 1:
+            add_records = ctlg.add_records
+            executors = []
+        else:
+            executors = [
+                ProcessPoolExecutor(max_workers=1) for j in range(jobs)
+            ]
+
+            def add_records(records, config_file):
+                # worker processes are forked on demand, and must not inherit
+                # open database connections of the metadata store
+                ctlg.store.close()
+                results = _add_records_sharded(
+                    executors, ctlg.location, records, config_file, lock_kwargs
+                )
+                # Nodes were modified by the workers, forget about any
+                # cached state of them in the current process
+                dataset_versions = {
+                    (
+                        record.get(cnst.DATASET_ID),
+                        record.get(cnst.DATASET_VERSION),
+                    )
+                    for record in records
+                }
+                for d_id, d_version in dataset_versions:
+                    ctlg.node_cache.invalidate(d_id, d_version)
+                return results
 
         # PROCESS DESCRIPTION FOR "add":
         # 1. Read lines into python dictionaries. For each line:
         #    - Validate the dictionary against the catalog schema
-        #    - Instantiate the MetaItem class, which handles translation of a json line into
-        #      the Node instances that populate the catalog
-        #    - For the MetaItem instance, write all related Node instances to file
-        i = 0
-        for line in metadata:
-            i += 1
-            if isinstance(line, CapturedException):
-                # the generator encountered an exception for a particular
-                # item and is relaying it as per instructions
-                # exc_mode='yield'. We report and move on. Outside
-                # flow logic will decide if processing continues
-                yield get_status_dict(
+        #    - Collect validated dictionaries into a batch
+        # 2. For each full batch:
+        #    - Instantiate the MetaItem class per dictionary, which handles
+        #      translation of a json line into the Node instances that populate
+        #      the catalog (shared by all lines of the same dataset-version)
+        #    - Write all related Node instances to file
+        # Results are reported in input order, i.e. results of lines that
+        # failed validation are held back until the preceding batch is added
+        try:
+            yield from _add_all(
+                ctlg, metadata, config_file, batch_size, add_records, res_kwargs
+            )
+        finally:
+            for executor in executors:
+                executor.shutdown()
+            if ctlg.lock_stats.contended or ctlg.lock_stats.timeouts:
+                lgr.info("Lock contention: %s", ctlg.lock_stats.as_dict())
+
+
+def _add_all(
+    ctlg: WebCatalog,
+    metadata,
+    config_file,
+    batch_size: int,
+    add_records,
+    res_kwargs: dict,
+):
+    """Validate metadata records and add them to the catalog in batches
+
+    Yields result records in input order
+    """
+    pending = []
+    n_records = 0
+    i = 0
+    for line in metadata:
+        i += 1
+        if isinstance(line, CapturedException):
+            # the generator encountered an exception for a particular
+            # item and is relaying it as per instructions
+            # exc_mode='yield'. We report and move on. Outside
+            # flow logic will decide if processing continues
+            pending.append(
+                get_status_dict(
                     **res_kwargs,
                     status="error",
                     exception=line,
                 )
-                continue
+            )
+        else:
             # load json object into dict
             if isinstance(line, str):
-                meta_dict = json.loads(line.rstrip())
+                meta_dict = json_loads(line)
             else:
                 meta_dict = line
-            # Check if line is a dict
-            if not isinstance(meta_dict, dict):
-                err_msg = (
-                    "Metadata item not of type dict: metadata items should be "
-                    "passed to datalad catalog as JSON objects adhering to the "
-                    "catalog schema."
-                )
-                yield get_status_dict(
-                    **res_kwargs,
-                    status="impossible",
-                    message=err_msg,
-                )
-                continue
-            # Validate dict against catalog schema
-            try:
-                ctlg.schema_validator.validate(meta_dict)
-            except ValidationError as e:
-                err_msg = f"Schema validation failed in LINE {i}: \n\n{e}"
-                yield get_status_dict(
-                    **res_kwargs,
-                    status="error",
-                    message=err_msg,
-                    exception=e,
-                )
-                continue
-            # If validation passed, add the record to the catalog
-            # This involves translating the record into Node instances
-            # and creating/updating their respective metadata files
-            try:
-                record_props = ctlg.add_record(meta_dict, config_file)
-                if record_props.get("action") == "add":
-                    success_msg_part1 = (
-                        "Metadata record successfully added to catalog"
-                    )
-                else:
-                    success_msg_part1 = (
-                        "Metadata record successfully updated in catalog"
-                    )
-                if record_props.get("type") == "dataset":
-                    success_msg_part2 = "dataset:"
-                else:
-                    success_msg_part2 = "filetree of dataset:"
+            res = _validate_record(ctlg, meta_dict, i, res_kwargs)
+            if res is None:
+                pending.append((i, meta_dict))
+                n_records += 1
+            else:
+                pending.append(res)
+        # Add the batch once it is full, or report results right away
+        # if there is nothing to add
+        if n_records >= batch_size or n_records == 0:
+            yield from _add_batch(add_records, pending, config_file, res_kwargs)
+            pending = []
+            n_records = 0
+    yield from _add_batch(add_records, pending, config_file, res_kwargs)
 
-                yield get_status_dict(
-                    **res_kwargs,
-                    status="ok",
-                    message=(
-                        f"{success_msg_part1} "
-                        f"({success_msg_part2} dataset_id={meta_dict[cnst.DATASET_ID]}, "
-                        f"dataset_version={meta_dict[cnst.DATASET_VERSION]})"
-                    ),
-                    metadata=meta_dict,
-                )
-            except Exception as e:
-                err_msg = f"Catalog add operation failed in LINE {i}: \n\n{e}"
-                yield get_status_dict(
-                    **res_kwargs,
-                    status="error",
-                    message=err_msg,
-                    exception=e,
+
+def _validate_record(ctlg: WebCatalog, meta_dict, i: int, res_kwargs: dict):
+    """Validate a single metadata record against the catalog schema
+
+    Returns None if the record is valid, else a result record
+    """
+    # Check if line is a dict
+    if not isinstance(meta_dict, dict):
+        err_msg = (
+            "Metadata item not of type dict: metadata items should be "
+            "passed to datalad catalog as JSON objects adhering to the "
+            "catalog schema."
+        )
+        return get_status_dict(
+            **res_kwargs,
+            status="impossible",
+            message=err_msg,
+        )
+    # Validate dict against catalog schema
+    try:
+        ctlg.schema_validator.validate(meta_dict)
+    except ValidationError as e:
+        err_msg = f"Schema validation failed in LINE {i}: \n\n{e}"
+        return get_status_dict(
+            **res_kwargs,
+            status="error",
+            message=err_msg,
+            exception=e,
+        )
+    return None
+
+
+def _add_batch(add_records, pending: list, config_file, res_kwargs: dict):
+    """Add a batch of validated records to the catalog and yield results
+
+    'pending' is a list of which each item is either a result record that
+    is yielded as is, or a (line number, metadata record) tuple of a
+    validated metadata record that should be added to the catalog.
+    """
+    records = [p for p in pending if isinstance(p, tuple)]
+    # If validation passed, add the records to the catalog
+    # This involves translating the records into Node instances
+    # and creating/updating their respective metadata files
+    all_record_props = iter(add_records([r[1] for r in records], config_file))
+    for p in pending:
+        if not isinstance(p, tuple):
+            yield p
+            continue
+        i, meta_dict = p
+        record_props = next(all_record_props)
+        if "exception" in record_props:
+            e = record_props["exception"]
+            err_msg = f"Catalog add operation failed in LINE {i}: \n\n{e}"
+            yield get_status_dict(
+                **res_kwargs,
+                status="error",
+                message=err_msg,
+                exception=e,
+            )
+            continue
+        if record_props.get("action") == "add":
+            success_msg_part1 = "Metadata record successfully added to catalog"
+        else:
+            success_msg_part1 = (
+                "Metadata record successfully updated in catalog"
+            )
+        if record_props.get("type") == "dataset":
+            success_msg_part2 = "dataset:"
+        else:
+            success_msg_part2 = "filetree of dataset:"
+
+        yield get_status_dict(
+            **res_kwargs,
+            status="ok",
+            message=(
+                f"{success_msg_part1} "
+                f"({success_msg_part2} dataset_id={meta_dict[cnst.DATASET_ID]}, "
+                f"dataset_version={meta_dict[cnst.DATASET_VERSION]})"
+            ),
+            metadata=meta_dict,
+        )
+
+
+def _add_records_sharded(
+    executors: list,
+    location: Path,
+    records: list,
+    config_file,
+    lock_kwargs: dict = None,
+):
+    """Add records to the catalog using one worker process per shard
+
+    Records are assigned to shards based on their dataset_id, and each shard
+    is always handled by the same worker process (i.e. executor). Returns
+    the per-record results of WebCatalog.add_records in input order.
+    """
+    shards = {}
+    for idx, record in enumerate(records):
+        shard = int(md5hash(str(record.get(cnst.DATASET_ID))), 16) % len(
+            executors
+        )
+        shards.setdefault(shard, []).append(idx)
+    futures = {
+        shard: executors[shard].submit(
+            _add_records_in_worker,
+            location,
+            [records[idx] for idx in idxs],
+            config_file,
+            lock_kwargs,
+        )
+        for shard, idxs in shards.items()
+    }
+    results = [None] * len(records)
+    for shard, idxs in shards.items():
+        try:
+            shard_results = futures[shard].result()
+        except Exception as e:
+            shard_results = [
+                dict(type=records[idx].get(cnst.TYPE), exception=e)
+                for idx in idxs
+            ]
+        for idx, record_props in zip(idxs, shard_results):
+            results[idx] = record_props
+    return results
+
+
+# Catalog instances of a worker process, which persist (together with their
+# node cache) across the batches handled by the worker
+_worker_catalogs = {}
+
+
+def _add_records_in_worker(
+    location: Path, records: list, config_file, lock_kwargs: dict = None
+):
+    """Add records to the catalog from within a worker process"""
+    if location not in _worker_catalogs:
+        _worker_catalogs[location] = WebCatalog(
+            location=location, **(lock_kwargs or {})
+        )
+    results = _worker_catalogs[location].add_records(records, config_file)
+    # exceptions are sent back to the main process, so they must be picklable
+    for record_props in results:
+        if "exception" in record_props:
+            try:
+                pickle.dumps(record_props["exception"])
+            except Exception:
+                record_props["exception"] = RuntimeError(
+                    str(record_props["exception"])
                 )
-                continue
+    return results
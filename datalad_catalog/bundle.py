@@ -0,0 +1,137 @@
+import json
+import logging
+from pathlib import Path
+import uuid
+from datalad_catalog.pages import paginate_children
+from datalad_catalog.utils import (
+    md5sum_from_id_version_path,
+    remove_file,
+    write_json_file,
+)
+
+lgr = logging.getLogger("datalad.catalog.bundle")
+
+# Name of the bundle index in the directory of a dataset version
+BUNDLE_INDEX_FILENAME = "bundle.json"
+# Default maximum size of a bundle shard in bytes
+DEFAULT_SHARD_SIZE = 64 * 1024 * 1024
+
+
+def get_bundle_index_path(metadata_path: Path, dataset_id, dataset_version):
+    """Return the path of the bundle index of a dataset version"""
+    return (
+        Path(metadata_path)
+        / dataset_id
+        / dataset_version
+        / BUNDLE_INDEX_FILENAME
+    )
+
+
+def discard_bundle(metadata_path: Path, dataset_id, dataset_version):
+    """Remove the bundle index of a dataset version, e.g. once its metadata
+    changed, so that its outdated bundle is no longer used
+
+    Shards are removed when the dataset version is bundled again.
+    """
+    remove_file(
+        get_bundle_index_path(metadata_path, dataset_id, dataset_version)
+    )
+
+
+def export_bundles(store, shard_size: int = DEFAULT_SHARD_SIZE) -> int:
+    """Bundle all dataset versions of a metadata store whose metadata
+    changed since they were last bundled, see write_bundle()
+
+    Returns the number of written files.
+    """
+    n_files = 0
+    for dataset_id, dataset_version in store.iter_dataset_versions():
+        n_files += write_bundle(store, dataset_id, dataset_version, shard_size)
+    return n_files
+
+
+def write_bundle(
+    store,
+    dataset_id: str,
+    dataset_version: str,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+) -> int:
+    """Pack the metadata of all Node instances of a dataset version into a
+    bundle in the directory of the dataset version
+
+    A bundle consists of shards, which contain the JSON metadata of Node
+    instances back to back, and of an index (BUNDLE_INDEX_FILENAME) that maps
+    the md5 hash of each Node instance to its shard and byte range. The
+    browser thus fetches the metadata of a Node instance with a range
+    request instead of fetching its file. If the catalog paginates children
+    (see pages.paginate_children()), further pages of children are packed
+    as well, keyed by "<md5 hash>/<page>". A new shard is started once a
+    shard reaches shard_size bytes.
+
+    Shards get new names on every write, and the index is replaced after all
+    shards were written, so that readers never see partially written
+    bundles. The index records the stamp of the dataset node (see
+    storage.MetadataStore.get_node_stamp), which changes with every update
+    of the dataset version, and the bundle is only written again if the
+    stamp changed.
+
+    Returns the number of written files.
+    """
+    version_path = store.catalog.metadata_path / dataset_id / dataset_version
+    index_path = version_path / BUNDLE_INDEX_FILENAME
+    # normalize the stamp to its JSON representation
+    stamp = json.loads(
+        json.dumps(
+            store.get_node_stamp(
+                dataset_id,
+                dataset_version,
+                md5sum_from_id_version_path(dataset_id, dataset_version),
+            )
+        )
+    )
+    try:
+        with open(index_path) as f:
+            if json.load(f).get("stamp") == stamp:
+                return 0
+    except (FileNotFoundError, ValueError):
+        pass
+    version_path.mkdir(parents=True, exist_ok=True)
+    prefix = f"bundle-{uuid.uuid4().hex[:8]}"
+    shards = []
+    nodes = {}
+    shard = None
+    try:
+        for md5_hash, content in store.iter_nodes(dataset_id, dataset_version):
+            content, pages = paginate_children(
+                content, store.catalog.children_page_size
+            )
+            entries = [(md5_hash, content)] + [
+                (f"{md5_hash}/{page}", page_content)
+                for page, page_content in enumerate(pages, start=1)
+            ]
+            for key, entry in entries:
+                data = json.dumps(entry).encode("utf-8")
+                if shard is None or shard.tell() >= shard_size:
+                    if shard is not None:
+                        shard.close()
+                    shards.append(f"{prefix}-{len(shards)}.pack")
+                    shard = open(version_path / shards[-1], "wb")
+                nodes[key] = [len(shards) - 1, shard.tell(), len(data)]
+                shard.write(data)
+                shard.write(b"\n")
+    except BaseException:
+        for name in shards:
+            remove_file(version_path / name)
+        raise
+    finally:
+        if shard is not None:
+            shard.close()
+    write_json_file(
+        index_path,
+        dict(stamp=stamp, shards=shards, nodes=nodes),
+    )
+    # remove shards of previous bundles
+    for path in version_path.glob("bundle-*.pack"):
+        if path.name not in shards:
+            remove_file(path)
+    return len(shards) + 1
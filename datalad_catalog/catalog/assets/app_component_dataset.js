@@ -35,6 +35,7 @@ const datasetView = () =>
             display_ready: false,
             displayData: {},
             files_ready: false,
+            files_page_loading: false,
             tags_ready: false,
             description_ready: false,
             citation_busy: false,
@@ -891,11 +892,36 @@ const datasetView = () =>
             this.$root.selectedDataset.tree = this.$root.selectedDataset["children"];
             this.files_ready = true;
           },
+          remainingFiles() {
+            const sDs = this.selectedDataset;
+            if (getNextChildrenPage(sDs, sDs.tree) === null) {
+              return 0;
+            }
+            return sDs.children_count - sDs.tree.length;
+          },
+          async loadMoreFiles() {
+            // load the next page of the children of a large dataset
+            const sDs = this.$root.selectedDataset;
+            const page = getNextChildrenPage(sDs, sDs.tree);
+            if (page === null || this.files_page_loading) {
+              return;
+            }
+            this.files_page_loading = true;
+            try {
+              const file = getFilePath(sDs.dataset_id, sDs.dataset_version, null);
+              const children = await fetchChildrenPage(file, page);
+              sDs.tree.push(...children);
+            } catch (error) {
+              console.error(error);
+            } finally {
+              this.files_page_loading = false;
+            }
+          },
           async getNodeChildren() {
             this.files_ready = false;
             file_hash = this.selectedDataset.children;
             file = metadata_dir + "/" + file_hash + ".json";
-            response = await fetch(file, {cache: "no-cache"});
+            response = await fetchMetadataFile(file);
             text = await response.text();
             obj = JSON.parse(text);
             this.$root.selectedDataset.tree = obj["children"];
@@ -965,7 +991,7 @@ const datasetView = () =>
           this.subdatasets_ready = false;
           this.dataset_ready = false;
           file = getFilePath(to.params.dataset_id, to.params.dataset_version, null);
-          response = await fetch(file, {cache: "no-cache"});
+          response = await fetchMetadataFile(file);
           text = await response.text();
           response_obj = JSON.parse(text);
           // if the object.type is redirect (i.e. the url parameter is an alias for or ID
@@ -1153,7 +1179,7 @@ const datasetView = () =>
             null
           );
           var app = this.$root;
-          response = await fetch(file, {cache: "no-cache"});
+          response = await fetchMetadataFile(file);
           // Reroute to 404 if the dataset file is not found
           if (response.status == 404) {
             router.push({
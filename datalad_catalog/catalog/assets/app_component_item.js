@@ -18,6 +18,7 @@ Vue.component('tree-item', function (resolve, reject) {
                 files_ready: false,
                 spinner_on: null,
                 children: [],
+                page_loading: false,
               };
             },
             computed: {
@@ -49,27 +50,59 @@ Vue.component('tree-item', function (resolve, reject) {
                     this.files_ready = false;
                     this.spinner_on = true;
                     obj = await this.getChildren(this.item);
+                    // only the first page of the children of large
+                    // directories, further pages are loaded by loadMoreChildren
+                    for (const key of ["children_count", "children_pages", "children_page_size"]) {
+                      this.item[key] = obj[key];
+                    }
+                    await this.setChildrenState(obj["children"]);
                     this.item.children = obj["children"];
-                    // go through all children, set state to enabled
-                    // then set disabled state for subdatasets that aren't part of catalog
-                    await Promise.all(
-                      this.item.children.map(async (child, index) => {
-                        child['state'] = 'enabled'
-                        if (child.type == "dataset") {
-                          file = getFilePath(child.dataset_id, child.dataset_version, "");
-                          fileExists = await checkFileExists(file);
-                          if (!fileExists) {
-                            child['state'] = 'disabled'
-                          }
-                        }
-                      })
-                    );
                     this.files_ready = true;
                     this.spinner_on = false;
                   }
                   this.isOpen = !this.isOpen;
                 }
               },
+              async setChildrenState(children) {
+                // go through all children, set state to enabled
+                // then set disabled state for subdatasets that aren't part of catalog
+                await Promise.all(
+                  children.map(async (child, index) => {
+                    child['state'] = 'enabled'
+                    if (child.type == "dataset") {
+                      const file = getFilePath(child.dataset_id, child.dataset_version, "");
+                      const fileExists = await checkFileExists(file);
+                      if (!fileExists) {
+                        child['state'] = 'disabled'
+                      }
+                    }
+                  })
+                );
+              },
+              remainingChildren() {
+                if (getNextChildrenPage(this.item, this.item.children) === null) {
+                  return 0;
+                }
+                return this.item.children_count - this.item.children.length;
+              },
+              async loadMoreChildren() {
+                const item = this.item;
+                const page = getNextChildrenPage(item, item.children);
+                if (page === null || this.page_loading) {
+                  return;
+                }
+                this.page_loading = true;
+                try {
+                  const file = getFilePath(item.dataset_id, item.dataset_version, item.path);
+                  const children = await fetchChildrenPage(file, page);
+                  await this.setChildrenState(children);
+                  item.children.push(...children);
+                } catch (error) {
+                  console.error(error);
+                } finally {
+                  this.page_loading = false;
+                }
+              },
               async selectDataset(event, obj, objId, objVersion) {
                 var newBrowserTab = event.ctrlKey || event.metaKey || (event.button == 1)
                 if (obj != null) {
@@ -119,7 +152,7 @@ Vue.component('tree-item', function (resolve, reject) {
                 obj.dataset_version = this.$root.selectedDataset.dataset_version;
                 file = getFilePath(obj.dataset_id, obj.dataset_version, obj.path);
                 try {
-                  response = await fetch(file, {cache: "no-cache"});
+                  response = await fetchMetadataFile(file);
                   text = await response.text();
                 } catch (error) {
                   console.error(error);
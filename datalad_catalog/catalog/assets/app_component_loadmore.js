@@ -0,0 +1,37 @@
+// Component definition: end of a paginated list of children in the data
+// tree, which requests the next page once it is scrolled into view
+Vue.component('load-more', {
+  template: '<li class="load-more"><span v-if="loading"><b-spinner small label="Loading..."></b-spinner></span><a v-else class="showpointer" @click="$emit(\'load\')"><em>Show {{ remaining }} more</em></a></li>',
+  props: {
+    loading: Boolean,
+    remaining: Number,
+  },
+  mounted() {
+    if ("IntersectionObserver" in window) {
+      this.observer = new IntersectionObserver(
+        (entries) => {
+          if (!this.loading && entries.some((entry) => entry.isIntersecting)) {
+            this.$emit("load");
+          }
+        },
+        {rootMargin: "200px"}
+      );
+      this.observer.observe(this.$el);
+    }
+  },
+  watch: {
+    loading: function (newVal, oldVal) {
+      // observe again once a page is loaded, which requests the next page
+      // if this is still in view
+      if (!newVal && this.observer) {
+        this.observer.unobserve(this.$el);
+        this.observer.observe(this.$el);
+      }
+    },
+  },
+  beforeDestroy() {
+    if (this.observer) {
+      this.observer.disconnect();
+    }
+  },
+});
@@ -6,6 +6,7 @@ const template_dir = "templates";
 const config_file = "config.json";
 const metadata_dir = "metadata";
 const superdatasets_file = metadata_dir + "/super.json";
+const bundle_index_file = "bundle.json";
 const SPLIT_INDEX = 3;
 const SHORT_NAME_LENGTH = 0; // number of characters in name to display, zero if all
 const default_config = {
@@ -26,6 +27,9 @@ const default_config = {
   }
 };
 
+// Promises of the bundle indexes of dataset versions, by their directory
+const bundle_indexes = {};
+
 /*************/
 // Functions //
 /*************/
@@ -37,7 +41,7 @@ async function grabSubDatasets(app) {
       id_and_version = subds.dataset_id + "-" + subds.dataset_version;
       subds_file = getFilePath(subds.dataset_id, subds.dataset_version, null);
       try {
-        subds_response = await fetch(subds_file, {cache: "no-cache"});
+        subds_response = await fetchMetadataFile(subds_file);
         subds_text = await subds_response.text();
       } catch (e) {
         console.error(e);
@@ -92,7 +96,124 @@ function getRelativeFilePath(dataset_id, dataset_version, path) {
   return file_path;
 }
 
+function getBundleIndex(version_dir) {
+  // Fetch the bundle index of a dataset version (once), resolves to null
+  // if the dataset version is not bundled
+  if (!(version_dir in bundle_indexes)) {
+    bundle_indexes[version_dir] = fetch(
+      version_dir + "/" + bundle_index_file,
+      {cache: "no-cache"}
+    )
+      .then((response) => (response.ok ? response.json() : null))
+      .catch(() => null);
+  }
+  return bundle_indexes[version_dir];
+}
+
+async function getBundleLocation(file) {
+  // Locate a node file (as returned by getFilePath) in the bundle of its
+  // dataset version. Returns undefined if the dataset version is not
+  // bundled, null if the bundle does not contain the node, else the URL
+  // of the bundle shard and the byte range of the node within it
+  const parts = file.split("/");
+  // metadata/dataset_id/dataset_version/hash_left/hash_right.json, or for
+  // pages of children metadata/dataset_id/dataset_version/hash_left/
+  // hash_right/page.json
+  if (
+    (parts.length != 5 && parts.length != 6) ||
+    parts[0] != metadata_dir ||
+    !parts[parts.length - 1].endsWith(".json")
+  ) {
+    return undefined;
+  }
+  const version_dir = parts.slice(0, 3).join("/");
+  const index = await getBundleIndex(version_dir);
+  if (!index) {
+    return undefined;
+  }
+  // nodes are keyed by their md5 hash, and pages by "<md5 hash>/<page>"
+  const key = (parts[3] + parts.slice(4).join("/")).slice(0, -".json".length);
+  const node = index.nodes[key];
+  if (!node) {
+    return null;
+  }
+  return {
+    url: version_dir + "/" + index.shards[node[0]],
+    offset: node[1],
+    length: node[2],
+  };
+}
+
+async function fetchMetadataFile(file) {
+  // Fetch a node file (as returned by getFilePath). If its dataset version
+  // is bundled, only the node is fetched from the bundle via an HTTP range
+  // request, and returned as a separate response
+  const location_in_bundle = await getBundleLocation(file);
+  if (location_in_bundle === undefined) {
+    return fetch(file, {cache: "no-cache"});
+  }
+  if (location_in_bundle === null) {
+    return new Response(null, {status: 404});
+  }
+  const start = location_in_bundle.offset;
+  const end = start + location_in_bundle.length;
+  // shards are never modified (but replaced by new shards), so they can
+  // be cached
+  const response = await fetch(location_in_bundle.url, {
+    headers: {Range: "bytes=" + start + "-" + (end - 1)},
+  });
+  if (!response.ok) {
+    return response;
+  }
+  let body = await response.arrayBuffer();
+  if (response.status != 206) {
+    // the server does not support range requests and sent the whole shard
+    body = body.slice(start, end);
+  }
+  return new Response(body, {
+    status: 200,
+    headers: {"Content-Type": "application/json"},
+  });
+}
+
+function getPageFilePath(file, page) {
+  // Get the location of a page of the children of a paginated node from
+  // the location of its node file (as returned by getFilePath)
+  return file.slice(0, -".json".length) + "/" + page + ".json";
+}
+
+function getNextChildrenPage(node, children) {
+  // Get the number of the next page of children of a node, given the
+  // children loaded so far, or null if all children are loaded. Nodes with
+  // more children than the children_page_size of the catalog config only
+  // contain the first page of their children, further pages are separate
+  // files (see getPageFilePath)
+  if (!node || !node.children_pages || !node.children_page_size || !children) {
+    return null;
+  }
+  // all pages but the last are full
+  const page = Math.ceil(children.length / node.children_page_size);
+  return page < node.children_pages ? page : null;
+}
+
+async function fetchChildrenPage(file, page) {
+  // Fetch the children on a page of a paginated node, given the location of
+  // its node file (as returned by getFilePath)
+  const response = await fetchMetadataFile(getPageFilePath(file, page));
+  if (!response.ok) {
+    throw new Error(
+      "Could not fetch page " + page + " of " + file + ": " + response.status
+    );
+  }
+  const obj = await response.json();
+  return obj["children"] || [];
+}
+
 async function checkFileExists(url) {
+  const location_in_bundle = await getBundleLocation(url);
+  if (location_in_bundle !== undefined) {
+    return location_in_bundle !== null;
+  }
   try {
     const response = await fetch(url, {
       method: "HEAD",
@@ -0,0 +1,188 @@
+"""Precompressed (gzip / brotli) siblings of catalog files
+"""
+import gzip
+import logging
+import os
+from pathlib import Path
+from datalad_catalog.utils import write_bytes_file
+
+try:
+    # brotli compression, if available
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+lgr = logging.getLogger("datalad.catalog.compression")
+
+# Catalog config key with the encodings of precompressed files
+PRECOMPRESS = "precompress"
+# Supported encodings (as in HTTP Accept-Encoding) and the suffixes of their
+# files, in order of preference
+ENCODINGS = {
+    "br": ".br",
+    "gzip": ".gz",
+}
+# Suffixes of the static files of a catalog that are precompressed
+COMPRESSIBLE_SUFFIXES = (
+    ".css",
+    ".html",
+    ".js",
+    ".json",
+    ".md",
+    ".svg",
+    ".txt",
+)
+
+
+def get_precompress_encodings(config: dict) -> tuple:
+    """Return the encodings in which catalog files are precompressed,
+    according to the 'precompress' key of the catalog-level config
+
+    The key can list encodings (i.e. "gzip" and/or "br"), or be true for all
+    encodings. Unknown encodings, and "br" if the 'brotli' package is not
+    installed, are ignored with a warning.
+    """
+    requested = (config or {}).get(PRECOMPRESS)
+    if not requested:
+        return ()
+    if requested is True:
+        requested = list(ENCODINGS)
+    elif isinstance(requested, str):
+        requested = [requested]
+    encodings = []
+    for encoding in requested:
+        if encoding not in ENCODINGS:
+            lgr.warning(
+                "Ignoring unknown encoding %r in catalog config, must be "
+                "one of %s",
+                encoding,
+                ", ".join(ENCODINGS),
+            )
+        elif encoding == "br" and brotli is None:
+            lgr.warning(
+                "Not precompressing catalog files with brotli, which "
+                "requires the 'brotli' package to be installed"
+            )
+        elif encoding not in encodings:
+            encodings.append(encoding)
+    return tuple(encodings)
+
+
+def get_compressed_path(file_path: Path, encoding: str) -> Path:
+    """Return the path of the compressed sibling of a file"""
+    return Path(str(file_path) + ENCODINGS[encoding])
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """Compress data with the highest compression level of an encoding
+
+    The output only depends on the data, so that unchanged files yield
+    unchanged compressed files.
+    """
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    if encoding == "br":
+        return brotli.compress(data)
+    raise ValueError(f"Unknown encoding {encoding!r}")
+
+
+def write_compressed(file_path: Path, data: bytes, encodings, journal=None):
+    """Write the compressed siblings of a file with new content, e.g. the
+    metadata file of a Node instance
+
+    This must be called before the file itself is written. Siblings are
+    only written if the content of the file changes, or if they do not
+    exist. If a journal.Journal is provided, siblings are written as part
+    of its transaction.
+    """
+    try:
+        unchanged = Path(file_path).read_bytes() == data
+    except FileNotFoundError:
+        unchanged = False
+    for encoding in encodings:
+        compressed_path = get_compressed_path(file_path, encoding)
+        if unchanged and compressed_path.is_file():
+            continue
+        compressed = compress(data, encoding)
+        if journal is not None:
+            journal.write_bytes(compressed_path, compressed)
+        else:
+            write_bytes_file(compressed_path, compressed)
+
+
+def compress_path(path: Path, encodings) -> int:
+    """Write the compressed siblings of a static file, or of all static
+    files in a directory (recursively), e.g. of the catalog assets
+
+    Siblings are only written if they do not exist or are older than their
+    file. Returns the number of written files.
+    """
+    if not encodings:
+        return 0
+    path = Path(path)
+    paths = [path] if path.is_file() else sorted(path.rglob("*"))
+    n_files = 0
+    for file_path in paths:
+        if (
+            file_path.suffix not in COMPRESSIBLE_SUFFIXES
+            or not file_path.is_file()
+        ):
+            continue
+        mtime = os.stat(file_path).st_mtime_ns
+        data = None
+        for encoding in encodings:
+            compressed_path = get_compressed_path(file_path, encoding)
+            try:
+                if os.stat(compressed_path).st_mtime_ns >= mtime:
+                    continue
+            except FileNotFoundError:
+                pass
+            if data is None:
+                data = file_path.read_bytes()
+            write_bytes_file(compressed_path, compress(data, encoding))
+            n_files += 1
+    return n_files
+
+
+def parse_accept_encoding(header: str) -> set:
+    """Return the encodings accepted according to the value of an HTTP
+    Accept-Encoding header, i.e. all listed encodings with a non-zero
+    quality value"""
+    accepted = set()
+    for item in (header or "").split(","):
+        name, _, parameters = item.partition(";")
+        quality = 1.0
+        for parameter in parameters.split(";"):
+            key, _, value = parameter.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        name = name.strip().lower()
+        if name and quality > 0:
+            accepted.add(name)
+    return accepted
+
+
+def negotiate_compressed_path(file_path: Path, accept_encoding: str, encodings):
+    """Select the compressed sibling of a file to serve to a client,
+    given the value of its Accept-Encoding header
+
+    Only siblings in the given encodings (i.e. those of the catalog) are
+    considered, as siblings in other encodings are not kept up to date.
+    Returns a tuple (encoding, path) of the preferred existing sibling in an
+    accepted encoding, or None.
+    """
+    if not encodings or not os.path.isfile(file_path):
+        return None
+    accepted = parse_accept_encoding(accept_encoding)
+    for encoding in ENCODINGS:
+        if encoding not in encodings or (
+            encoding not in accepted and "*" not in accepted
+        ):
+            continue
+        compressed_path = get_compressed_path(file_path, encoding)
+        if compressed_path.is_file():
+            return encoding, compressed_path
+    return None
@@ -8,6 +8,7 @@
 # ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
 """Utility constraints
 """
+from datalad_catalog.jsonl import iter_jsonl
 from datalad_catalog.webcatalog import (
     WebCatalog,
 )
@@ -17,7 +18,6 @@ from datalad_catalog.utils import dir_exists
 from datalad_next.constraints import (
     AnyOf,
     Constraint,
-    EnsureGeneratorFromFileLike,
     EnsureJSON,
     WithDescription,
 )
@@ -26,30 +26,67 @@ from datalad_next.constraints.basic import (
     EnsureDType,
 )
 
+from collections.abc import Iterator
+from pathlib import Path
+
 __docformat__ = "restructuredtext"
 
 
-# metadata input via the Add/Create/Validate/Translate commands can be any of:
-# - a path to a file containing JSON lines
-# - valid JSON lines from STDIN
-# - a JSON serialized string
-metadata_constraint = WithDescription(
-    AnyOf(
-        WithDescription(
-            EnsureDType(dict),
-            error_message="not a valid Python dictionary",
-        ),
-        WithDescription(
-            EnsureJSON(),
-            error_message="not valid JSON content",
-        ),
-        EnsureGeneratorFromFileLike(EnsureJSON(), exc_mode="yield"),
-    ),
-    error_message="No constraint satisfied:\n{__itemized_causes__}",
-)
+# Custom constraint classes
+class EnsureJSONLines(Constraint):
+    """Ensure a generator of JSON objects read from JSON lines
+
+    A given value can either be a file-like, or '-' as an alias of STDIN,
+    or a path to an existing (optionally gzip- or zstd-compressed) file.
+    Lines are streamed by jsonl.iter_jsonl(), which reports progress.
+    """
+
+    def __init__(self, exc_mode: str = "raise"):
+        assert exc_mode in ("raise", "yield")
+        self._exc_mode = exc_mode
+        super().__init__()
+
+    def short_description(self):
+        return "JSON lines read from a file-like"
+
+    def __call__(self, value):
+        # unpack a length-1 sequence, e.g. as collected by argparse
+        if isinstance(value, (list, tuple)) and len(value) == 1:
+            value = value[0]
+        if isinstance(value, (str, Path)) and value != "-":
+            if not Path(value).is_file():
+                self.raise_for(
+                    value,
+                    "not '-', or a path to an existing file",
+                )
+        elif value != "-" and not hasattr(value, "read"):
+            self.raise_for(value, "not a file-like")
+        return iter_jsonl(value, exc_mode=self._exc_mode)
+
+
+class EnsureRecords(Constraint):
+    """Ensure an iterable of metadata records
+
+    A given value can be an iterator (e.g. a generator) or a list/tuple of
+    records, i.e. dictionaries (or items relayed by a JSON lines reader),
+    which is passed on as is. This allows chaining commands in memory via
+    the Python API, e.g. passing translated records on to catalog-add.
+    """
+
+    def short_description(self):
+        return "an iterable of metadata records"
+
+    def __call__(self, value):
+        # file-likes are iterators too, but are read by EnsureJSONLines
+        if isinstance(value, Iterator) and not hasattr(value, "read"):
+            return value
+        if isinstance(value, (list, tuple)) and all(
+            isinstance(item, dict) for item in value
+        ):
+            return value
+        self.raise_for(value, "not an iterator or a list of records")
 
 
-# Custom constraint classes
 class EnsureWebCatalog(Constraint):
     """"""
 
@@ -83,3 +120,26 @@ class CatalogRequired(Constraint):
                 value, "should either be a path or a WebCatalog instance"
             )
         return value
+
+
+# metadata input via the Add/Create/Validate/Translate commands can be any of:
+# - a path to a file containing JSON lines (optionally gzip/zstd-compressed)
+# - valid JSON lines from STDIN
+# - a JSON serialized string
+# - an iterable of metadata records (Python API only)
+metadata_constraint = WithDescription(
+    AnyOf(
+        # first, as the other constraints might consume items of iterators
+        EnsureRecords(),
+        WithDescription(
+            EnsureDType(dict),
+            error_message="not a valid Python dictionary",
+        ),
+        WithDescription(
+            EnsureJSON(),
+            error_message="not valid JSON content",
+        ),
+        EnsureJSONLines(exc_mode="yield"),
+    ),
+    error_message="No constraint satisfied:\n{__itemized_causes__}",
+)
@@ -27,7 +27,10 @@ from datalad_next.commands import (
 )
 from datalad_next.constraints import (
     EnsureBool,
+    EnsureChoice,
+    EnsureInt,
     EnsurePath,
+    EnsureRange,
 )
 import logging
 from pathlib import Path
@@ -56,6 +59,8 @@ class CreateParameterValidator(EnsureCommandParameterization):
                 catalog=CatalogRequired() & EnsureWebCatalog(),
                 config_file=EnsurePath(lexists=True),
                 force=EnsureBool(),
+                jobs=EnsureInt() & EnsureRange(min=1),
+                storage=EnsureChoice("files", "sqlite"),
             ),
             joint_constraints={
                 ParameterConstraintContext(
@@ -85,6 +90,10 @@ class Create(ValidatedInterface):
         metadata to be added to the catalog after creation
     force : bool, optional
         if True, will overwrite assets of an existing catalog
+    jobs : int, optional
+        number of parallel processes used to add metadata
+    storage : str, optional
+        storage backend of the catalog metadata, 'files' or 'sqlite'
 
     Yields
     ------
@@ -130,6 +139,26 @@ class Create(ValidatedInterface):
             action="store_true",
             default=False,
         ),
+        jobs=Parameter(
+            # cmdline argument definitions, incl aliases
+            args=("-J", "--jobs"),
+            # documentation
+            doc="""Number of parallel processes used to add metadata records
+            to the catalog after creation (see 'catalog-add').""",
+        ),
+        storage=Parameter(
+            # cmdline argument definitions, incl aliases
+            args=("--storage",),
+            # documentation
+            doc="""Storage backend of the catalog metadata. With 'files'
+            (the default for new catalogs), a JSON file is written to the
+            'metadata' directory per dataset, directory, and dataset-level
+            config. With 'sqlite', metadata is stored in a single SQLite
+            database ('metadata.sqlite') instead, which is faster to update
+            for large catalogs; its metadata files are only written to the
+            'metadata' directory by 'catalog-export' (or 'catalog-serve').
+            Defaults to the storage backend of an existing catalog.""",
+        ),
     )
 
     _examples_ = [
@@ -163,6 +192,11 @@ class Create(ValidatedInterface):
             ),
             code_cmd="datalad catalog-create -c /tmp/my-cat -F path/to/custom_config_file.json",
         ),
+        dict(
+            text=("Create a new catalog that stores metadata in SQLite"),
+            code_py="catalog_create(catalog='/tmp/my-cat', storage='sqlite')",
+            code_cmd="datalad catalog-create -c /tmp/my-cat --storage sqlite",
+        ),
     ]
 
     @staticmethod
@@ -176,6 +210,8 @@ class Create(ValidatedInterface):
         metadata=None,
         config_file=None,
         force: bool = False,
+        jobs: int = None,
+        storage: str = None,
     ):
         # Instantiate WebCatalog class if necessary
         if isinstance(catalog, WebCatalog):
@@ -200,7 +236,7 @@ class Create(ValidatedInterface):
                     ctlg.location,
                 )
 
-        ctlg.create(config_file, force)
+        ctlg.create(config_file, force, storage=storage)
 
         # Yield created/overwritten status message
         yield get_status_dict(**res_kwargs, status="ok", message=msg)
@@ -215,4 +251,5 @@ class Create(ValidatedInterface):
                 catalog=catalog,
                 metadata=metadata,
                 config_file=None,
+                jobs=jobs,
             )
@@ -0,0 +1,179 @@
+# emacs: -*- mode: python; py-indent-offset: 4; tab-width: 4; indent-tabs-mode: nil -*-
+# ex: set sts=4 ts=4 sw=4 et:
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+#
+#   See COPYING file distributed along with the datalad package for the
+#   copyright and license terms.
+#
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+"""Export the metadata of a catalog to its 'metadata' directory
+"""
+from datalad_catalog.bundle import DEFAULT_SHARD_SIZE
+from datalad_catalog.constraints import (
+    CatalogRequired,
+    EnsureWebCatalog,
+)
+from datalad_catalog.webcatalog import (
+    WebCatalog,
+)
+from datalad_next.commands import (
+    build_doc,
+    EnsureCommandParameterization,
+    eval_results,
+    get_status_dict,
+    ValidatedInterface,
+    Parameter,
+)
+from datalad_next.constraints import (
+    EnsureBool,
+    EnsureInt,
+    EnsureRange,
+)
+import logging
+from pathlib import Path
+from typing import Union
+
+
+__docformat__ = "restructuredtext"
+
+lgr = logging.getLogger("datalad.catalog.export")
+
+
+class ExportParameterValidator(EnsureCommandParameterization):
+    """"""
+
+    def __init__(self):
+        super().__init__(
+            param_constraints=dict(
+                catalog=CatalogRequired() & EnsureWebCatalog(),
+                bundle=EnsureBool(),
+                shard_size=EnsureInt() & EnsureRange(min=1),
+            ),
+        )
+
+
+# Decoration auto-generates standard help
+@build_doc
+# All extension commands must be derived from Interface
+class Export(ValidatedInterface):
+    """Export the metadata of a catalog to its 'metadata' directory.
+
+    The browser of a catalog reads a metadata file per dataset, directory,
+    and dataset-level config from the 'metadata' directory. For catalogs
+    that store metadata in a SQLite database (see 'catalog-create'), this
+    writes the metadata that changed since the last export to these files,
+    and removes the files of removed dataset versions. Catalogs that store
+    metadata as files are always up to date.
+
+    With the bundle flag, the metadata of all datasets and directories of a
+    dataset version is packed into a bundle, i.e. into a few large shard
+    files and an index ('bundle.json') in the directory of the dataset
+    version. The browser then fetches metadata from the shards via HTTP
+    range requests, which reduces the number of files to upload to and
+    serve from e.g. object storage or a CDN. Only dataset versions that
+    changed since they were last bundled are bundled again. Catalogs that
+    store metadata in SQLite only get bundles; for catalogs that store
+    metadata as files, the metadata files of datasets and directories
+    (i.e. 'metadata/<id>/<version>/<hash>/*.json') remain in place, but do
+    not need to be deployed.
+
+    Parameters
+    ----------
+    catalog : path-like object | WebCatalog instance
+        an instance of the catalog to be exported
+    bundle : bool, optional
+        if True, pack the metadata of each dataset version into a bundle
+    shard_size : int, optional
+        maximum size in bytes of a bundle shard
+
+    Yields
+    ------
+    status_dict : dict
+        DataLad result record, with the number of written files under the
+        'exported_files' key
+    """
+
+    _validator_ = ExportParameterValidator()
+
+    _params_ = dict(
+        catalog=Parameter(
+            # cmdline argument definitions, incl aliases
+            args=("-c", "--catalog"),
+            # documentation
+            doc="""Location of the existing catalog to be exported""",
+        ),
+        bundle=Parameter(
+            # cmdline argument definitions, incl aliases
+            args=("--bundle",),
+            # documentation
+            doc="""Pack the metadata of the datasets and directories of each
+            dataset version into a bundle, which the browser reads via HTTP
+            range requests, instead of writing a file per dataset and
+            directory.""",
+            action="store_true",
+            default=False,
+        ),
+        shard_size=Parameter(
+            # cmdline argument definitions, incl aliases
+            args=("--shard-size",),
+            # documentation
+            doc="""Maximum size in bytes of the shards of a bundle (a shard
+            exceeds it only if it contains a single larger file). Defaults
+            to 64 MiB.""",
+        ),
+    )
+
+    _examples_ = [
+        dict(
+            text=(
+                "EXPORT the metadata of a catalog to its 'metadata' "
+                "directory, e.g. before publishing it"
+            ),
+            code_py="catalog_export(catalog='/tmp/my-cat/')",
+            code_cmd="datalad catalog-export -c /tmp/my-cat",
+        ),
+        dict(
+            text=(
+                "EXPORT the metadata of a catalog as a bundle per dataset "
+                "version, e.g. before deploying it to object storage"
+            ),
+            code_py="catalog_export(catalog='/tmp/my-cat/', bundle=True)",
+            code_cmd="datalad catalog-export -c /tmp/my-cat --bundle",
+        ),
+    ]
+
+    @staticmethod
+    # generic handling of command results (logging, rendering, filtering, ...)
+    @eval_results
+    # signature must match parameter list above
+    # additional generic arguments are added by decorators
+    def __call__(
+        catalog: Union[Path, WebCatalog],
+        bundle: bool = False,
+        shard_size: int = DEFAULT_SHARD_SIZE,
+    ):
+        res_kwargs = dict(
+            action="catalog_export",
+            path=catalog.location,
+        )
+        try:
+            exported_files = catalog.store.export(
+                bundle=bundle, shard_size=shard_size
+            )
+        except Exception as e:
+            yield get_status_dict(
+                **res_kwargs,
+                status="error",
+                message=(f"Catalog export failed: {e}"),
+                exception=e,
+            )
+            return
+        yield get_status_dict(
+            **res_kwargs,
+            status="ok",
+            message=(
+                "Exported %s metadata file(s) of catalog",
+                exported_files,
+            ),
+            exported_files=exported_files,
+        )
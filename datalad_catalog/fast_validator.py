@@ -0,0 +1,314 @@
+"""Fast-path validation of metadata records against the catalog schema
+
+The catalog schema (and the schemas it references) are compiled once into
+nested Python closures that check whether a record is valid, without the
+generic keyword dispatch and $ref resolution of jsonschema. Only records
+for which the fast path fails are passed to the full jsonschema validator,
+which produces the detailed error messages.
+
+The fast path supports the subset of JSON Schema (draft 2020-12) keywords
+used by the catalog schemas. If a schema uses any other keyword, it is not
+compiled, and all records are validated by the full validator.
+"""
+import logging
+import re
+
+lgr = logging.getLogger("datalad.catalog.fast_validator")
+
+# keywords that do not affect validation (format is an annotation unless a
+# format checker is used, which the catalog validator does not do)
+ANNOTATION_KEYWORDS = {
+    "$schema",
+    "$id",
+    "$comment",
+    "title",
+    "description",
+    "version",
+    "format",
+    "default",
+    "examples",
+    "deprecated",
+    "readOnly",
+    "writeOnly",
+}
+
+
+class UnsupportedSchemaError(Exception):
+    """Raised if a schema can not be compiled into a fast-path check"""
+
+
+def _valid(instance):
+    return True
+
+
+def _invalid(instance):
+    return False
+
+
+def _is_number(instance):
+    return isinstance(instance, (int, float)) and not isinstance(instance, bool)
+
+
+def _is_integer(instance):
+    if isinstance(instance, float):
+        return instance.is_integer()
+    return isinstance(instance, int) and not isinstance(instance, bool)
+
+
+TYPE_CHECKS = {
+    "object": lambda instance: isinstance(instance, dict),
+    "array": lambda instance: isinstance(instance, list),
+    "string": lambda instance: isinstance(instance, str),
+    "number": _is_number,
+    "integer": _is_integer,
+    "boolean": lambda instance: isinstance(instance, bool),
+    "null": lambda instance: instance is None,
+}
+
+
+def equality_key(instance):
+    """Return a hashable key of a JSON value, such that two values have the
+    same key if and only if JSON Schema considers them equal (e.g. booleans
+    are not equal to numbers, but 1 and 1.0 are equal)"""
+    if isinstance(instance, bool):
+        return (bool, instance)
+    if isinstance(instance, dict):
+        return (
+            dict,
+            frozenset((k, equality_key(v)) for k, v in instance.items()),
+        )
+    if isinstance(instance, list):
+        return (list, tuple(equality_key(v) for v in instance))
+    return instance
+
+
+class SchemaCompiler(object):
+    """
+    Compile a schema of a schema store into a function returning whether an
+    instance is valid
+
+    Arguments:
+    schema_store -- mapping of schema IDs to schemas, for resolving $ref
+    """
+
+    def __init__(self, schema_store: dict) -> None:
+        self.schema_store = schema_store
+        # compiled checks by schema identity, which also handles recursion
+        self._compiled = {}
+
+    def compile(self, schema):
+        if schema is True:
+            return _valid
+        if schema is False:
+            return _invalid
+        if not isinstance(schema, dict):
+            raise UnsupportedSchemaError(f"Not a schema: {schema!r}")
+        if id(schema) in self._compiled:
+            return self._compiled[id(schema)]
+        # a placeholder for recursive references to this schema
+        cell = []
+        self._compiled[id(schema)] = lambda instance: cell[0](instance)
+        checks = []
+        for keyword, value in schema.items():
+            if keyword in ANNOTATION_KEYWORDS:
+                continue
+            compile_keyword = getattr(self, f"_compile_{keyword}", None)
+            if compile_keyword is None:
+                raise UnsupportedSchemaError(f"Unsupported keyword: {keyword}")
+            checks.append(compile_keyword(value, schema))
+        if not checks:
+            check = _valid
+        elif len(checks) == 1:
+            check = checks[0]
+        else:
+            checks = tuple(checks)
+
+            def check(instance):
+                for c in checks:
+                    if not c(instance):
+                        return False
+                return True
+
+        cell.append(check)
+        self._compiled[id(schema)] = check
+        return check
+
+    def _compile_type(self, value, schema):
+        types = value if isinstance(value, list) else [value]
+        try:
+            type_checks = tuple(TYPE_CHECKS[t] for t in types)
+        except KeyError as e:
+            raise UnsupportedSchemaError(f"Unknown type: {e}")
+        if len(type_checks) == 1:
+            return type_checks[0]
+        return lambda instance: any(c(instance) for c in type_checks)
+
+    def _compile_const(self, value, schema):
+        key = equality_key(value)
+        return lambda instance: equality_key(instance) == key
+
+    def _compile_pattern(self, value, schema):
+        search = re.compile(value).search
+        return lambda instance: not isinstance(instance, str) or bool(
+            search(instance)
+        )
+
+    def _compile_required(self, value, schema):
+        required = tuple(value)
+
+        def check(instance):
+            if not isinstance(instance, dict):
+                return True
+            for key in required:
+                if key not in instance:
+                    return False
+            return True
+
+        return check
+
+    def _compile_properties(self, value, schema):
+        properties = {key: self.compile(sub) for key, sub in value.items()}
+
+        def check(instance):
+            if not isinstance(instance, dict):
+                return True
+            for key, sub_check in properties.items():
+                if key in instance and not sub_check(instance[key]):
+                    return False
+            return True
+
+        return check
+
+    def _compile_additionalProperties(self, value, schema):
+        if "patternProperties" in schema:
+            raise UnsupportedSchemaError(
+                "Unsupported keyword: patternProperties"
+            )
+        known = frozenset(schema.get("properties", {}))
+        sub_check = self.compile(value)
+
+        def check(instance):
+            if not isinstance(instance, dict):
+                return True
+            for key, item in instance.items():
+                if key not in known and not sub_check(item):
+                    return False
+            return True
+
+        return check
+
+    def _compile_dependentSchemas(self, value, schema):
+        dependents = {key: self.compile(sub) for key, sub in value.items()}
+
+        def check(instance):
+            if not isinstance(instance, dict):
+                return True
+            for key, sub_check in dependents.items():
+                if key in instance and not sub_check(instance):
+                    return False
+            return True
+
+        return check
+
+    def _compile_items(self, value, schema):
+        if "prefixItems" in schema:
+            raise UnsupportedSchemaError("Unsupported keyword: prefixItems")
+        sub_check = self.compile(value)
+
+        def check(instance):
+            if not isinstance(instance, list):
+                return True
+            for item in instance:
+                if not sub_check(item):
+                    return False
+            return True
+
+        return check
+
+    def _compile_minItems(self, value, schema):
+        return lambda instance: not isinstance(instance, list) or (
+            len(instance) >= value
+        )
+
+    def _compile_maxItems(self, value, schema):
+        return lambda instance: not isinstance(instance, list) or (
+            len(instance) <= value
+        )
+
+    def _compile_uniqueItems(self, value, schema):
+        if not value:
+            return _valid
+
+        def check(instance):
+            if not isinstance(instance, list):
+                return True
+            keys = set()
+            for item in instance:
+                key = equality_key(item)
+                if key in keys:
+                    return False
+                keys.add(key)
+            return True
+
+        return check
+
+    def _compile_allOf(self, value, schema):
+        sub_checks = tuple(self.compile(sub) for sub in value)
+        return lambda instance: all(c(instance) for c in sub_checks)
+
+    def _compile_if(self, value, schema):
+        if "else" in schema:
+            raise UnsupportedSchemaError("Unsupported keyword: else")
+        if_check = self.compile(value)
+        then_check = self.compile(schema.get("then", True))
+        return lambda instance: not if_check(instance) or then_check(instance)
+
+    def _compile_then(self, value, schema):
+        # handled together with 'if'
+        return _valid
+
+    def _compile_ref(self, value, schema):
+        if value not in self.schema_store:
+            raise UnsupportedSchemaError(f"Unsupported $ref: {value}")
+        return self.compile(self.schema_store[value])
+
+
+# '$ref' is not a valid method name
+setattr(SchemaCompiler, "_compile_$ref", SchemaCompiler._compile_ref)
+
+
+class FastValidator(object):
+    """
+    A validator with the interface of a jsonschema validator, which checks
+    instances against a compiled fast-path check first, and only uses the
+    full validator for instances that fail that check
+
+    Arguments:
+    full_validator -- jsonschema validator of the catalog schema
+    schema_store -- mapping of schema IDs to schemas
+    """
+
+    def __init__(self, full_validator, schema_store: dict) -> None:
+        self.full_validator = full_validator
+        self.schema = full_validator.schema
+        try:
+            self.check = SchemaCompiler(schema_store).compile(self.schema)
+        except UnsupportedSchemaError as e:
+            lgr.debug("Schema not supported by the fast validator: %s", e)
+            self.check = None
+
+    def validate(self, instance):
+        """Raise jsonschema.ValidationError if the instance is invalid"""
+        if self.check is not None and self.check(instance):
+            return
+        self.full_validator.validate(instance)
+
+    def is_valid(self, instance) -> bool:
+        if self.check is not None:
+            return self.check(instance)
+        return self.full_validator.is_valid(instance)
+
+    def iter_errors(self, instance):
+        if self.check is not None and self.check(instance):
+            return iter(())
+        return self.full_validator.iter_errors(instance)
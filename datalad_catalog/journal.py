@@ -0,0 +1,208 @@
+import json
+import logging
+import os
+from pathlib import Path
+import socket
+import uuid
+from datalad_catalog.utils import (
+    get_staged_path,
+    remove_file,
+    write_bytes_file,
+    write_json_file,
+)
+
+lgr = logging.getLogger("datalad.catalog.journal")
+
+
+class Journal(object):
+    """
+    A write-ahead journal for writing multiple catalog files as a single
+    transaction.
+
+    New file content is first staged in temporary files next to the target
+    files, and each staged file is recorded in a journal file (in JSON lines
+    format) before it is written. Files to be removed are recorded as well.
+    Committing the transaction appends a commit marker to the journal, after
+    which all staged files replace their targets via os.replace, files to be
+    removed are removed, and the journal is removed.
+
+    If the process is interrupted, the journal is left behind and is used by
+    Journal.recover() to either roll the transaction forward (if it was
+    committed) or back (if it was not), so that the catalog never contains a
+    partially written set of files.
+
+    Can be used as a context manager, which commits on success and rolls back
+    on error:
+
+        with Journal(journal_dir) as journal:
+            journal.write_json(path, content)
+
+    Arguments:
+    journal_dir -- directory in which journal files are kept
+    """
+
+    _suffix = ".journal"
+
+    def __init__(self, journal_dir: Path) -> None:
+        self.journal_dir = Path(journal_dir)
+        self.txid = uuid.uuid4().hex
+        self.journal_path = self.journal_dir / f"{self.txid}{self._suffix}"
+        self.entries = []
+        self._journal_file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+        return False
+
+    def _log(self, entry: dict):
+        """Append an entry to the journal file"""
+        if self._journal_file is None:
+            self.journal_dir.mkdir(parents=True, exist_ok=True)
+            self._journal_file = open(self.journal_path, "w")
+            self._log(
+                dict(
+                    txid=self.txid,
+                    host=socket.gethostname(),
+                    pid=os.getpid(),
+                )
+            )
+        self._journal_file.write(json.dumps(entry) + "\n")
+        self._journal_file.flush()
+
+    def _close(self):
+        if self._journal_file is not None:
+            self._journal_file.close()
+            self._journal_file = None
+
+    def _stage(self, file_path: Path) -> Path:
+        """Record a new staged file for a target file, and return its path"""
+        staged_path = get_staged_path(file_path, self.txid)
+        # record the staged file before writing it, so that it can be
+        # cleaned up in any case
+        self._log(dict(target=str(file_path), staged=str(staged_path)))
+        self.entries.append((file_path, staged_path))
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        return staged_path
+
+    def write_json(self, file_path: Path, content):
+        """Stage new JSON content for a file as part of the transaction"""
+        file_path = Path(file_path)
+        write_json_file(file_path, content, staged_path=self._stage(file_path))
+
+    def write_bytes(self, file_path: Path, data: bytes):
+        """Stage new content for a file as part of the transaction"""
+        file_path = Path(file_path)
+        write_bytes_file(file_path, data, staged_path=self._stage(file_path))
+
+    def remove(self, file_path: Path):
+        """Remove a file as part of the transaction"""
+        file_path = Path(file_path)
+        self._log(dict(target=str(file_path), remove=True))
+        self.entries.append((file_path, None))
+
+    def commit(self):
+        """Commit the transaction and move all staged files into place"""
+        if self._journal_file is None:
+            # nothing was written
+            return
+        self._log(dict(committed=True))
+        self._close()
+        for file_path, staged_path in self.entries:
+            if staged_path is None:
+                remove_file(file_path)
+            else:
+                os.replace(staged_path, file_path)
+        remove_file(self.journal_path)
+        self.entries = []
+
+    def rollback(self):
+        """Discard all staged files of the transaction"""
+        self._close()
+        for file_path, staged_path in self.entries:
+            if staged_path is not None:
+                remove_file(staged_path)
+        remove_file(self.journal_path)
+        self.entries = []
+
+    @classmethod
+    def recover(cls, journal_dir: Path):
+        """Recover all interrupted transactions in a journal directory
+
+        Committed transactions are rolled forward, i.e. their remaining
+        staged files are moved into place and files to be removed are
+        removed; uncommitted transactions are rolled back, i.e. their staged
+        files are removed. Transactions of
+        processes that are still running on the current host are skipped.
+
+        Returns a dict with the number of transactions rolled forward
+        (key 'rolled_forward') and rolled back (key 'rolled_back').
+        """
+        recovered = dict(rolled_forward=0, rolled_back=0)
+        journal_dir = Path(journal_dir)
+        if not journal_dir.is_dir():
+            return recovered
+        for journal_path in sorted(journal_dir.glob(f"*{cls._suffix}")):
+            header, entries, committed = _read_journal(journal_path)
+            if _is_running(header):
+                continue
+            for entry in entries:
+                if entry.get("remove"):
+                    if committed:
+                        remove_file(entry["target"])
+                elif committed:
+                    if Path(entry["staged"]).exists():
+                        os.replace(entry["staged"], entry["target"])
+                else:
+                    remove_file(entry["staged"])
+            remove_file(journal_path)
+            if committed:
+                recovered["rolled_forward"] += 1
+            else:
+                recovered["rolled_back"] += 1
+            lgr.warning(
+                "Recovered interrupted catalog transaction %s (%s)",
+                journal_path.name,
+                "rolled forward" if committed else "rolled back",
+            )
+        return recovered
+
+
+def _read_journal(journal_path: Path):
+    """Read a journal file, ignoring an incompletely written last line"""
+    header = {}
+    entries = []
+    committed = False
+    with open(journal_path) as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                break
+            if "txid" in entry:
+                header = entry
+            elif "target" in entry:
+                entries.append(entry)
+            elif entry.get("committed"):
+                committed = True
+    return header, entries, committed
+
+
+def _is_running(header: dict) -> bool:
+    """Check whether the process that wrote a journal is still running"""
+    if header.get("host") != socket.gethostname() or not header.get("pid"):
+        return False
+    if header["pid"] == os.getpid():
+        return False
+    try:
+        os.kill(header["pid"], 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
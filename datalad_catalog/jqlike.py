@@ -0,0 +1,135 @@
+"""Pure-Python equivalents of the jq operations used by translators
+
+The native (jq-free) translation paths of the bundled translators are
+written in terms of these functions, which follow jq's semantics closely
+enough for both paths to produce identical output, e.g. indexing null
+yields null, '.[]?' silently skips values that can not be iterated, and
+'+' treats null as the identity.
+
+Errors are raised as ValueError, like the errors of jq programs.
+"""
+import json
+import re
+
+from datalad_catalog.fast_validator import equality_key
+
+# compiled regular expressions: {pattern: compiled pattern}
+_patterns = {}
+
+
+def iter_values(value, optional: bool = False):
+    """Iterate over an array or the values of an object, like '.[]', or
+    like '.[]?' if 'optional' is True"""
+    if isinstance(value, list):
+        return iter(value)
+    if isinstance(value, dict):
+        return iter(value.values())
+    if optional:
+        return iter(())
+    raise ValueError(f"Cannot iterate over {_type_name(value)}")
+
+
+def get_value(value, key: str):
+    """Return the value of a key of an object, like '.[key]'"""
+    if isinstance(value, dict):
+        return value.get(key)
+    if value is None:
+        return None
+    raise ValueError(f"Cannot index {_type_name(value)} with {key!r}")
+
+
+def alternative(value, default):
+    """Return a value, or the default if the value is null or false, like
+    'value // default'"""
+    if value is None or value is False:
+        return default
+    return value
+
+
+def equals(a, b) -> bool:
+    """Return whether two values are equal, like 'a == b' (e.g. booleans
+    are not equal to numbers)"""
+    return equality_key(a) == equality_key(b)
+
+
+def has_key(value, key: str) -> bool:
+    """Return whether an object has a key, like 'has(key)'"""
+    if isinstance(value, dict):
+        return key in value
+    if value is None:
+        return False
+    raise ValueError(f"Cannot check whether {_type_name(value)} has a key")
+
+
+def add(a, b):
+    """Add two values, like 'a + b'"""
+    if a is None:
+        return b
+    if b is None:
+        return a
+    if isinstance(a, dict) and isinstance(b, dict):
+        return {**a, **b}
+    for types in ((list,), (str,), (int, float)):
+        if (
+            isinstance(a, types)
+            and isinstance(b, types)
+            and not isinstance(a, bool)
+            and not isinstance(b, bool)
+        ):
+            return a + b
+    raise ValueError(f"{_type_name(a)} and {_type_name(b)} cannot be added")
+
+
+def length(value):
+    """Return the length of a value, like 'length'"""
+    if value is None:
+        return 0
+    if isinstance(value, bool):
+        raise ValueError(f"{_type_name(value)} has no length")
+    if isinstance(value, (int, float)):
+        return abs(value)
+    return len(value)
+
+
+def tostring(value) -> str:
+    """Return a string as is and the JSON text of any other value, like
+    'tostring'"""
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+def split(value: str, separator: str) -> list:
+    """Split a string, like 'split(separator)'"""
+    if not isinstance(value, str):
+        raise ValueError("split input must be a string")
+    # jq splits an empty string into an empty array
+    return value.split(separator) if value else []
+
+
+def sub(value, pattern: str, replacement: str) -> str:
+    """Replace the first match of a regular expression in a string, like
+    'sub(pattern; replacement)' with a replacement without captures"""
+    if not isinstance(value, str):
+        raise ValueError(
+            f"{_type_name(value)} cannot be matched, as it is not a string"
+        )
+    compiled = _patterns.get(pattern)
+    if compiled is None:
+        # jq (Oniguruma) anchors '^' and '$' at line boundaries
+        compiled = _patterns[pattern] = re.compile(pattern, re.MULTILINE)
+    return compiled.sub(lambda match: replacement, value, count=1)
+
+
+def _type_name(value) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, (int, float)):
+        return "number"
+    if isinstance(value, str):
+        return "string"
+    if isinstance(value, list):
+        return "array"
+    return "object"
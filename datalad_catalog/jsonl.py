@@ -0,0 +1,172 @@
+"""Streaming reader for (optionally compressed) JSON lines input
+"""
+import gzip
+import io
+import json
+import logging
+from pathlib import Path
+import sys
+import time
+from typing import (
+    Generator,
+    Union,
+)
+
+from datalad.log import log_progress
+from datalad_next.exceptions import CapturedException
+
+try:
+    # faster JSON decoding, if available
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    # support for zstd-compressed input, if available
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+lgr = logging.getLogger("datalad.catalog.jsonl")
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+# size of the buffer for reading input files
+READ_BUFFER_SIZE = 1024 * 1024
+# minimum number of seconds between two progress updates
+PROGRESS_INTERVAL = 0.5
+
+
+def json_loads(line: Union[str, bytes]):
+    """Deserialize a JSON document, using orjson if it is installed"""
+    if orjson is not None:
+        try:
+            return orjson.loads(line)
+        except orjson.JSONDecodeError:
+            # e.g. NaN or integers beyond 64 bit, which orjson rejects
+            pass
+    return json.loads(line)
+
+
+def open_jsonl(path: Path):
+    """Open a JSON lines file for reading bytes
+
+    gzip- and zstd-compressed files are detected by their magic number and
+    decompressed transparently.
+    """
+    raw = open(path, "rb", buffering=READ_BUFFER_SIZE)
+    try:
+        magic = raw.peek(len(ZSTD_MAGIC))[: len(ZSTD_MAGIC)]
+        if magic.startswith(GZIP_MAGIC):
+            return raw, gzip.GzipFile(fileobj=raw, mode="rb")
+        if magic.startswith(ZSTD_MAGIC):
+            if zstandard is None:
+                raise RuntimeError(
+                    f"{path} is zstd-compressed, which requires the "
+                    "'zstandard' package to be installed"
+                )
+            reader = zstandard.ZstdDecompressor().stream_reader(raw)
+            return raw, io.BufferedReader(reader, READ_BUFFER_SIZE)
+    except BaseException:
+        raw.close()
+        raise
+    return raw, raw
+
+
+def iter_jsonl(
+    source,
+    exc_mode: str = "yield",
+    progress_label: str = "Reading metadata",
+) -> Generator:
+    """Yield the JSON objects of a JSON lines source one at a time
+
+    'source' can be a path to a (optionally gzip- or zstd-compressed) file,
+    '-' for STDIN, or a file-like. Input is read as buffered bytes and lines
+    are decoded one by one, so memory use does not depend on the size of the
+    input: the next line is only read when the consumer asks for the next
+    item, which provides backpressure to the reader.
+
+    Empty lines are skipped. If a line can not be decoded, its exception is
+    yielded as a CapturedException (exc_mode='yield') or raised
+    (exc_mode='raise').
+
+    Progress (records and bytes read, incl. rates) is reported via the
+    datalad UI.
+    """
+    close = []
+    total = None
+    if source == "-":
+        fp = raw = getattr(sys.stdin, "buffer", sys.stdin)
+    elif isinstance(source, (str, Path)):
+        raw, fp = open_jsonl(source)
+        close = [fp, raw] if fp is not raw else [raw]
+        total = Path(source).stat().st_size
+    else:
+        fp = raw = source
+    pid = f"catalog-jsonl-{id(fp)}"
+    log_progress(
+        lgr.info,
+        pid,
+        "Start reading JSON lines from %s",
+        source,
+        label=progress_label,
+        unit=" Bytes",
+        total=total,
+        noninteractive_level=logging.DEBUG,
+    )
+    n_records = 0
+    n_bytes = 0
+    start = last_update = time.monotonic()
+    reported_bytes = 0
+    try:
+        for line in fp:
+            n_bytes += len(line)
+            if not line.strip():
+                continue
+            n_records += 1
+            try:
+                yield json_loads(line)
+            except Exception as e:
+                if exc_mode == "raise":
+                    raise
+                yield CapturedException(e)
+            now = time.monotonic()
+            if now - last_update >= PROGRESS_INTERVAL:
+                # report the position in the (compressed) input, which
+                # matches the total size of the file
+                position = _tell(raw, n_bytes)
+                log_progress(
+                    lgr.info,
+                    pid,
+                    "Read %i records (%.0f records/s)",
+                    n_records,
+                    n_records / (now - start),
+                    update=position - reported_bytes,
+                    increment=True,
+                    noninteractive_level=logging.DEBUG,
+                )
+                reported_bytes = position
+                last_update = now
+    finally:
+        for f in close:
+            f.close()
+        duration = max(time.monotonic() - start, 1e-9)
+        log_progress(
+            lgr.info,
+            pid,
+            "Read %i records (%i bytes) in %.1f seconds: "
+            "%.0f records/s, %.0f bytes/s",
+            n_records,
+            n_bytes,
+            duration,
+            n_records / duration,
+            n_bytes / duration,
+            noninteractive_level=logging.DEBUG,
+        )
+
+
+def _tell(fp, default: int) -> int:
+    try:
+        return fp.tell()
+    except (OSError, AttributeError, ValueError):
+        return default
@@ -0,0 +1,137 @@
+import logging
+import os
+from pathlib import Path
+import time
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    # advisory file locks are not available, e.g. on Windows
+    fcntl = None
+
+lgr = logging.getLogger("datalad.catalog.locking")
+
+
+class LockTimeoutError(TimeoutError):
+    """Raised if a lock could not be acquired within the timeout"""
+
+
+class LockStats(object):
+    """
+    Contention metrics of the locks acquired by a catalog instance.
+
+    Attributes:
+    acquired -- number of locks acquired
+    contended -- number of acquisitions that had to wait for another process
+    timeouts -- number of acquisitions that failed due to the timeout
+    wait_time -- total time (in seconds) spent waiting for locks
+    """
+
+    def __init__(self) -> None:
+        self.acquired = 0
+        self.contended = 0
+        self.timeouts = 0
+        self.wait_time = 0.0
+
+    def as_dict(self) -> dict:
+        return dict(
+            acquired=self.acquired,
+            contended=self.contended,
+            timeouts=self.timeouts,
+            wait_time=self.wait_time,
+        )
+
+
+class FileLock(object):
+    """
+    An advisory lock (fcntl.flock) on a lock file, for use as a context
+    manager.
+
+    The lock is held by an open file description, so it is released when
+    the context is left or when the process dies. Locks are not reentrant:
+    acquiring a lock that is already held via another FileLock instance
+    blocks, also within the same process.
+
+    Arguments:
+    lock_path -- path of the lock file, which is created if necessary
+    timeout -- maximum number of seconds to wait for the lock, or None to
+               wait indefinitely
+    stats -- optional LockStats instance to which metrics are added
+    shared -- acquire a shared instead of an exclusive lock
+    poll_interval -- seconds between attempts to acquire a contended lock
+    """
+
+    def __init__(
+        self,
+        lock_path: Path,
+        timeout: float = None,
+        stats: LockStats = None,
+        shared: bool = False,
+        poll_interval: float = 0.05,
+    ) -> None:
+        self.lock_path = Path(lock_path)
+        self.timeout = timeout
+        self.stats = stats
+        self.shared = shared
+        self.poll_interval = poll_interval
+        self._fd = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+        return False
+
+    def acquire(self):
+        """Acquire the lock, waiting for at most 'timeout' seconds"""
+        if fcntl is None:
+            return
+        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        start = time.monotonic()
+        contended = False
+        operation = fcntl.LOCK_SH if self.shared else fcntl.LOCK_EX
+        try:
+            while True:
+                try:
+                    fcntl.flock(fd, operation | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    contended = True
+                waited = time.monotonic() - start
+                if self.timeout is not None and waited >= self.timeout:
+                    if self.stats is not None:
+                        self.stats.timeouts += 1
+                        self.stats.wait_time += waited
+                    raise LockTimeoutError(
+                        f"Could not acquire lock {self.lock_path} "
+                        f"within {self.timeout} seconds"
+                    )
+                time.sleep(self.poll_interval)
+        except BaseException:
+            os.close(fd)
+            raise
+        self._fd = fd
+        if self.stats is not None:
+            self.stats.acquired += 1
+            if contended:
+                self.stats.contended += 1
+                self.stats.wait_time += time.monotonic() - start
+        if contended:
+            lgr.debug(
+                "Acquired lock %s after %.3f seconds",
+                self.lock_path,
+                time.monotonic() - start,
+            )
+
+    def release(self):
+        """Release the lock, if it is held"""
+        if self._fd is None:
+            return
+        try:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        finally:
+            os.close(self._fd)
+            self._fd = None
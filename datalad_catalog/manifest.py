@@ -0,0 +1,202 @@
+import json
+import logging
+import os
+from pathlib import Path
+from datalad_catalog.locking import FileLock
+from datalad_catalog.utils import (
+    get_staged_path,
+    remove_file,
+)
+
+lgr = logging.getLogger("datalad.catalog.manifest")
+
+
+class Manifest(object):
+    """
+    An index of the dataset versions in a catalog, kept in a JSON lines file
+    at the catalog root.
+
+    The manifest records per dataset version its name, alias, the path of its
+    dataset-level metadata file, the time it was last updated, and the number
+    of metadata files in its directory (the files of its Node instances and
+    its config file, see storage.MetadataStore.count_files(), i.e. excluding
+    pages of children and precompressed siblings). Reports on a catalog can
+    thus be compiled without reading every dataset-level metadata file or
+    walking the metadata store.
+
+    Every change is appended to the file as a single line, e.g. whenever
+    records of a dataset version are added to the catalog, so that the cost
+    of an update does not depend on the size of the catalog. Reading the
+    manifest replays all lines, and rewrites the file with a single line per
+    dataset version once it mostly consists of outdated lines.
+
+    If the manifest file does not exist (e.g. for catalogs created before
+    manifests were introduced), changes are not recorded, and the manifest
+    is rebuilt from the metadata store when it is read.
+
+    Arguments:
+    catalog -- the WebCatalog instance
+    """
+
+    _filename = "manifest.jsonl"
+    # the file is rewritten when it has more lines than this many per
+    # dataset version (plus some slack)
+    _compaction_ratio = 2
+
+    def __init__(self, catalog) -> None:
+        self.catalog = catalog
+        self.path = Path(catalog.location) / self._filename
+        self.lock_path = Path(catalog.locks_path) / "manifest.lock"
+
+    def _lock(self):
+        return FileLock(
+            self.lock_path,
+            timeout=self.catalog.lock_timeout,
+            stats=self.catalog.lock_stats,
+        )
+
+    def exists(self) -> bool:
+        """Check if the manifest file exists"""
+        return self.path.is_file()
+
+    def update_dataset_version(self, dataset_node, added_files: int = 0):
+        """Record that a dataset version was added or updated, given its
+        dataset Node instance and the number of metadata files that were
+        created in the process"""
+        self._append(
+            [dict(describe_dataset_node(dataset_node), added_files=added_files)]
+        )
+
+    def remove_dataset_version(self, dataset_id: str, dataset_version: str):
+        """Record that a dataset version was removed"""
+        self._append(
+            [
+                dict(
+                    dataset_id=dataset_id,
+                    dataset_version=dataset_version,
+                    removed=True,
+                )
+            ]
+        )
+
+    def _append(self, entries: list):
+        """Append entries to the manifest file, if it exists"""
+        with self._lock():
+            if not self.exists():
+                # will be rebuilt from the metadata directory, which
+                # includes these changes
+                return
+            with open(self.path, "ab+") as f:
+                # never continue an incompletely written last line
+                if f.seek(0, os.SEEK_END) > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        f.write(b"\n")
+                f.write("".join(json.dumps(e) + "\n" for e in entries).encode())
+
+    def read(self) -> list:
+        """Return the entries of all dataset versions in the catalog, in the
+        order in which they were first added"""
+        if not self.exists():
+            return self.rebuild()
+        try:
+            versions, n_lines = _replay(self.path)
+        except FileNotFoundError:
+            # discarded in the meantime
+            return self.rebuild()
+        if n_lines > self._compaction_ratio * len(versions) + 100:
+            with self._lock():
+                if self.exists():
+                    # entries might have been appended in the meantime
+                    versions, n_lines = _replay(self.path)
+                    self._write(versions.values())
+        return list(versions.values())
+
+    def rebuild(self) -> list:
+        """Rebuild the manifest from the dataset-level metadata of each
+        dataset version in the metadata store of the catalog, and return its
+        entries"""
+        if not self.catalog.metadata_path.is_dir():
+            # nothing to index (yet)
+            return []
+        store = self.catalog.store
+        with self._lock():
+            entries = []
+            for d_id, d_version in store.iter_dataset_versions():
+                dataset_node = self.catalog.get_node(
+                    type="dataset",
+                    dataset_id=d_id,
+                    dataset_version=d_version,
+                    node_path=None,
+                )
+                entries.append(
+                    dict(
+                        describe_dataset_node(dataset_node),
+                        file_count=store.count_files(d_id, d_version),
+                    )
+                )
+            self._write(entries)
+        return entries
+
+    def discard(self):
+        """Remove the manifest file, so that it is rebuilt when it is read
+        next, e.g. after interrupted transactions were recovered"""
+        with self._lock():
+            remove_file(self.path)
+
+    def _write(self, entries):
+        """Replace the manifest file with a line per entry, atomically"""
+        staged_path = get_staged_path(self.path)
+        try:
+            with open(staged_path, "w") as f:
+                for entry in entries:
+                    f.write(json.dumps(entry) + "\n")
+            os.replace(staged_path, self.path)
+        except BaseException:
+            remove_file(staged_path)
+            raise
+
+
+def describe_dataset_node(dataset_node) -> dict:
+    """Return the manifest fields of a dataset version, given its dataset
+    Node instance"""
+    return dict(
+        dataset_id=dataset_node.dataset_id,
+        dataset_version=dataset_node.dataset_version,
+        dataset_name=getattr(dataset_node, "name", None),
+        alias=getattr(dataset_node, "alias", None),
+        metadata_path=str(
+            dataset_node.get_location().relative_to(
+                dataset_node.parent_catalog.metadata_path
+            )
+        ),
+        updated_at=dataset_node.get_last_updated(),
+    )
+
+
+def _replay(path: Path):
+    """Replay the lines of a manifest file
+
+    Returns a dict with the current entry per (dataset_id, dataset_version),
+    and the number of lines read.
+    """
+    versions = {}
+    n_lines = 0
+    with open(path) as f:
+        for line in f:
+            n_lines += 1
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # incompletely written line
+                lgr.debug("Ignoring invalid line in catalog manifest")
+                continue
+            key = (entry.get("dataset_id"), entry.get("dataset_version"))
+            if entry.pop("removed", False):
+                versions.pop(key, None)
+                continue
+            added_files = entry.pop("added_files", 0)
+            current = versions.setdefault(key, dict(file_count=0))
+            current.update(entry)
+            current["file_count"] += added_files
+    return versions, n_lines
@@ -1,3 +1,4 @@
+import copy
 import logging
 from pathlib import Path
 from datalad_catalog import constants as cnst
@@ -29,22 +30,28 @@ class MetaItem(object):
     #   - create children and directory nodes
 
     def __init__(
-        self, catalog, meta_item: dict, config_file: str = None
+        self,
+        catalog,
+        meta_item: dict,
+        config_file: str = None,
+        node_instances: dict = None,
     ) -> None:
+        # The record is merged into (cached) Node instances, which must not
+        # share lists or dicts with the caller's record: merging further
+        # records would modify it
+        meta_item = copy.deepcopy(meta_item)
         # Get dataset id and version
         d_id = meta_item[cnst.DATASET_ID]
         d_version = meta_item[cnst.DATASET_VERSION]
-        self._node_instances = {}
+        # Node instances can be shared between multiple MetaItem instances
+        # (e.g. when adding records in bulk), in which case all records
+        # are merged into the same in-memory Node instances
+        self._node_instances = (
+            node_instances if node_instances is not None else {}
+        )
         # For both type dataset and type file, we need the dataset Node instance
         # Here we fetch or create this Node instance:
-        dataset_instance = Node(
-            catalog=catalog,
-            type="dataset",
-            dataset_id=d_id,
-            dataset_version=d_version,
-            node_path=None,
-        )
-        self._node_instances[dataset_instance.md5_hash] = dataset_instance
+        dataset_instance = self.getNode(catalog, "dataset", d_id, d_version)
         # Then do things based on metadata object type (dataset or file)
         if meta_item[cnst.TYPE] == cnst.TYPE_DATASET:
             # Dataset
@@ -223,8 +230,8 @@ class MetaItem(object):
         if node_hash in self._node_instances:
             return self._node_instances[node_hash]
         else:
-            node_instance = Node(
-                catalog=catalog,
+            # The catalog returns a cached instance if available
+            node_instance = catalog.get_node(
                 type=type,
                 dataset_id=dataset_id,
                 dataset_version=dataset_version,
@@ -1,12 +1,10 @@
-import json
 import logging
 import sys
 import datalad_catalog.constants as cnst
 from datalad_catalog.utils import (
-    load_config_file,
+    get_node_file_path,
     md5hash,
     merge_lists,
-    split_string,
 )
 
 lgr = logging.getLogger("datalad.catalog.node")
@@ -26,6 +24,17 @@ class Node(object):
 
     _split_dir_length = 3
     _instances = {}
+    # Instance attributes that are not written to the metadata file
+    _keys_to_pop = (
+        "node_path",
+        "long_name",
+        "md5_hash",
+        "parent_catalog",
+        "config",
+        "config_source",
+        "_children_index",
+        "_sources_index",
+    )
 
     def __init__(
         self,
@@ -47,6 +56,11 @@ class Node(object):
         self.long_name = self.get_long_name()
         self.md5_hash = md5hash(self.long_name)
         self.children = []
+        # index of children by (type, name), built lazily by get_child()
+        self._children_index = None
+        # index of metadata sources by (source_name, source_version), built
+        # lazily by get_metadata_source()
+        self._sources_index = None
 
         # Defaults for config
         self.config = None
@@ -63,12 +77,24 @@ class Node(object):
         """
         Check if metadata file for Node exists in catalog
         """
-        if self.get_location().exists() and self.get_location().is_file():
-            return True
-        return False
+        return self.parent_catalog.store.has_node(
+            self.dataset_id, self.dataset_version, self.md5_hash
+        )
 
-    def create(self):
-        """"""
+    def create(self, journal=None):
+        """Write the metadata file of the Node (and the dataset-level config
+        file, if applicable) to the catalog
+
+        Files are written via the metadata store of the catalog (see
+        storage.MetadataStore). If a transaction of the store (e.g. a
+        journal.Journal) is provided, files are written as part of it, else
+        each file is written atomically on its own.
+
+        Returns the number of files that did not exist before, counted as
+        in storage.MetadataStore.count_files(), i.e. without pages of
+        children.
+        """
+        created_files = 0
         # Assumes that Node has been populated with attributes,
         # including config attribute (only applicable for dataset Node)
         if self.type == "dataset":
@@ -80,57 +106,54 @@ class Node(object):
                 raise ValueError(msg)
             # create config file if necessary, i.e. if a config file
             # does not already exist and if the config_source is 'dataset'
-            dataset_config_path = (
-                self.parent_catalog.metadata_path
-                / self.dataset_id
-                / self.dataset_version
-                / "config.json"
-            )
+            store = self.parent_catalog.store
             if (
-                not dataset_config_path.is_file()
+                store.get_dataset_config_stamp(
+                    self.dataset_id, self.dataset_version
+                )
+                is None
                 and self.config_source == "dataset"
             ):
-                # First create id and version directories in case they don't exist
-                dataset_config_path.parent.mkdir(parents=True, exist_ok=True)
-                with open(dataset_config_path, "w") as f:
-                    json.dump(self.config, f)
+                store.write_dataset_config(
+                    self.dataset_id,
+                    self.dataset_version,
+                    self.config,
+                    transaction=journal,
+                )
+                created_files += 1
         # write attributes to file
-        self.write_attributes_to_file()
+        if not self.is_created():
+            created_files += 1
+        self.write_attributes_to_file(journal=journal)
+        return created_files
 
-    def write_attributes_to_file(self):
+    def write_attributes_to_file(self, journal=None):
         """
         Create a catalog metadata file for the Node instance
         """
-        # First grab required fields
-        file_path = self.get_location()
-        parent_path = file_path.parents[0]
-        # And set correct attributes for instance of type 'directory': path+name
+        # Set correct attributes for instance of type 'directory': path+name
         if hasattr(self, "node_path") and self.type == "directory":
             setattr(self, "path", str(self.node_path))
             setattr(self, "name", self.node_path.name)
-        # Create a dictionary from instance variables
-        meta_dict = vars(self)
-        # Remove attributes that are irrelevant for the catalog
-        keys_to_pop = [
-            "node_path",
-            "long_name",
-            "md5_hash",
-            "parent_catalog",
-            "config",
-            "config_source",
-        ]
-        for key in keys_to_pop:
-            meta_dict.pop(key, None)
-        # Write the dictionary to file
-        parent_path.mkdir(parents=True, exist_ok=True)
-        with open(file_path, "w") as f:
-            json.dump(meta_dict, f)
+        # Create a dictionary from instance variables, leaving out
+        # attributes that are irrelevant for the catalog (without removing
+        # them from the instance, which might still be in use, e.g. cached)
+        meta_dict = {
+            key: value
+            for key, value in vars(self).items()
+            if key not in self._keys_to_pop
+        }
+        # Write the dictionary via the metadata store
+        self.parent_catalog.store.write_node(
+            self, meta_dict, transaction=journal
+        )
 
     def load_file(self):
         """Load content from catalog metadata file for current node"""
         try:
-            with open(self.get_location()) as f:
-                return json.load(f)
+            return self.parent_catalog.store.read_node(
+                self.dataset_id, self.dataset_version, self.md5_hash
+            )
         except OSError as err:
             print("OS error: {0}".format(err))
         except:
@@ -170,18 +193,13 @@ class Node(object):
             self.long_name = self.get_long_name()
             self.md5_hash = md5hash(self.long_name)
 
-        hash_path_left, hash_path_right = split_string(
-            self.md5_hash, self._split_dir_length
-        )
-        node_fn = (
-            self.parent_catalog.metadata_path
-            / self.dataset_id
-            / self.dataset_version
-            / hash_path_left
-            / hash_path_right
+        return get_node_file_path(
+            self.parent_catalog.metadata_path,
+            self.dataset_id,
+            self.dataset_version,
+            self.md5_hash,
+            self._split_dir_length,
         )
-        node_fn = node_fn.with_suffix(".json")
-        return node_fn
 
     def get_config(self, config_file: str = None):
         """Get Node-level config
@@ -193,30 +211,12 @@ class Node(object):
         - if config file is passed, load its content
         - if no config file is passed, inherit/load config from the
           catalog-level config.
+
+        Resolution (and caching) of the config is done by the parent catalog.
         """
-        # Expected config file path
-        dataset_config_path = (
-            self.parent_catalog.metadata_path
-            / self.dataset_id
-            / self.dataset_version
-            / "config.json"
+        return self.parent_catalog.get_dataset_config(
+            self.dataset_id, self.dataset_version, config_file
         )
-        if dataset_config_path.is_file():
-            # If dataset-level config file DOES exist, return it
-            return dict(
-                source="dataset", config=load_config_file(dataset_config_path)
-            )
-        else:
-            # If dataset-level config file DOES NOT exist:
-            if config_file is not None:
-                # If config file passed: load and return
-                return dict(
-                    source="dataset", config=load_config_file(config_file)
-                )
-            else:
-                # If config file is not passed,
-                # only load from catalog-level config file
-                return dict(source="catalog", config=self.parent_catalog.config)
 
     def add_attributes(
         self, new_attributes: dict, config_file: str = None, overwrite=False
@@ -227,7 +227,7 @@ class Node(object):
         cfg = self.get_config(config_file)
         self.config = cfg.get("config", None)
         self.config_source = cfg["source"]
-        dataset_config = self.config[cnst.PROPERTY_SOURCES][cnst.TYPE_DATASET]
+        property_rules = self.parent_catalog.get_property_rules(self.config)
         # Get metadata source of incoming metadata
         # NOTE: this assumes that provided metadata item originates from a single source,
         # and wasn't collated beforehand. TODO: need to investigate and update the implementation
@@ -253,17 +253,8 @@ class Node(object):
             # Skip keys with empty values
             if not bool(new_value):
                 continue
-            # Isolate config rule and source
-            key_config = dataset_config.get(key, None)
-            config_rule = None
-            config_source = None
-            if key_config is not None:
-                config_rule = key_config.get("rule", None)
-                config_source = key_config.get("source", None)
-            if config_source and not isinstance(
-                config_source, list
-            ):  # make all sources a list, except for None
-                config_source = [config_source]
+            # Look up precompiled config rule and source
+            config_rule, config_source = property_rules.get(key, (None, []))
             # create new or update existing attribute/variable
             setattr(
                 self,
@@ -284,7 +275,7 @@ class Node(object):
         new_value,
         source_name: str,
         config_rule: str,
-        config_source: str,
+        config_source: list,
         overwrite=False,
     ):
         """Create new or update existing attribute/variable of a Node instance
@@ -305,33 +296,10 @@ class Node(object):
         else:
             existing_value = None
 
-        # Some handling of incorrect config specification:
-        # - "rule" can be one of: single / merge / priority / None / empty string
-        # - "source" can be: "any" / a list / empty list / empty string
-        # If config_rule specified without config_source:
-        if not config_source and config_rule in [
-            "single",
-            "merge",
-            "priority",
-            None,
-        ]:
-            if (
-                config_rule == "merge"
-            ):  # for merge, allow new source to be merged
-                config_source = [source_name]
-            else:  # for single / priority / None, ignore new source
-                config_source = []
-        # If config_source specified without config_rule,
-        # set config_rule to None (i.e. first-come-first-served)
-        if config_source and config_rule not in [
-            "single",
-            "merge",
-            "priority",
-            None,
-        ]:
-            config_rule = None
-        # If config_source is "any" it implies the current source is allowed
-        if config_source == ["any"]:
+        # Handling of incorrect config specification was already done when
+        # compiling the config (see compile_property_sources). A config_source
+        # of None implies that the current source is allowed
+        if config_source is None:
             config_source = [source_name]
 
         # NEXT: decide what to do based on config_rule and config_source:
@@ -385,24 +353,38 @@ class Node(object):
 
     def add_child(self, meta_dict: dict):
         """
-        [summary]
-
-        Returns:
-            [type]: [description]
+        Add a child (i.e. subdataset, directory, or file) to the Node,
+        unless a child with the same type and name already exists
         """
-        child_found = next(
-            (
-                item
-                for item in self.children
-                if item[cnst.TYPE] == meta_dict[cnst.TYPE]
-                and item[cnst.NAME] == meta_dict[cnst.NAME]
-            ),
-            False,
-        )
-        if not child_found:
+        key = (meta_dict[cnst.TYPE], meta_dict[cnst.NAME])
+        if self.get_child(*key) is None:
             self.children.append(meta_dict)
-        else:
-            pass
+            self._children_index["index"][key] = meta_dict
+            self._children_index["length"] += 1
+
+    def get_child(self, type: str, name: str):
+        """
+        Return the child with the given type and name, or None
+
+        Children are looked up via an index keyed by (type, name), which is
+        (re)built if the children list was replaced or modified otherwise,
+        e.g. by set_attributes_from_file().
+        """
+        if (
+            self._children_index is None
+            or self._children_index["children"] is not self.children
+            or self._children_index["length"] != len(self.children)
+        ):
+            index = {}
+            for item in self.children:
+                # keep the first child of each (type, name)
+                index.setdefault((item[cnst.TYPE], item[cnst.NAME]), item)
+            self._children_index = dict(
+                children=self.children,
+                length=len(self.children),
+                index=index,
+            )
+        return self._children_index["index"].get((type, name))
 
     def add_metadata_source(self, source_dict: dict):
         """"""
@@ -416,22 +398,45 @@ class Node(object):
             self.metadata_sources[cnst.SOURCES] = []
         # Find the metadata_source element if it already exists in "sources" list
         # NOTE: currently identifying element based on source name and version only
-        source_found = next(
-            (
-                item
-                for item in self.metadata_sources[cnst.SOURCES]
-                if cnst.SOURCE_NAME in item
-                and item[cnst.SOURCE_NAME] == source_dict[cnst.SOURCE_NAME]
-                and item[cnst.SOURCE_VERSION]
-                == source_dict[cnst.SOURCE_VERSION]
-            ),
-            False,
+        key = (
+            source_dict[cnst.SOURCE_NAME],
+            source_dict.get(cnst.SOURCE_VERSION),
         )
-        if not source_found:
+        if self.get_metadata_source(*key) is None:
             # append to source list
             self.metadata_sources[cnst.SOURCES].append(source_dict)
-        else:
-            pass
+            self._sources_index["index"][key] = source_dict
+            self._sources_index["length"] += 1
+
+    def get_metadata_source(self, source_name: str, source_version: str):
+        """
+        Return the metadata source with the given name and version, or None
+
+        Sources are looked up via an index keyed by (source_name,
+        source_version), which is (re)built if the sources list was replaced
+        or modified otherwise, e.g. by set_attributes_from_file().
+        """
+        sources = self.metadata_sources[cnst.SOURCES]
+        if (
+            self._sources_index is None
+            or self._sources_index["sources"] is not sources
+            or self._sources_index["length"] != len(sources)
+        ):
+            index = {}
+            for item in sources:
+                if cnst.SOURCE_NAME not in item:
+                    continue
+                # keep the first source of each (source_name, source_version)
+                index.setdefault(
+                    (item[cnst.SOURCE_NAME], item.get(cnst.SOURCE_VERSION)),
+                    item,
+                )
+            self._sources_index = dict(
+                sources=sources,
+                length=len(sources),
+                index=index,
+            )
+        return self._sources_index["index"].get((source_name, source_version))
 
     def add_source_map_entry(self, key: str, source_name: str, action: str):
         """"""
@@ -448,10 +453,12 @@ class Node(object):
         else:
             if action == "replace":
                 self.metadata_sources[cnst.KEY_SOURCE_MAP][key] = [source_name]
-            if action == "merge":
-                self.metadata_sources[cnst.KEY_SOURCE_MAP][key] = list(
-                    set(sources + [source_name])
-                )
+            if action == "merge" and source_name not in sources:
+                # keep the order in which sources were added, so that
+                # metadata files are stable across identical updates
+                self.metadata_sources[cnst.KEY_SOURCE_MAP][key] = sources + [
+                    source_name
+                ]
 
     def get_source_map_entry(self, key: str):
         """"""
@@ -471,10 +478,46 @@ class Node(object):
         """
 
         if hasattr(self, "metadata_sources"):
-            sorted_sources = sorted(
-                self.metadata_sources[cnst.SOURCES],
-                key=lambda d: d.get("source_time"),
-                reverse=True,
-            )
-            return sorted_sources[0].get("source_time")
+            # sources are not required to have a source_time
+            source_times = [
+                d.get("source_time")
+                for d in self.metadata_sources.get(cnst.SOURCES) or []
+                if d.get("source_time") is not None
+            ]
+            return max(source_times, default=None)
         return None
+
+
+def compile_property_sources(config: dict) -> dict:
+    """Compile the dataset-level 'property_sources' rules of a config into
+    a lookup table of the form {key: (config_rule, config_source)}
+
+    This normalizes the config specification once, so that it does not have
+    to be interpreted again for every key of every added metadata record:
+    - "rule" can be one of: single / merge / priority / None / empty string;
+      any other (incorrect) rule is set to None (i.e. first-come-first-served)
+    - "source" can be: "any" / a string / a list / empty list / empty string;
+      all sources are turned into a list, except for "any" and for a merge
+      rule without sources, which are set to None (i.e. the source of the
+      incoming metadata is allowed)
+    """
+    rules = {}
+    dataset_config = config[cnst.PROPERTY_SOURCES][cnst.TYPE_DATASET]
+    for key, key_config in dataset_config.items():
+        config_rule = None
+        config_source = None
+        if key_config is not None:
+            config_rule = key_config.get("rule", None)
+            config_source = key_config.get("source", None)
+        if config_rule not in ["single", "merge", "priority"]:
+            config_rule = None
+        if config_source and not isinstance(config_source, list):
+            config_source = [config_source]
+        if not config_source:
+            # for merge, allow new source to be merged
+            # for single / priority / None, ignore new source
+            config_source = None if config_rule == "merge" else []
+        elif config_source == ["any"]:
+            config_source = None
+        rules[key] = (config_rule, config_source)
+    return rules
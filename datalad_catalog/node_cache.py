@@ -0,0 +1,148 @@
+import logging
+from collections import OrderedDict
+from contextlib import contextmanager
+
+lgr = logging.getLogger("datalad.catalog.node_cache")
+
+
+class NodeCache(object):
+    """
+    A bounded cache of Node instances with least-recently-used eviction.
+
+    Node instances are keyed by their md5 hash (see
+    utils.md5sum_from_id_version_path). Instances that were modified in
+    memory can be marked as dirty, in which case their metadata file is
+    written when they are evicted from the cache or when the cache is
+    flushed. Pinned instances (see pin()) are never evicted.
+
+    Arguments:
+    maxsize -- maximum number of Node instances held in the cache
+    """
+
+    def __init__(self, maxsize: int = 1000) -> None:
+        self.maxsize = maxsize
+        self._nodes = OrderedDict()
+        self._dirty = set()
+        self._pinned = set()
+        # number of metadata files created when writing Node instances:
+        # {(dataset_id, dataset_version): count}
+        self._created_files = {}
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def __contains__(self, node_hash):
+        return node_hash in self._nodes
+
+    def get(self, node_hash: str):
+        """Return the cached Node instance, or None if it is not cached"""
+        node_instance = self._nodes.get(node_hash, None)
+        if node_instance is not None:
+            self._nodes.move_to_end(node_hash)
+        return node_instance
+
+    def put(self, node_instance):
+        """Add a Node instance to the cache, evicting the least recently
+        used instance(s) if the cache is full"""
+        self._nodes[node_instance.md5_hash] = node_instance
+        self._nodes.move_to_end(node_instance.md5_hash)
+        self._evict()
+
+    def _evict(self):
+        """Evict the least recently used instance(s) that are not pinned
+        while the cache is full"""
+        candidates = len(self._nodes)
+        while len(self._nodes) > self.maxsize and candidates > 0:
+            candidates -= 1
+            node_hash, evicted = self._nodes.popitem(last=False)
+            if node_hash in self._pinned:
+                # keep it, as the most recently used instance
+                self._nodes[node_hash] = evicted
+                continue
+            if node_hash in self._dirty:
+                # write modified content before forgetting about it
+                self._dirty.discard(node_hash)
+                self._count_created_files(evicted, evicted.create())
+
+    @contextmanager
+    def pin(self, node_hashes):
+        """Context manager that keeps Node instances in the cache, even if
+        it exceeds its maxsize, e.g. so that dirty instances are only
+        written as part of a transaction (see flush()) and not on eviction
+        """
+        node_hashes = set(node_hashes) - self._pinned
+        self._pinned.update(node_hashes)
+        try:
+            yield
+        finally:
+            self._pinned.difference_update(node_hashes)
+            self._evict()
+
+    def mark_dirty(self, node_instance):
+        """Mark a Node instance as modified in memory, adding it to the
+        cache if required"""
+        # marked before it is added, in case it is evicted right away
+        self._dirty.add(node_instance.md5_hash)
+        if node_instance.md5_hash not in self._nodes:
+            self.put(node_instance)
+
+    def is_dirty(self, node_hash: str) -> bool:
+        """Check whether a cached Node instance has unwritten changes"""
+        return node_hash in self._dirty
+
+    def flush(self, node_hashes=None, journal=None):
+        """Write the metadata file of all dirty Node instances
+
+        If node_hashes is provided, only the dirty Node instances with
+        these hashes are written. If a journal.Journal is provided, files
+        are written as part of its transaction.
+        """
+        if node_hashes is None:
+            node_hashes = list(self._dirty)
+        for node_hash in node_hashes:
+            if node_hash not in self._dirty:
+                continue
+            node_instance = self._nodes[node_hash]
+            self._count_created_files(
+                node_instance, node_instance.create(journal=journal)
+            )
+            self._dirty.discard(node_hash)
+
+    def _count_created_files(self, node_instance, created_files: int):
+        if created_files:
+            key = (node_instance.dataset_id, node_instance.dataset_version)
+            self._created_files[key] = (
+                self._created_files.get(key, 0) + created_files
+            )
+
+    def pop_created_files(self, dataset_id: str, dataset_version: str) -> int:
+        """Return the number of metadata files of a dataset version that
+        were created when writing its Node instances since the last call,
+        e.g. to keep track of the number of files in the catalog"""
+        return self._created_files.pop((dataset_id, dataset_version), 0)
+
+    def discard(self, node_hashes):
+        """Remove Node instances from the cache without writing them"""
+        for node_hash in node_hashes:
+            self._nodes.pop(node_hash, None)
+            self._dirty.discard(node_hash)
+
+    def invalidate(self, dataset_id: str = None, dataset_version: str = None):
+        """Remove Node instances from the cache without writing them
+
+        If dataset_id (and dataset_version) is provided, only Node instances
+        of the particular dataset (version) are removed, else all instances.
+        """
+        self.discard(
+            [
+                node_hash
+                for node_hash, node_instance in self._nodes.items()
+                if (
+                    dataset_id is None or node_instance.dataset_id == dataset_id
+                )
+                and (
+                    dataset_version is None
+                    or node_instance.dataset_version == dataset_version
+                )
+            ]
+        )
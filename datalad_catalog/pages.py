@@ -0,0 +1,118 @@
+"""Pages of the children of large dataset and directory nodes
+"""
+import logging
+import os
+from pathlib import Path
+import datalad_catalog.constants as cnst
+
+lgr = logging.getLogger("datalad.catalog.pages")
+
+# Catalog config key with the maximum number of children per page, which is
+# also recorded in paginated nodes
+CHILDREN_PAGE_SIZE = "children_page_size"
+# Keys of a paginated node with the total number of children and the number
+# of pages (including the first one, in the node itself)
+CHILDREN_COUNT = "children_count"
+CHILDREN_PAGES = "children_pages"
+
+
+def get_children_page_size(config: dict):
+    """Return the maximum number of children per page, according to the
+    'children_page_size' key of the catalog-level config, or None if the
+    children of nodes are not paginated
+
+    Invalid values are ignored with a warning.
+    """
+    page_size = (config or {}).get(CHILDREN_PAGE_SIZE)
+    if page_size is None:
+        return None
+    if (
+        isinstance(page_size, bool)
+        or not isinstance(page_size, int)
+        or page_size < 1
+    ):
+        lgr.warning(
+            "Ignoring invalid %r in catalog config, must be a positive "
+            "integer: %r",
+            CHILDREN_PAGE_SIZE,
+            page_size,
+        )
+        return None
+    return page_size
+
+
+def get_page_path(node_file_path: Path, page: int) -> Path:
+    """Return the path of a page of the children of a node, given the path
+    of its metadata file. Format: "metadata/dataset_id/dataset_version/
+    hash_left/hash_right/<page>.json"
+    """
+    return Path(node_file_path).with_suffix("") / f"{page}.json"
+
+
+def get_stale_page_paths(node_file_path: Path, n_pages: int) -> list:
+    """Return the paths of the existing page files of a node beyond its
+    current number of further pages (n_pages), e.g. after its children
+    shrank, in order"""
+    page_dir = Path(node_file_path).with_suffix("")
+    try:
+        names = os.listdir(page_dir)
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+    pages = []
+    for name in names:
+        page, _, suffix = name.partition(".")
+        if suffix == "json" and page.isdigit() and int(page) > n_pages:
+            pages.append(int(page))
+    return [get_page_path(node_file_path, page) for page in sorted(pages)]
+
+
+def paginate_children(content: dict, page_size: int = None):
+    """Split the children of the metadata of a node into pages of up to
+    page_size children
+
+    The first page remains in the metadata of the node (so that browsers
+    can render it right away), which also records the total number of
+    children, the number of pages, and the page size. Further pages are
+    stored as separate files (see get_page_path()), as {"children": [...]}.
+
+    Returns a tuple (content, pages), with pages being the list of further
+    pages in order, i.e. of pages 1, 2, ... The content is returned as is
+    if it fits on a single page.
+    """
+    children = content.get(cnst.CHILDREN) or []
+    if page_size is None or len(children) <= page_size:
+        return content, []
+    content = dict(content)
+    content[cnst.CHILDREN] = children[:page_size]
+    content[CHILDREN_COUNT] = len(children)
+    content[CHILDREN_PAGES] = -(-len(children) // page_size)
+    content[CHILDREN_PAGE_SIZE] = page_size
+    pages = [
+        {cnst.CHILDREN: children[start : start + page_size]}
+        for start in range(page_size, len(children), page_size)
+    ]
+    return content, pages
+
+
+def iter_children(content: dict, read_page):
+    """Yield the children of the metadata of a node, reading further pages
+    only once the children of the previous page were consumed
+
+    read_page is called with the number of a page (starting at 1) and must
+    return its content.
+    """
+    yield from content.get(cnst.CHILDREN) or []
+    for page in range(1, content.get(CHILDREN_PAGES, 1)):
+        yield from read_page(page).get(cnst.CHILDREN) or []
+
+
+def join_children(content: dict, read_page) -> dict:
+    """Return the metadata of a node with the children of all of its pages
+    (see iter_children()), i.e. as it was before paginate_children()"""
+    if CHILDREN_PAGES not in content:
+        return content
+    content = dict(content)
+    content[cnst.CHILDREN] = list(iter_children(content, read_page))
+    for key in (CHILDREN_COUNT, CHILDREN_PAGES, CHILDREN_PAGE_SIZE):
+        content.pop(key, None)
+    return content
@@ -30,7 +30,6 @@ from datalad_next.constraints import (
 )
 import logging
 from pathlib import Path
-import shutil
 from typing import Union
 
 
@@ -194,12 +193,13 @@ class Remove(ValidatedInterface):
             return
 
         if reckless:
-            id_path = Path(catalog.location) / "metadata" / dataset_id
-            version_path = id_path / dataset_version
-            shutil.rmtree(version_path)
-            # remove id directory if it is empty
-            if not any(id_path.iterdir()):
-                shutil.rmtree(id_path)
+            with ctlg.lock(dataset_id, dataset_version):
+                ctlg.store.remove_dataset_version(dataset_id, dataset_version)
+                # forget about cached nodes of the removed dataset-version
+                ctlg.node_cache.invalidate(dataset_id, dataset_version)
+                ctlg.manifest.remove_dataset_version(
+                    dataset_id, dataset_version
+                )
             success_msg = (
                 f"Metadata record successfully removed (dataset_id={dataset_id}, "
                 f"dataset_version={dataset_version})"
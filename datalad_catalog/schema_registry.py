@@ -0,0 +1,181 @@
+"""Registry of loaded schema stores and compiled schema validators
+
+Schema stores are loaded once per process and schema directory, and schema
+validators are compiled once per process and schema content (identified by
+its hash), irrespective of how many catalog instances or commands use them.
+
+Across processes, a combined form of each schema store is persisted in a
+single file in the datalad cache directory (see get_schema_store_path()),
+so that loading a store only requires checking the schema files'
+modification times and reading that file. Only the loading of schema
+stores is cached across processes: schema validators (and the compiled
+schema of fast_validator.FastValidator) consist of Python objects and
+functions that cannot be persisted, and are compiled again in every
+process, on first use.
+"""
+import hashlib
+import json
+import logging
+from pathlib import Path
+from jsonschema import (
+    Draft202012Validator,
+    RefResolver,
+)
+
+import datalad_catalog.constants as cnst
+from datalad_catalog.fast_validator import FastValidator
+from datalad_catalog.jsonl import json_loads
+from datalad_catalog.utils import write_json_file
+
+lgr = logging.getLogger("datalad.catalog.schema_registry")
+
+# directory of persisted schema stores in the datalad cache directory
+SCHEMA_STORE_DIRNAME = "schema_stores"
+# format version of the persisted schema store
+SCHEMA_STORE_FORMAT = 2
+
+# loaded schema stores: {schema_dir: (stamps, content_hash, store)}
+_stores = {}
+# content hashes of loaded schema stores: {id(store): (store, content_hash)}
+_store_hashes = {}
+# compiled schema validators: {(content_hash, fast): validator}
+_validators = {}
+
+
+def get_schema_files(schema_dir: Path) -> dict:
+    """Return the paths of all schema files in a schema directory"""
+    return {
+        schema_type: Path(schema_dir) / f"jsonschema_{schema_type}.json"
+        for schema_type in cnst.CATALOG_SCHEMA_IDS
+    }
+
+
+def get_schema_store_path(schema_dir: Path) -> Path:
+    """Return the path of the persisted schema store of a schema directory,
+    keyed by the path of the schema directory"""
+    from datalad import cfg
+
+    return (
+        Path(cfg.obtain("datalad.locations.cache"))
+        / "catalog"
+        / SCHEMA_STORE_DIRNAME
+        / f"{hashlib.md5(str(schema_dir).encode()).hexdigest()}.json"
+    )
+
+
+def get_schema_store(schema_dir: Path = None) -> dict:
+    """Return the schema store of a schema directory, which defaults to the
+    package schema directory
+
+    The store maps schema IDs to schemas. It is shared by all callers and
+    must not be modified.
+    """
+    schema_dir = Path(schema_dir or cnst.schema_dir).resolve()
+    schema_files = get_schema_files(schema_dir)
+    stamps = _get_stamps(schema_files)
+    cached = _stores.get(schema_dir)
+    if cached is not None and cached[0] == stamps:
+        return cached[2]
+    persisted = _load_persisted_store(schema_dir, stamps)
+    if persisted is not None:
+        content_hash, store = persisted
+    else:
+        content_hash, store = _load_store(schema_files)
+        _persist_store(schema_dir, stamps, content_hash, store)
+    _stores[schema_dir] = (stamps, content_hash, store)
+    _store_hashes[id(store)] = (store, content_hash)
+    return store
+
+
+def get_content_hash(schema_store: dict) -> str:
+    """Return the hash of the content of a schema store"""
+    known = _store_hashes.get(id(schema_store))
+    if known is not None and known[0] is schema_store:
+        return known[1]
+    return _hash_store(schema_store)
+
+
+def get_schema_validator(schema_store: dict = None, fast: bool = True):
+    """Return the (shared) catalog schema validator of a schema store,
+    which defaults to the package schema store
+
+    If 'fast' is True, the validator checks records against a compiled form
+    of the schema first (see fast_validator.FastValidator), and only uses
+    the full jsonschema validator to report errors of invalid records.
+
+    Validators are compiled once per process, i.e. they are not persisted
+    like schema stores.
+    """
+    if schema_store is None:
+        schema_store = get_schema_store()
+    content_hash = get_content_hash(schema_store)
+    validator = _validators.get((content_hash, fast))
+    if validator is None:
+        catalog_schema = schema_store[cnst.CATALOG_SCHEMA_IDS[cnst.CATALOG]]
+        resolver = RefResolver.from_schema(catalog_schema, store=schema_store)
+        validator = Draft202012Validator(catalog_schema, resolver=resolver)
+        if fast:
+            validator = FastValidator(validator, schema_store)
+        _validators[(content_hash, fast)] = validator
+    return validator
+
+
+def _get_stamps(schema_files: dict) -> list:
+    stamps = []
+    for schema_type, schema_path in sorted(schema_files.items()):
+        stat = schema_path.stat()
+        stamps.append([schema_type, stat.st_mtime_ns, stat.st_size])
+    return stamps
+
+
+def _hash_store(schema_store: dict) -> str:
+    """Hash the canonical JSON serialization of a schema store, so that the
+    hash does not depend on formatting of the schema files"""
+    return hashlib.md5(
+        json.dumps(schema_store, sort_keys=True).encode()
+    ).hexdigest()
+
+
+def _load_store(schema_files: dict):
+    """Read all schema files into a store"""
+    store = {}
+    for schema_type, schema_path in schema_files.items():
+        schema = json_loads(schema_path.read_bytes())
+        store[schema[cnst.DOLLARID]] = schema
+    return _hash_store(store), store
+
+
+def _load_persisted_store(schema_dir: Path, stamps: list):
+    """Return (content_hash, store) from the persisted schema store, or None
+    if it does not exist or is outdated"""
+    try:
+        persisted = json_loads(get_schema_store_path(schema_dir).read_bytes())
+    except (OSError, ValueError):
+        return None
+    if (
+        not isinstance(persisted, dict)
+        or persisted.get("format") != SCHEMA_STORE_FORMAT
+        or persisted.get("schema_dir") != str(schema_dir)
+        or persisted.get("stamps") != stamps
+    ):
+        return None
+    return persisted["content_hash"], persisted["store"]
+
+
+def _persist_store(schema_dir: Path, stamps: list, content_hash, store):
+    """Save the store for other processes, if the location is writable"""
+    try:
+        store_path = get_schema_store_path(schema_dir)
+        store_path.parent.mkdir(parents=True, exist_ok=True)
+        write_json_file(
+            store_path,
+            dict(
+                format=SCHEMA_STORE_FORMAT,
+                schema_dir=str(schema_dir),
+                stamps=stamps,
+                content_hash=content_hash,
+                store=store,
+            ),
+        )
+    except OSError as e:
+        lgr.debug("Could not persist schema store of %s: %s", schema_dir, e)
@@ -0,0 +1,694 @@
+import json
+import logging
+import os
+from pathlib import Path
+import shutil
+import sqlite3
+import uuid
+import datalad_catalog.constants as cnst
+from datalad_catalog.bundle import (
+    DEFAULT_SHARD_SIZE,
+    discard_bundle,
+    export_bundles,
+)
+from datalad_catalog.compression import (
+    ENCODINGS,
+    get_compressed_path,
+    write_compressed,
+)
+from datalad_catalog.journal import Journal
+from datalad_catalog.locking import FileLock
+from datalad_catalog.pages import (
+    get_page_path,
+    get_stale_page_paths,
+    iter_children,
+    join_children,
+    paginate_children,
+)
+from datalad_catalog.utils import (
+    get_node_file_path,
+    load_config_file,
+    remove_file,
+    write_json_file,
+)
+
+lgr = logging.getLogger("datalad.catalog.storage")
+
+# SQLite connections inherited from a parent process, see SQLiteStore
+_inherited_connections = []
+
+# Names of the available storage backends
+STORAGE_FILES = "files"
+STORAGE_SQLITE = "sqlite"
+
+
+def get_metadata_store(catalog, storage: str = None):
+    """Return the metadata store of a catalog
+
+    If no storage backend is specified, an SQLite store is used if the
+    catalog has an SQLite database, else a file store.
+    """
+    if storage is None:
+        storage = (
+            STORAGE_SQLITE
+            if SQLiteStore.get_database_path(catalog).is_file()
+            else STORAGE_FILES
+        )
+    if storage == STORAGE_FILES:
+        return FileStore(catalog)
+    if storage == STORAGE_SQLITE:
+        return SQLiteStore(catalog)
+    raise ValueError(
+        f"Unknown storage backend {storage!r}, must be one of "
+        f"{STORAGE_FILES!r}, {STORAGE_SQLITE!r}"
+    )
+
+
+class MetadataStore(object):
+    """
+    Base class of the storage backends of a catalog's metadata, i.e. the
+    metadata of Node instances (keyed by their md5 hash) and the
+    dataset-level configs of dataset versions.
+
+    The browser of a catalog reads metadata from the 'metadata' directory,
+    which contains a JSON file per Node instance (see Node.get_location())
+    and per dataset-level config. Stores that keep metadata elsewhere write
+    these files on export().
+
+    Arguments:
+    catalog -- the WebCatalog instance
+    """
+
+    name = None
+
+    def __init__(self, catalog) -> None:
+        self.catalog = catalog
+
+    def initialize(self):
+        """Set up the store for a new catalog"""
+        pass
+
+    def close(self):
+        """Release resources of the store, e.g. before forking worker
+        processes; the store can still be used afterwards"""
+        pass
+
+    def has_node(self, dataset_id, dataset_version, md5_hash) -> bool:
+        """Check if the metadata of a Node instance exists"""
+        raise NotImplementedError
+
+    def read_node(self, dataset_id, dataset_version, md5_hash) -> dict:
+        """Return the metadata of a Node instance, with the children of all
+        of its pages (see pages.paginate_children()), or None if it does not
+        exist"""
+        raise NotImplementedError
+
+    def iter_node_children(self, dataset_id, dataset_version, md5_hash):
+        """Yield the children of a Node instance, reading its pages as
+        needed"""
+        content = self.read_node(dataset_id, dataset_version, md5_hash)
+        yield from (content or {}).get(cnst.CHILDREN) or []
+
+    def get_node_stamp(self, dataset_id, dataset_version, md5_hash):
+        """Return a value that changes whenever the metadata of a Node
+        instance is written, or None if it does not exist"""
+        raise NotImplementedError
+
+    def write_node(self, node_instance, content: dict, transaction=None):
+        """Write the metadata of a Node instance, as part of a transaction
+        (see transaction()) if provided, else atomically on its own"""
+        raise NotImplementedError
+
+    def get_dataset_config_stamp(self, dataset_id, dataset_version):
+        """Return a value that changes whenever the dataset-level config of
+        a dataset version is written, or None if it does not exist"""
+        raise NotImplementedError
+
+    def read_dataset_config(self, dataset_id, dataset_version) -> dict:
+        """Return the dataset-level config of a dataset version"""
+        raise NotImplementedError
+
+    def write_dataset_config(
+        self, dataset_id, dataset_version, config: dict, transaction=None
+    ):
+        """Write the dataset-level config of a dataset version, as part of
+        a transaction (see transaction()) if provided"""
+        raise NotImplementedError
+
+    def transaction(self):
+        """Return a context manager for writing metadata as a single
+        transaction, which commits on success and rolls back on error"""
+        raise NotImplementedError
+
+    def recover(self) -> dict:
+        """Recover from interrupted transactions, see WebCatalog.recover()"""
+        return dict(rolled_forward=0, rolled_back=0)
+
+    def iter_dataset_versions(self):
+        """Yield the (dataset_id, dataset_version) of all dataset versions
+        in the store"""
+        raise NotImplementedError
+
+    def iter_nodes(self, dataset_id, dataset_version):
+        """Yield the md5 hash and the metadata (see read_node()) of all Node
+        instances of a dataset version"""
+        raise NotImplementedError
+
+    def invalidate_bundle(self, dataset_id, dataset_version):
+        """Called before the metadata of a dataset version is written, so
+        that stores that write to the 'metadata' directory directly can
+        discard its (then outdated) bundle, see bundle.write_bundle()"""
+        pass
+
+    def count_files(self, dataset_id, dataset_version) -> int:
+        """Return the number of metadata files of a dataset version in the
+        'metadata' directory (once exported)
+
+        This counts the metadata file of each Node instance and the
+        dataset-level config file, i.e. neither pages of children (see
+        pages.paginate_children()) nor precompressed siblings.
+        """
+        raise NotImplementedError
+
+    def remove_dataset_version(self, dataset_id, dataset_version):
+        """Remove all metadata of a dataset version"""
+        raise NotImplementedError
+
+    def export(
+        self, bundle: bool = False, shard_size: int = DEFAULT_SHARD_SIZE
+    ) -> int:
+        """Write the metadata that changed since the last export to the
+        'metadata' directory, and return the number of written files
+
+        If bundle is True, the metadata of the Node instances of each
+        dataset version is packed into a bundle (see bundle.write_bundle)
+        instead of a file per Node instance, with shards of up to shard_size
+        bytes.
+        """
+        # concurrent exports could otherwise overwrite newer files with
+        # outdated ones
+        with FileLock(
+            Path(self.catalog.locks_path) / "export.lock",
+            timeout=self.catalog.lock_timeout,
+            stats=self.catalog.lock_stats,
+        ):
+            n_files = self._export(nodes=not bundle)
+            if bundle:
+                n_files += export_bundles(self, shard_size)
+        return n_files
+
+    def _export(self, nodes: bool = True) -> int:
+        """Write the metadata that changed since the last export (except
+        for the metadata of Node instances, if nodes is False), and return
+        the number of written files"""
+        return 0
+
+    def _write_json(self, file_path: Path, content, journal=None):
+        """Write a JSON file atomically, via the journal if provided, and
+        its precompressed siblings if configured"""
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.catalog.precompress:
+            write_compressed(
+                file_path,
+                json.dumps(content).encode("utf-8"),
+                self.catalog.precompress,
+                journal,
+            )
+        if journal is not None:
+            journal.write_json(file_path, content)
+        else:
+            write_json_file(file_path, content)
+
+    def _write_node_file(self, file_path: Path, content, journal=None) -> int:
+        """Write the metadata file of a Node instance, and the pages of its
+        children if the catalog paginates children (see
+        pages.paginate_children()), and return the number of written files
+        (without precompressed siblings)
+
+        Pages of a previous version of the file beyond its current number of
+        pages (and their precompressed siblings) are removed, as part of the
+        same journal transaction if provided.
+        """
+        content, pages = paginate_children(
+            content, self.catalog.children_page_size
+        )
+        for page, page_content in enumerate(pages, start=1):
+            self._write_json(
+                get_page_path(file_path, page), page_content, journal
+            )
+        for page_path in get_stale_page_paths(file_path, len(pages)):
+            for stale_path in [page_path] + [
+                get_compressed_path(page_path, encoding)
+                for encoding in ENCODINGS
+            ]:
+                if not stale_path.is_file():
+                    continue
+                if journal is not None:
+                    journal.remove(stale_path)
+                else:
+                    remove_file(stale_path)
+        self._write_json(file_path, content, journal)
+        return len(pages) + 1
+
+
+class FileStore(MetadataStore):
+    """
+    Stores metadata as JSON files in the 'metadata' directory of a catalog,
+    i.e. in the form in which the browser reads it, so that no export is
+    required.
+
+    Transactions are journal.Journal instances.
+    """
+
+    name = STORAGE_FILES
+
+    def _get_node_path(self, dataset_id, dataset_version, md5_hash) -> Path:
+        return get_node_file_path(
+            self.catalog.metadata_path, dataset_id, dataset_version, md5_hash
+        )
+
+    def _get_dataset_config_path(self, dataset_id, dataset_version) -> Path:
+        return (
+            self.catalog.metadata_path
+            / dataset_id
+            / dataset_version
+            / "config.json"
+        )
+
+    def has_node(self, dataset_id, dataset_version, md5_hash) -> bool:
+        return self._get_node_path(
+            dataset_id, dataset_version, md5_hash
+        ).is_file()
+
+    def _read_node_file(self, file_path: Path) -> tuple:
+        """Return the content of a node file (i.e. its first page of
+        children) and a function that reads its further pages"""
+        with open(file_path) as f:
+            content = json.load(f)
+
+        def read_page(page):
+            with open(get_page_path(file_path, page)) as f:
+                return json.load(f)
+
+        return content, read_page
+
+    def read_node(self, dataset_id, dataset_version, md5_hash) -> dict:
+        try:
+            return join_children(
+                *self._read_node_file(
+                    self._get_node_path(dataset_id, dataset_version, md5_hash)
+                )
+            )
+        except FileNotFoundError:
+            return None
+
+    def iter_node_children(self, dataset_id, dataset_version, md5_hash):
+        try:
+            content, read_page = self._read_node_file(
+                self._get_node_path(dataset_id, dataset_version, md5_hash)
+            )
+        except FileNotFoundError:
+            return
+        yield from iter_children(content, read_page)
+
+    def get_node_stamp(self, dataset_id, dataset_version, md5_hash):
+        # since files are replaced on every write, a changed inode or mtime
+        # means that the file was written
+        try:
+            stat = os.stat(
+                self._get_node_path(dataset_id, dataset_version, md5_hash)
+            )
+        except FileNotFoundError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns)
+
+    def write_node(self, node_instance, content: dict, transaction=None):
+        self._write_node_file(
+            node_instance.get_location(), content, transaction
+        )
+
+    def get_dataset_config_stamp(self, dataset_id, dataset_version):
+        try:
+            stat = os.stat(
+                self._get_dataset_config_path(dataset_id, dataset_version)
+            )
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def read_dataset_config(self, dataset_id, dataset_version) -> dict:
+        return load_config_file(
+            self._get_dataset_config_path(dataset_id, dataset_version)
+        )
+
+    def write_dataset_config(
+        self, dataset_id, dataset_version, config: dict, transaction=None
+    ):
+        self._write_json(
+            self._get_dataset_config_path(dataset_id, dataset_version),
+            config,
+            transaction,
+        )
+
+    def transaction(self):
+        return Journal(self.catalog.journal_path)
+
+    def recover(self) -> dict:
+        return Journal.recover(self.catalog.journal_path)
+
+    def iter_dataset_versions(self):
+        metadata_path = self.catalog.metadata_path
+        for dv in sorted(metadata_path.glob("*/*")):
+            # dataset-version directories, i.e. no alias files or internal
+            # directories such as locks and the journal
+            if not dv.is_dir() or dv.parent.name.startswith("."):
+                continue
+            yield dv.parent.name, dv.name
+
+    def iter_nodes(self, dataset_id, dataset_version):
+        version_path = self.catalog.metadata_path / dataset_id / dataset_version
+        # node files are stored as hash_left/hash_right.json (and their
+        # pages as hash_left/hash_right/<page>.json)
+        for path in sorted(version_path.glob("*/*.json")):
+            yield path.parent.name + path.stem, join_children(
+                *self._read_node_file(path)
+            )
+
+    def invalidate_bundle(self, dataset_id, dataset_version):
+        discard_bundle(self.catalog.metadata_path, dataset_id, dataset_version)
+
+    def count_files(self, dataset_id, dataset_version) -> int:
+        version_path = self.catalog.metadata_path / dataset_id / dataset_version
+        return (
+            sum(1 for _ in version_path.glob("*/*.json"))
+            + (version_path / "config.json").is_file()
+        )
+
+    def remove_dataset_version(self, dataset_id, dataset_version):
+        id_path = self.catalog.metadata_path / dataset_id
+        shutil.rmtree(id_path / dataset_version)
+        # remove id directory if it is empty
+        if not any(id_path.iterdir()):
+            shutil.rmtree(id_path)
+
+
+class SQLiteStore(MetadataStore):
+    """
+    Stores metadata in an SQLite database at the catalog root, with a row
+    per Node instance (keyed by its md5 hash, and indexed by dataset id,
+    dataset version, and path) and per dataset-level config.
+
+    The database is used in WAL mode, so that readers are not blocked by
+    a writer. Transactions are database transactions. Writing many small
+    files is deferred to export(), which only writes the metadata that
+    changed since the previous export.
+
+    A connection is opened per process on first use. SQLite connections
+    must not be used across fork(), so close() should be called before
+    forking worker processes; connections inherited nonetheless are never
+    used nor closed by the child process.
+    """
+
+    name = STORAGE_SQLITE
+    _filename = "metadata.sqlite"
+    # seconds to wait for a locked database if the catalog has no lock
+    # timeout
+    _default_timeout = 3600
+    _schema = (
+        "CREATE TABLE IF NOT EXISTS nodes ("
+        " md5_hash TEXT PRIMARY KEY,"
+        " dataset_id TEXT NOT NULL,"
+        " dataset_version TEXT NOT NULL,"
+        " type TEXT NOT NULL,"
+        " node_path TEXT,"
+        " content TEXT NOT NULL,"
+        " revision TEXT NOT NULL,"
+        " exported INTEGER NOT NULL DEFAULT 0)",
+        "CREATE INDEX IF NOT EXISTS nodes_by_dataset_version"
+        " ON nodes (dataset_id, dataset_version, node_path)",
+        "CREATE INDEX IF NOT EXISTS nodes_to_export"
+        " ON nodes (exported) WHERE exported = 0",
+        "CREATE TABLE IF NOT EXISTS dataset_configs ("
+        " dataset_id TEXT NOT NULL,"
+        " dataset_version TEXT NOT NULL,"
+        " content TEXT NOT NULL,"
+        " revision TEXT NOT NULL,"
+        " exported INTEGER NOT NULL DEFAULT 0,"
+        " PRIMARY KEY (dataset_id, dataset_version))",
+        # dataset versions to remove from the 'metadata' directory
+        "CREATE TABLE IF NOT EXISTS removed_dataset_versions ("
+        " dataset_id TEXT NOT NULL,"
+        " dataset_version TEXT NOT NULL,"
+        " PRIMARY KEY (dataset_id, dataset_version))",
+    )
+
+    def __init__(self, catalog) -> None:
+        super().__init__(catalog)
+        self.path = self.get_database_path(catalog)
+        self._connection = None
+        self._pid = None
+
+    @classmethod
+    def get_database_path(cls, catalog) -> Path:
+        return Path(catalog.location) / cls._filename
+
+    def _connect(self) -> sqlite3.Connection:
+        # connections must not be shared with forked processes
+        if self._connection is not None and self._pid != os.getpid():
+            # closing the inherited connection in the child process would
+            # release the database locks held by the child's own connection,
+            # so it is kept alive (and unused) for the life of the process
+            _inherited_connections.append(self._connection)
+            self._connection = None
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            timeout = self.catalog.lock_timeout
+            connection = sqlite3.connect(
+                self.path,
+                timeout=self._default_timeout if timeout is None else timeout,
+                # transactions are started explicitly
+                isolation_level=None,
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            for statement in self._schema:
+                connection.execute(statement)
+            self._connection = connection
+            self._pid = os.getpid()
+        return self._connection
+
+    def initialize(self):
+        self._connect()
+
+    def close(self):
+        if self._connection is not None and self._pid == os.getpid():
+            self._connection.close()
+            self._connection = None
+
+    def _fetch_value(self, query: str, parameters: tuple):
+        row = self._connect().execute(query, parameters).fetchone()
+        return None if row is None else row[0]
+
+    def has_node(self, dataset_id, dataset_version, md5_hash) -> bool:
+        return (
+            self.get_node_stamp(dataset_id, dataset_version, md5_hash)
+            is not None
+        )
+
+    def read_node(self, dataset_id, dataset_version, md5_hash) -> dict:
+        content = self._fetch_value(
+            "SELECT content FROM nodes WHERE md5_hash = ?", (md5_hash,)
+        )
+        return None if content is None else json.loads(content)
+
+    def get_node_stamp(self, dataset_id, dataset_version, md5_hash):
+        return self._fetch_value(
+            "SELECT revision FROM nodes WHERE md5_hash = ?", (md5_hash,)
+        )
+
+    def write_node(self, node_instance, content: dict, transaction=None):
+        node_path = getattr(node_instance, "node_path", None)
+        self._connect().execute(
+            "INSERT OR REPLACE INTO nodes (md5_hash, dataset_id,"
+            " dataset_version, type, node_path, content, revision, exported)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, 0)",
+            (
+                node_instance.md5_hash,
+                node_instance.dataset_id,
+                node_instance.dataset_version,
+                node_instance.type,
+                None if node_path is None else str(node_path),
+                json.dumps(content),
+                uuid.uuid4().hex,
+            ),
+        )
+
+    def get_dataset_config_stamp(self, dataset_id, dataset_version):
+        return self._fetch_value(
+            "SELECT revision FROM dataset_configs"
+            " WHERE dataset_id = ? AND dataset_version = ?",
+            (dataset_id, dataset_version),
+        )
+
+    def read_dataset_config(self, dataset_id, dataset_version) -> dict:
+        content = self._fetch_value(
+            "SELECT content FROM dataset_configs"
+            " WHERE dataset_id = ? AND dataset_version = ?",
+            (dataset_id, dataset_version),
+        )
+        if content is None:
+            raise FileNotFoundError(
+                f"No config of dataset version {dataset_id}, "
+                f"{dataset_version} in {self.path}"
+            )
+        return json.loads(content)
+
+    def write_dataset_config(
+        self, dataset_id, dataset_version, config: dict, transaction=None
+    ):
+        self._connect().execute(
+            "INSERT OR REPLACE INTO dataset_configs (dataset_id,"
+            " dataset_version, content, revision, exported)"
+            " VALUES (?, ?, ?, ?, 0)",
+            (dataset_id, dataset_version, json.dumps(config), uuid.uuid4().hex),
+        )
+
+    def transaction(self):
+        return SQLiteTransaction(self._connect())
+
+    def iter_dataset_versions(self):
+        yield from self._connect().execute(
+            "SELECT DISTINCT dataset_id, dataset_version FROM nodes"
+            " ORDER BY dataset_id, dataset_version"
+        )
+
+    def iter_nodes(self, dataset_id, dataset_version):
+        for md5_hash, content in self._connect().execute(
+            "SELECT md5_hash, content FROM nodes"
+            " WHERE dataset_id = ? AND dataset_version = ?"
+            " ORDER BY node_path",
+            (dataset_id, dataset_version),
+        ):
+            yield md5_hash, json.loads(content)
+
+    def count_files(self, dataset_id, dataset_version) -> int:
+        parameters = (dataset_id, dataset_version)
+        return sum(
+            self._fetch_value(
+                f"SELECT COUNT(*) FROM {table}"
+                " WHERE dataset_id = ? AND dataset_version = ?",
+                parameters,
+            )
+            for table in ("nodes", "dataset_configs")
+        )
+
+    def remove_dataset_version(self, dataset_id, dataset_version):
+        parameters = (dataset_id, dataset_version)
+        with self.transaction() as transaction:
+            for table in ("nodes", "dataset_configs"):
+                transaction.execute(
+                    f"DELETE FROM {table}"
+                    " WHERE dataset_id = ? AND dataset_version = ?",
+                    parameters,
+                )
+            transaction.execute(
+                "INSERT OR IGNORE INTO removed_dataset_versions"
+                " (dataset_id, dataset_version) VALUES (?, ?)",
+                parameters,
+            )
+
+    def _export(self, nodes: bool = True) -> int:
+        connection = self._connect()
+        metadata_path = self.catalog.metadata_path
+        # remove dataset versions first, as they might have been added again
+        removed = connection.execute(
+            "SELECT dataset_id, dataset_version FROM removed_dataset_versions"
+        ).fetchall()
+        for dataset_id, dataset_version in removed:
+            id_path = metadata_path / dataset_id
+            shutil.rmtree(id_path / dataset_version, ignore_errors=True)
+            if id_path.is_dir() and not any(id_path.iterdir()):
+                shutil.rmtree(id_path)
+            connection.execute(
+                "DELETE FROM removed_dataset_versions"
+                " WHERE dataset_id = ? AND dataset_version = ?",
+                (dataset_id, dataset_version),
+            )
+        n_files = 0
+
+        def write_config_file(file_path, content):
+            self._write_json(file_path, content)
+            return 1
+
+        exports = [
+            (
+                "SELECT md5_hash, dataset_id, dataset_version, content,"
+                " revision FROM nodes WHERE exported = 0",
+                "UPDATE nodes SET exported = 1"
+                " WHERE md5_hash = ? AND revision = ?",
+                lambda key, d_id, d_version: get_node_file_path(
+                    metadata_path, d_id, d_version, key
+                ),
+                self._write_node_file,
+            ),
+            (
+                "SELECT dataset_id || '/' || dataset_version, dataset_id,"
+                " dataset_version, content, revision FROM dataset_configs"
+                " WHERE exported = 0",
+                "UPDATE dataset_configs SET exported = 1"
+                " WHERE dataset_id || '/' || dataset_version = ?"
+                " AND revision = ?",
+                lambda key, d_id, d_version: (
+                    metadata_path / d_id / d_version / "config.json"
+                ),
+                write_config_file,
+            ),
+        ]
+        if not nodes:
+            # bundled instead
+            exports = exports[1:]
+        for select, update, get_path, write in exports:
+            # the table must not be modified while its rows are iterated,
+            # i.e. rows are marked as exported once all were written
+            exported = []
+            rows = connection.execute(select)
+            while True:
+                chunk = rows.fetchmany(1000)
+                if not chunk:
+                    break
+                for key, d_id, d_version, content, revision in chunk:
+                    n_files += write(
+                        get_path(key, d_id, d_version), json.loads(content)
+                    )
+                    exported.append((key, revision))
+            # rows that were written again in the meantime are exported
+            # again next time
+            connection.executemany(update, exported)
+        return n_files
+
+
+class SQLiteTransaction(object):
+    """
+    A database transaction of an SQLiteStore, as a context manager that
+    commits on success and rolls back on error.
+
+    The write lock of the database is acquired when the transaction is
+    entered, so that transactions of concurrent processes are serialized.
+    """
+
+    def __init__(self, connection: sqlite3.Connection) -> None:
+        self.connection = connection
+
+    def __enter__(self):
+        self.connection.execute("BEGIN IMMEDIATE")
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.connection.execute("COMMIT")
+        else:
+            self.connection.execute("ROLLBACK")
+        return False
+
+    def execute(self, query: str, parameters: tuple = ()):
+        return self.connection.execute(query, parameters)
@@ -3,6 +3,8 @@ from datalad.tests.utils_pytest import (
     assert_result_count,
 )
 from datalad_catalog.add import Add
+from datalad_catalog.jsonl import iter_jsonl
+from datalad_catalog.webcatalog import WebCatalog
 
 import io
 import json
@@ -139,3 +141,138 @@ def test_add_from_dict(demo_catalog):
         status="ok",
         path=demo_catalog.location,
     )
+
+
+def test_add_batched(tmp_path, demo_catalog, test_data):
+    """Adding records in batches results in the same catalog content as
+    adding them one at a time"""
+    batched_catalog = WebCatalog(location=tmp_path / "batched_catalog")
+    batched_catalog.create(config_file=str(test_data.demo_config_path_catalog))
+    for metadata in (
+        test_data.catalog_metadata_dataset1,
+        test_data.catalog_metadata_file1,
+    ):
+        res = catalog_add(
+            catalog=demo_catalog,
+            metadata=metadata,
+            on_failure="ignore",
+            return_type="list",
+        )
+        res_batched = catalog_add(
+            catalog=batched_catalog,
+            metadata=metadata,
+            batch_size=3,
+            on_failure="ignore",
+            return_type="list",
+        )
+        assert [r["status"] for r in res] == [r["status"] for r in res_batched]
+        assert [r["message"] for r in res] == [
+            r["message"] for r in res_batched
+        ]
+    _assert_same_metadata(demo_catalog, batched_catalog)
+
+
+def test_add_batched_faulty(demo_catalog, test_data):
+    """Results of batched adding are reported in input order"""
+    res = catalog_add(
+        catalog=demo_catalog,
+        metadata=test_data.catalog_metadata_valid_invalid,
+        batch_size=10,
+        on_failure="ignore",
+        return_type="list",
+    )
+    res_serial = catalog_add(
+        catalog=demo_catalog,
+        metadata=test_data.catalog_metadata_valid_invalid,
+        on_failure="ignore",
+        return_type="list",
+    )
+    assert [r["status"] for r in res] == [r["status"] for r in res_serial]
+
+
+def test_add_parallel(tmp_path, demo_catalog, test_data):
+    """Adding records in parallel results in the same catalog content as
+    adding them in the current process, and reports results in order"""
+    parallel_catalog = WebCatalog(location=tmp_path / "parallel_catalog")
+    parallel_catalog.create(config_file=str(test_data.demo_config_path_catalog))
+    for metadata in (
+        test_data.catalog_metadata_dataset1,
+        test_data.catalog_metadata_dataset2,
+        test_data.catalog_metadata_file1,
+        test_data.catalog_metadata_valid_invalid,
+    ):
+        res = catalog_add(
+            catalog=demo_catalog,
+            metadata=metadata,
+            on_failure="ignore",
+            return_type="list",
+        )
+        res_parallel = catalog_add(
+            catalog=parallel_catalog,
+            metadata=metadata,
+            jobs=2,
+            on_failure="ignore",
+            return_type="list",
+        )
+        assert [r["status"] for r in res] == [r["status"] for r in res_parallel]
+        assert [r.get("message") for r in res] == [
+            r.get("message") for r in res_parallel
+        ]
+    _assert_same_metadata(demo_catalog, parallel_catalog)
+
+
+def test_add_parallel_sqlite(tmp_path, test_data):
+    """Adding records of several datasets in parallel and in several batches
+    to a catalog that stores metadata in SQLite keeps all records"""
+    dataset_record = next(iter_jsonl(test_data.catalog_metadata_dataset1))
+    file_record = next(iter_jsonl(test_data.catalog_metadata_file1))
+    records = []
+    for d in range(4):
+        dataset_id = f"00000000-0000-0000-0000-00000000000{d}"
+        records.append(dict(dataset_record, dataset_id=dataset_id))
+        records.extend(
+            dict(
+                file_record,
+                dataset_id=dataset_id,
+                path=f"dir{i % 5}/sub{i % 3}/file{i}.txt",
+            )
+            for i in range(30)
+        )
+    catalogs = []
+    for name, kwargs in (
+        ("serial", {}),
+        ("parallel", dict(jobs=2, batch_size=20)),
+    ):
+        catalog = WebCatalog(location=tmp_path / name)
+        catalog.create(
+            config_file=str(test_data.demo_config_path_catalog),
+            storage="sqlite",
+        )
+        res = catalog_add(
+            catalog=catalog,
+            metadata=records,
+            on_failure="ignore",
+            return_type="list",
+            **kwargs,
+        )
+        assert_result_count(res, len(records), status="ok")
+        catalog.store.export()
+        catalogs.append(catalog)
+    _assert_same_metadata(*catalogs)
+
+
+def _assert_same_metadata(catalog1, catalog2):
+    """Assert that two catalogs contain the same metadata files"""
+    node_files = sorted(
+        p.relative_to(catalog1.metadata_path)
+        for p in catalog1.metadata_path.rglob("*.json")
+    )
+    node_files2 = sorted(
+        p.relative_to(catalog2.metadata_path)
+        for p in catalog2.metadata_path.rglob("*.json")
+    )
+    assert node_files == node_files2
+    for p in node_files:
+        assert json.loads((catalog1.metadata_path / p).read_text()) == (
+            json.loads((catalog2.metadata_path / p).read_text())
+        )
@@ -0,0 +1,107 @@
+import json
+
+import pytest
+
+from datalad_catalog.bundle import BUNDLE_INDEX_FILENAME
+from datalad_catalog.export import Export
+from datalad_catalog.jsonl import iter_jsonl
+from datalad_catalog.webcatalog import WebCatalog
+
+catalog_export = Export()
+
+
+def load_records(*paths):
+    return [record for path in paths for record in iter_jsonl(path)]
+
+
+def read_bundles(catalog):
+    """Return the content of all nodes in the bundles of a catalog, by
+    (dataset_id, dataset_version, md5_hash)"""
+    nodes = {}
+    for index_path in catalog.metadata_path.glob(
+        f"*/*/{BUNDLE_INDEX_FILENAME}"
+    ):
+        index = json.loads(index_path.read_text())
+        d_version = index_path.parent.name
+        d_id = index_path.parent.parent.name
+        for md5_hash, (shard, offset, length) in index["nodes"].items():
+            with open(index_path.parent / index["shards"][shard], "rb") as f:
+                f.seek(offset)
+                nodes[(d_id, d_version, md5_hash)] = json.loads(f.read(length))
+    return nodes
+
+
+def read_node_files(catalog):
+    """Return the content of all node files of a catalog, by
+    (dataset_id, dataset_version, md5_hash)"""
+    return {
+        (p.parents[2].name, p.parents[1].name, p.parent.name + p.stem): (
+            json.loads(p.read_text())
+        )
+        for p in catalog.metadata_path.glob("*/*/*/*.json")
+    }
+
+
+@pytest.fixture
+def metadata_records(test_data):
+    return load_records(
+        test_data.catalog_metadata_dataset1,
+        test_data.catalog_metadata_dataset2,
+        test_data.catalog_metadata_file1,
+    )
+
+
+def test_bundle_export(demo_catalog, metadata_records):
+    demo_catalog.add_records(metadata_records)
+    res = catalog_export(
+        catalog=demo_catalog,
+        bundle=True,
+        on_failure="ignore",
+        return_type="list",
+    )
+    assert res[0]["status"] == "ok"
+    # an index and a shard per dataset version
+    assert res[0]["exported_files"] == 4
+    node_files = read_node_files(demo_catalog)
+    assert read_bundles(demo_catalog) == node_files
+    # unchanged dataset versions are not bundled again
+    assert demo_catalog.store.export(bundle=True) == 0
+    # updates discard the bundle of a dataset version
+    demo_catalog.add_records(metadata_records[:1])
+    record = metadata_records[0]
+    version_path = (
+        demo_catalog.metadata_path
+        / record["dataset_id"]
+        / record["dataset_version"]
+    )
+    assert not (version_path / BUNDLE_INDEX_FILENAME).exists()
+    assert demo_catalog.store.export(bundle=True) == 2
+    assert len(list(version_path.glob("bundle-*.pack"))) == 1
+    assert read_bundles(demo_catalog) == read_node_files(demo_catalog)
+
+
+def test_bundle_shards(demo_catalog, metadata_records):
+    demo_catalog.add_records(metadata_records)
+    # a shard per node
+    demo_catalog.store.export(bundle=True, shard_size=1)
+    for index_path in demo_catalog.metadata_path.glob(
+        f"*/*/{BUNDLE_INDEX_FILENAME}"
+    ):
+        index = json.loads(index_path.read_text())
+        assert len(index["shards"]) == len(index["nodes"])
+    assert read_bundles(demo_catalog) == read_node_files(demo_catalog)
+
+
+def test_bundle_export_sqlite(
+    tmp_path, test_data, demo_catalog, metadata_records
+):
+    """SQLite catalogs are exported as bundles only"""
+    catalog = WebCatalog(location=tmp_path / "sqlite_catalog")
+    catalog.create(
+        config_file=str(test_data.demo_config_path_catalog), storage="sqlite"
+    )
+    for c in (demo_catalog, catalog):
+        c.add_records(metadata_records)
+    catalog.store.export(bundle=True)
+    assert read_node_files(catalog) == {}
+    assert read_bundles(catalog) == read_node_files(demo_catalog)
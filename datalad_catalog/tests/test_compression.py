@@ -0,0 +1,89 @@
+import gzip
+import json
+import os
+
+import pytest
+
+from datalad_catalog.compression import (
+    brotli,
+    get_compressed_path,
+    get_precompress_encodings,
+    negotiate_compressed_path,
+    parse_accept_encoding,
+)
+from datalad_catalog.jsonl import iter_jsonl
+from datalad_catalog.utils import load_config_file
+from datalad_catalog.webcatalog import WebCatalog
+
+
+@pytest.fixture
+def gzip_catalog(tmp_path, test_data) -> WebCatalog:
+    """A WebCatalog instance that precompresses files with gzip"""
+    config = load_config_file(test_data.demo_config_path_catalog)
+    config["precompress"] = ["gzip"]
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps(config))
+    catalog = WebCatalog(location=tmp_path / "gzip_catalog")
+    catalog.create(config_file=str(config_path))
+    return catalog
+
+
+def test_precompress_encodings():
+    assert get_precompress_encodings({}) == ()
+    assert get_precompress_encodings({"precompress": "gzip"}) == ("gzip",)
+    # unknown encodings are ignored
+    assert get_precompress_encodings(
+        {"precompress": ["gzip", "zip", "gzip"]}
+    ) == ("gzip",)
+    assert get_precompress_encodings({"precompress": True}) == (
+        ("br", "gzip") if brotli is not None else ("gzip",)
+    )
+
+
+def test_precompressed_files(gzip_catalog, test_data):
+    assert gzip_catalog.precompress == ("gzip",)
+    # static content is precompressed on create
+    for path in ("index.html", "config.json", "assets/app.js"):
+        file_path = gzip_catalog.location / path
+        compressed_path = get_compressed_path(file_path, "gzip")
+        assert gzip.decompress(compressed_path.read_bytes()) == (
+            file_path.read_bytes()
+        )
+    # and metadata files when they are written
+    records = list(iter_jsonl(test_data.catalog_metadata_dataset1))
+    gzip_catalog.add_records(records)
+    node_files = list(gzip_catalog.metadata_path.glob("*/*/*/*.json"))
+    assert node_files
+    stats = {}
+    for file_path in node_files:
+        compressed_path = get_compressed_path(file_path, "gzip")
+        assert gzip.decompress(compressed_path.read_bytes()) == (
+            file_path.read_bytes()
+        )
+        stats[compressed_path] = os.stat(compressed_path).st_ino
+    # unchanged files are not compressed again
+    gzip_catalog.add_records(records)
+    assert {p: os.stat(p).st_ino for p in stats} == stats
+
+
+def test_negotiate_compressed_path(tmp_path):
+    file_path = tmp_path / "node.json"
+    file_path.write_text("{}")
+    assert parse_accept_encoding("gzip, deflate;q=0.5, br;q=0") == {
+        "gzip",
+        "deflate",
+    }
+    assert negotiate_compressed_path(file_path, "gzip", ("gzip",)) is None
+    compressed_path = get_compressed_path(file_path, "gzip")
+    compressed_path.write_bytes(gzip.compress(b"{}"))
+    assert negotiate_compressed_path(file_path, "gzip, br", ("gzip",)) == (
+        "gzip",
+        compressed_path,
+    )
+    assert negotiate_compressed_path(file_path, "*", ("gzip",)) == (
+        "gzip",
+        compressed_path,
+    )
+    assert negotiate_compressed_path(file_path, "identity", ("gzip",)) is None
+    # siblings are only served in the encodings of the catalog
+    assert negotiate_compressed_path(file_path, "gzip", ()) is None
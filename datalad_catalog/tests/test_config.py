@@ -1,8 +1,13 @@
 from datalad_catalog.add import Add
 from datalad_catalog.utils import read_json_file
 from datalad_catalog.webcatalog import WebCatalog
-from datalad_catalog.node import Node
+from datalad_catalog.node import (
+    Node,
+    compile_property_sources,
+)
 
+import json
+import os
 from pathlib import Path
 import pytest
 
@@ -139,6 +144,60 @@ def test_dataset_config(tmp_path):
     assert cfg.get("config").get(CATALOG_NAME) == "DataLad Catalog Config Test"
 
 
+def test_dataset_config_cache(demo_catalog_with_config_json):
+    """Dataset-level config files are loaded once and reloaded on change"""
+    ctlg = demo_catalog_with_config_json
+    d_id = "some-id"
+    d_v = "some-version"
+    config_file_path = ctlg.metadata_path / d_id / d_v / "config.json"
+    config_file_path.parent.mkdir(parents=True)
+    config_file_path.write_text(json.dumps({CATALOG_NAME: "first"}))
+    cfg1 = ctlg.get_dataset_config(d_id, d_v)
+    cfg2 = ctlg.get_dataset_config(d_id, d_v)
+    assert cfg1["source"] == "dataset"
+    assert cfg1["config"][CATALOG_NAME] == "first"
+    assert cfg2["config"] is cfg1["config"]
+    # modify the file content and the modification time
+    config_file_path.write_text(json.dumps({CATALOG_NAME: "second"}))
+    st = config_file_path.stat()
+    os.utime(config_file_path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    cfg3 = ctlg.get_dataset_config(d_id, d_v)
+    assert cfg3["config"][CATALOG_NAME] == "second"
+
+
+def test_compile_property_sources():
+    """Config rules are normalized when compiled"""
+    config = {
+        "property_sources": {
+            "dataset": {
+                "dataset_id": {"rule": "single", "source": "metalad_core"},
+                "keywords": {"rule": "merge", "source": "any"},
+                "authors": {"rule": "merge"},
+                "description": {
+                    "rule": "priority",
+                    "source": ["metalad_studyminimeta", "datacite_gin"],
+                },
+                "doi": {"rule": "xxxx", "source": "yyy"},
+                "license": {},
+                "funding": {"source": "any"},
+                "dataset_version": {"rule": "single"},
+            }
+        }
+    }
+    rules = compile_property_sources(config)
+    assert rules["dataset_id"] == ("single", ["metalad_core"])
+    assert rules["keywords"] == ("merge", None)
+    assert rules["authors"] == ("merge", None)
+    assert rules["description"] == (
+        "priority",
+        ["metalad_studyminimeta", "datacite_gin"],
+    )
+    assert rules["doi"] == (None, ["yyy"])
+    assert rules["license"] == (None, [])
+    assert rules["funding"] == (None, None)
+    assert rules["dataset_version"] == ("single", [])
+
+
 def _get_value_from_file(metadata_path, key):
     meta_dict = read_json_file(metadata_path)
     return meta_dict[key]
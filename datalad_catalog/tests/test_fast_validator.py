@@ -0,0 +1,80 @@
+import copy
+
+import pytest
+from jsonschema import ValidationError
+
+from datalad_catalog import schema_registry
+from datalad_catalog.fast_validator import (
+    FastValidator,
+    SchemaCompiler,
+    UnsupportedSchemaError,
+)
+from datalad_catalog.jsonl import iter_jsonl
+
+
+def _records(test_data):
+    records = []
+    for path in sorted(test_data.data_path.glob("catalog_metadata_*.jsonl")):
+        records.extend(r for r in iter_jsonl(path) if isinstance(r, dict))
+    return records
+
+
+def _mutations(value):
+    """Yield variants of a JSON value, modified at any depth"""
+    for replacement in (1, 1.5, "x", True, None, [], {}):
+        yield replacement
+    if isinstance(value, dict):
+        for key in value:
+            mutated = dict(value)
+            del mutated[key]
+            yield mutated
+            for sub in _mutations(value[key]):
+                yield dict(value, **{key: sub})
+        yield dict(value, unknown_key="x")
+    if isinstance(value, list) and value:
+        yield value + [copy.deepcopy(value[0])]
+        for sub in _mutations(value[0]):
+            yield [sub] + value[1:]
+
+
+def test_fast_validator_differential(test_data):
+    """The fast path agrees with the full validator on valid and invalid
+    records"""
+    store = schema_registry.get_schema_store()
+    full = schema_registry.get_schema_validator(store, fast=False)
+    fast = schema_registry.get_schema_validator(store)
+    assert isinstance(fast, FastValidator)
+    assert fast.check is not None
+    n_invalid = 0
+    for record in _records(test_data):
+        assert fast.check(record)
+        for mutated in _mutations(record):
+            is_valid = full.is_valid(mutated)
+            n_invalid += not is_valid
+            assert fast.check(mutated) == is_valid, mutated
+    assert n_invalid
+
+
+def test_fast_validator_errors(test_data):
+    """Invalid records raise the error of the full validator"""
+    fast = schema_registry.get_schema_validator()
+    record = _records(test_data)[0]
+    fast.validate(record)
+    record = dict(record, dataset_id=1)
+    with pytest.raises(ValidationError) as e:
+        fast.validate(record)
+    assert "dataset_id" in str(e.value.path)
+
+
+def test_fast_validator_unsupported():
+    """Schemas with unsupported keywords are validated by the full
+    validator only"""
+    with pytest.raises(UnsupportedSchemaError):
+        SchemaCompiler({}).compile({"type": "string", "minLength": 1})
+    full = schema_registry.get_schema_validator(fast=False)
+    store = {full.schema["$id"]: {"not": {"type": "object"}}}
+    full_unsupported = type(full)(store[full.schema["$id"]])
+    fast = FastValidator(full_unsupported, store)
+    assert fast.check is None
+    assert not fast.is_valid({})
+    assert fast.is_valid("x")
@@ -0,0 +1,123 @@
+import json
+import os
+import pytest
+
+from datalad_catalog.add import Add
+from datalad_catalog.journal import Journal
+from datalad_catalog.utils import (
+    read_json_file,
+    write_json_file,
+)
+
+catalog_add = Add()
+
+
+def test_write_json_file(tmp_path):
+    """Atomic writes replace file content and leave no temporary files"""
+    file_path = tmp_path / "file.json"
+    write_json_file(file_path, {"a": 1})
+    write_json_file(file_path, {"a": 2})
+    assert read_json_file(file_path) == {"a": 2}
+    assert os.listdir(tmp_path) == ["file.json"]
+
+
+def test_journal_commit_rollback(tmp_path):
+    """Files are only replaced once the transaction is committed"""
+    journal_dir = tmp_path / ".journal"
+    file_path = tmp_path / "sub" / "file.json"
+    with Journal(journal_dir) as journal:
+        journal.write_json(file_path, {"a": 1})
+        assert not file_path.exists()
+    assert read_json_file(file_path) == {"a": 1}
+    with pytest.raises(ValueError):
+        with Journal(journal_dir) as journal:
+            journal.write_json(file_path, {"a": 2})
+            raise ValueError("interrupted")
+    assert read_json_file(file_path) == {"a": 1}
+    assert os.listdir(file_path.parent) == ["file.json"]
+    assert not os.listdir(journal_dir)
+
+
+def _interrupt(journal, committed):
+    """Simulate a process that was killed before/after committing"""
+    journal._log(dict(committed=True)) if committed else None
+    journal._close()
+    # a partially written last line is ignored
+    with open(journal.journal_path, "a") as f:
+        f.write('{"targ')
+    # pretend that the journal was written by a process that has exited
+    lines = journal.journal_path.read_text().splitlines(keepends=True)
+    header = json.loads(lines[0])
+    header["pid"] = 0
+    lines[0] = json.dumps(header) + "\n"
+    journal.journal_path.write_text("".join(lines))
+
+
+def test_journal_recover(tmp_path):
+    """Interrupted transactions are rolled forward if committed, and rolled
+    back otherwise"""
+    journal_dir = tmp_path / ".journal"
+    committed_path = tmp_path / "committed.json"
+    uncommitted_path = tmp_path / "uncommitted.json"
+    write_json_file(uncommitted_path, {"a": 1})
+    journal = Journal(journal_dir)
+    journal.write_json(committed_path, {"a": 1})
+    _interrupt(journal, committed=True)
+    journal = Journal(journal_dir)
+    journal.write_json(uncommitted_path, {"a": 2})
+    _interrupt(journal, committed=False)
+    assert Journal.recover(journal_dir) == dict(rolled_forward=1, rolled_back=1)
+    assert read_json_file(committed_path) == {"a": 1}
+    assert read_json_file(uncommitted_path) == {"a": 1}
+    assert sorted(os.listdir(tmp_path)) == [
+        ".journal",
+        "committed.json",
+        "uncommitted.json",
+    ]
+    assert not os.listdir(journal_dir)
+
+
+def test_add_recovers(demo_catalog, test_data):
+    """catalog-add recovers interrupted transactions of a previous run"""
+    journal = demo_catalog.get_journal()
+    stale_path = demo_catalog.metadata_path / "stale.json"
+    journal.write_json(stale_path, {})
+    _interrupt(journal, committed=False)
+    res = catalog_add(
+        catalog=demo_catalog,
+        metadata=test_data.catalog_metadata_dataset1,
+        on_failure="ignore",
+        return_type="list",
+    )
+    assert all(r["status"] == "ok" for r in res)
+    assert not stale_path.exists()
+    assert not list(demo_catalog.metadata_path.rglob("*.tmp"))
+    assert not os.listdir(demo_catalog.journal_path)
+
+
+def test_journal_remove(tmp_path):
+    """Files are removed when the transaction is committed, also when it is
+    rolled forward, and kept otherwise"""
+    journal_dir = tmp_path / ".journal"
+    file_path = tmp_path / "file.json"
+    write_json_file(file_path, {"a": 1})
+    with pytest.raises(RuntimeError):
+        with Journal(journal_dir) as journal:
+            journal.remove(file_path)
+            raise RuntimeError("interrupted")
+    assert file_path.exists()
+    journal = Journal(journal_dir)
+    journal.remove(file_path)
+    _interrupt(journal, committed=False)
+    assert Journal.recover(journal_dir) == dict(rolled_forward=0, rolled_back=1)
+    assert file_path.exists()
+    journal = Journal(journal_dir)
+    journal.remove(file_path)
+    _interrupt(journal, committed=True)
+    assert Journal.recover(journal_dir) == dict(rolled_forward=1, rolled_back=0)
+    assert not file_path.exists()
+    with Journal(journal_dir) as journal:
+        journal.write_json(file_path, {"a": 2})
+    with Journal(journal_dir) as journal:
+        journal.remove(file_path)
+    assert not file_path.exists()
@@ -0,0 +1,81 @@
+import gzip
+import io
+import pytest
+
+from datalad_catalog.add import Add
+from datalad_catalog.jsonl import (
+    iter_jsonl,
+    json_loads,
+    zstandard,
+)
+from datalad_next.exceptions import CapturedException
+
+catalog_add = Add()
+
+content = b'{"a": 1}\n\n{"b": [1, 2]}\nnot json\n{"c": NaN}\n'
+
+
+def _check_items(items):
+    assert items[:2] == [{"a": 1}, {"b": [1, 2]}]
+    assert isinstance(items[2], CapturedException)
+    # falls back to the standard library for content rejected by orjson
+    assert str(items[3]["c"]) == "nan"
+    assert len(items) == 4
+
+
+def test_json_loads():
+    assert json_loads('{"a": [1, "b"]}') == {"a": [1, "b"]}
+    assert json_loads(b'{"a": [1, "b"]}') == {"a": [1, "b"]}
+    assert json_loads(str(2**70)) == 2**70
+
+
+def test_iter_jsonl_file(tmp_path):
+    path = tmp_path / "metadata.jsonl"
+    path.write_bytes(content)
+    _check_items(list(iter_jsonl(path)))
+    _check_items(list(iter_jsonl(io.BytesIO(content))))
+    _check_items(list(iter_jsonl(io.StringIO(content.decode()))))
+    with pytest.raises(ValueError):
+        list(iter_jsonl(path, exc_mode="raise"))
+
+
+def test_iter_jsonl_gzip(tmp_path):
+    path = tmp_path / "metadata.jsonl.gz"
+    path.write_bytes(gzip.compress(content))
+    _check_items(list(iter_jsonl(path)))
+
+
+@pytest.mark.skipif(zstandard is None, reason="zstandard not installed")
+def test_iter_jsonl_zstd(tmp_path):
+    path = tmp_path / "metadata.jsonl.zst"
+    path.write_bytes(zstandard.ZstdCompressor().compress(content))
+    _check_items(list(iter_jsonl(path)))
+
+
+def test_iter_jsonl_is_lazy(tmp_path):
+    """Lines are only read when items are requested"""
+    fp = io.BytesIO(b'{"a": 1}\n' * 10)
+    items = iter_jsonl(fp)
+    assert next(items) == {"a": 1}
+    assert fp.tell() < len(fp.getvalue())
+
+
+def test_add_compressed(demo_catalog, test_data, tmp_path):
+    """Compressed metadata files can be added to a catalog"""
+    path = tmp_path / "metadata.jsonl.gz"
+    path.write_bytes(
+        gzip.compress(test_data.catalog_metadata_valid_invalid.read_bytes())
+    )
+    res_plain = catalog_add(
+        catalog=demo_catalog,
+        metadata=test_data.catalog_metadata_valid_invalid,
+        on_failure="ignore",
+        return_type="list",
+    )
+    res = catalog_add(
+        catalog=demo_catalog,
+        metadata=path,
+        on_failure="ignore",
+        return_type="list",
+    )
+    assert [r["status"] for r in res] == [r["status"] for r in res_plain]
@@ -0,0 +1,120 @@
+import pytest
+
+from datalad_catalog.add import Add
+from datalad_catalog.locking import (
+    FileLock,
+    LockStats,
+    LockTimeoutError,
+)
+from datalad_catalog.webcatalog import WebCatalog
+
+catalog_add = Add()
+
+ds_id = "deabeb9b-7a37-4062-a1e0-8fcef7909609"
+ds_v = "0321dbde969d2f5d6b533e35b5c5c51ac0b15758"
+
+
+def _file_record(path):
+    return {
+        "type": "file",
+        "dataset_id": ds_id,
+        "dataset_version": ds_v,
+        "path": path,
+        "metadata_sources": {
+            "key_source_map": {},
+            "sources": [
+                {
+                    "source_name": "tester",
+                    "source_version": "1",
+                }
+            ],
+        },
+    }
+
+
+def test_file_lock(tmp_path):
+    """Exclusive locks block, shared locks only block exclusive ones"""
+    lock_path = tmp_path / "locks" / "test.lock"
+    stats = LockStats()
+    with FileLock(lock_path, stats=stats):
+        with pytest.raises(LockTimeoutError):
+            with FileLock(lock_path, timeout=0.1, stats=stats):
+                pass
+    with FileLock(lock_path, shared=True, stats=stats):
+        with FileLock(lock_path, shared=True, timeout=0, stats=stats):
+            pass
+        with pytest.raises(LockTimeoutError):
+            with FileLock(lock_path, timeout=0, stats=stats):
+                pass
+    with FileLock(lock_path, timeout=0, stats=stats):
+        pass
+    assert stats.acquired == 4
+    assert stats.timeouts == 2
+    assert stats.wait_time >= 0.1
+
+
+def test_add_lock_timeout(demo_catalog, test_data):
+    """Records of a locked dataset version are reported as errors"""
+    other_catalog = WebCatalog(location=demo_catalog.location)
+    with other_catalog.lock(ds_id, ds_v):
+        res = catalog_add(
+            catalog=demo_catalog,
+            metadata=test_data.catalog_metadata_dataset1,
+            lock_timeout=0.1,
+            on_failure="ignore",
+            return_type="list",
+        )
+    assert res[0]["status"] == "error"
+    assert isinstance(res[0]["exception"], LockTimeoutError)
+    assert demo_catalog.lock_stats.timeouts == 1
+    assert demo_catalog.get_record(ds_id, ds_v) is None
+    # the catalog-wide lock blocks all dataset versions
+    with other_catalog.lock():
+        res = catalog_add(
+            catalog=demo_catalog,
+            metadata=test_data.catalog_metadata_dataset1,
+            lock_timeout=0,
+            catalog_lock=True,
+            on_failure="ignore",
+            return_type="list",
+        )
+    assert res[0]["status"] == "error"
+
+
+def test_add_concurrent_writers(demo_catalog, test_data):
+    """Updates of another catalog instance are not lost, even if the nodes
+    of the dataset version are cached"""
+    other_catalog = WebCatalog(location=demo_catalog.location)
+    catalog_add(
+        catalog=demo_catalog,
+        metadata=test_data.catalog_metadata_dataset1,
+        return_type="list",
+    )
+    demo_catalog.add_record(_file_record("dir/file1.txt"))
+    other_catalog.add_record(_file_record("dir/file2.txt"))
+    demo_catalog.add_record(_file_record("dir/file3.txt"))
+    for ctlg in (demo_catalog, WebCatalog(location=demo_catalog.location)):
+        record = ctlg.get_record(ds_id, ds_v, "directory", "dir")
+        assert sorted(c["name"] for c in record["children"]) == [
+            "file1.txt",
+            "file2.txt",
+            "file3.txt",
+        ]
+
+
+def test_lock_files(demo_catalog):
+    """Lock files are kept outside of the served metadata directory, and do
+    not accumulate with the number of dataset versions"""
+    for i in range(2 * WebCatalog._lock_stripes):
+        with demo_catalog.lock(ds_id, str(i)):
+            pass
+    assert not demo_catalog.locks_path.is_relative_to(
+        demo_catalog.metadata_path
+    )
+    assert not demo_catalog.journal_path.is_relative_to(
+        demo_catalog.metadata_path
+    )
+    assert (
+        len(list(demo_catalog.locks_path.iterdir()))
+        <= WebCatalog._lock_stripes + 1
+    )
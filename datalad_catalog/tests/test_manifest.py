@@ -0,0 +1,163 @@
+import json
+
+from datalad_catalog.jsonl import iter_jsonl
+from datalad_catalog.remove import Remove
+from datalad_catalog.webcatalog import WebCatalog
+
+catalog_remove = Remove()
+
+
+def load_records(*paths):
+    return [record for path in paths for record in iter_jsonl(path)]
+
+
+def scan_versions(catalog):
+    """Return the manifest entries that correspond to the metadata
+    directory, by reading all dataset versions"""
+    return {
+        (v["dataset_id"], v["dataset_version"]): v
+        for v in catalog.manifest.rebuild()
+    }
+
+
+def manifest_versions(catalog):
+    return {
+        (v["dataset_id"], v["dataset_version"]): v
+        for v in catalog.manifest.read()
+    }
+
+
+def test_manifest_add_remove(demo_catalog, test_data):
+    """The manifest is updated incrementally when records are added and
+    removed, and matches the metadata directory"""
+    assert demo_catalog.manifest.exists()
+    assert demo_catalog.get_dataset_versions() == []
+    records = load_records(
+        test_data.catalog_metadata_dataset1,
+        test_data.catalog_metadata_dataset2,
+    )
+    demo_catalog.add_records(records)
+    versions = manifest_versions(demo_catalog)
+    assert len(versions) == 2
+    for v in versions.values():
+        version_path = (
+            demo_catalog.metadata_path / v["dataset_id"] / v["dataset_version"]
+        )
+        assert v["file_count"] == len(list(version_path.rglob("*.json")))
+        assert (demo_catalog.metadata_path / v["metadata_path"]).is_file()
+    # adding file records creates directory nodes
+    demo_catalog.add_records(load_records(test_data.catalog_metadata_file1))
+    file_record = load_records(test_data.catalog_metadata_file1)[0]
+    key = (file_record["dataset_id"], file_record["dataset_version"])
+    assert manifest_versions(demo_catalog)[key]["file_count"] > (
+        versions[key]["file_count"]
+    )
+    # the incrementally updated manifest equals a rebuilt one
+    incremental = manifest_versions(demo_catalog)
+    assert incremental == scan_versions(demo_catalog)
+    # removal
+    res = catalog_remove(
+        catalog=demo_catalog,
+        dataset_id=key[0],
+        dataset_version=key[1],
+        reckless=True,
+        on_failure="ignore",
+        return_type="list",
+    )
+    assert res[0]["status"] == "ok"
+    assert set(manifest_versions(demo_catalog)) == set(incremental) - {key}
+
+
+def test_catalog_report(demo_catalog_default_config, test_data):
+    records = load_records(
+        test_data.catalog_metadata_dataset1,
+        test_data.catalog_metadata_dataset2,
+        test_data.catalog_metadata_file1,
+    )
+    demo_catalog_default_config.add_records(records)
+    demo_catalog_default_config.set_main_dataset(
+        records[0]["dataset_id"], records[0]["dataset_version"]
+    )
+    report = demo_catalog_default_config.get_catalog_report()
+    assert report["dataset_count"] == 2
+    assert report["version_count"] == 2
+    assert report["metadata_file_count"] == len(
+        list(demo_catalog_default_config.metadata_path.rglob("*.json"))
+    )
+    names = {v["dataset_id"]: v["dataset_name"] for v in report["versions"]}
+    assert names == {r["dataset_id"]: r["name"] for r in records[:2]}
+
+
+def test_manifest_missing(demo_catalog, test_data):
+    """Catalogs without a manifest get one when it is first read"""
+    demo_catalog.add_records(load_records(test_data.catalog_metadata_dataset1))
+    demo_catalog.manifest.discard()
+    # changes are not recorded without a manifest
+    demo_catalog.add_records(load_records(test_data.catalog_metadata_dataset2))
+    assert not demo_catalog.manifest.exists()
+    catalog = WebCatalog(location=demo_catalog.location)
+    assert len(catalog.get_dataset_versions()) == 2
+    assert catalog.manifest.exists()
+
+
+def test_manifest_compaction(demo_catalog, test_data):
+    """Outdated lines are removed from the manifest file when it is read"""
+    records = load_records(test_data.catalog_metadata_dataset1)
+    for _ in range(150):
+        demo_catalog.add_records(records)
+    path = demo_catalog.manifest.path
+    assert len(path.read_text().splitlines()) == 150
+    versions = manifest_versions(demo_catalog)
+    assert len(path.read_text().splitlines()) == 1
+    assert manifest_versions(demo_catalog) == versions
+    assert versions == scan_versions(demo_catalog)
+
+
+def test_manifest_incomplete_line(demo_catalog, test_data):
+    """An incompletely written line does not affect other entries"""
+    demo_catalog.add_records(load_records(test_data.catalog_metadata_dataset1))
+    with open(demo_catalog.manifest.path, "a") as f:
+        f.write(json.dumps({"dataset_id": "x"})[:5])
+    demo_catalog.add_records(load_records(test_data.catalog_metadata_dataset2))
+    assert manifest_versions(demo_catalog) == scan_versions(demo_catalog)
+
+
+def test_manifest_without_source_time(demo_catalog, test_data):
+    """Metadata sources without a source_time are ignored for the time of
+    the last update of a dataset version"""
+    records = load_records(test_data.catalog_metadata_dataset1)
+    source_time = records[0]["metadata_sources"]["sources"][0]["source_time"]
+    for record in records:
+        record["metadata_sources"]["sources"][0].pop("source_time")
+    res = demo_catalog.add_records(records)
+    assert all("exception" not in r for r in res)
+    versions = manifest_versions(demo_catalog)
+    assert [v["updated_at"] for v in versions.values()] == [None]
+    # a further source with a source_time
+    records = load_records(test_data.catalog_metadata_dataset1)
+    for record in records:
+        record["metadata_sources"]["sources"][0].update(
+            source_name="other_source", source_time=source_time
+        )
+    res = demo_catalog.add_records(records)
+    assert all("exception" not in r for r in res)
+    versions = manifest_versions(demo_catalog)
+    assert [v["updated_at"] for v in versions.values()] == [source_time]
+    assert versions == scan_versions(demo_catalog)
+
+
+def test_manifest_update_failure(demo_catalog, test_data, monkeypatch):
+    """Records are added even if the manifest could not be updated, which
+    is then rebuilt when it is read next"""
+
+    def fail(*args, **kwargs):
+        raise OSError("manifest not writable")
+
+    monkeypatch.setattr(demo_catalog.manifest, "update_dataset_version", fail)
+    res = demo_catalog.add_records(
+        load_records(test_data.catalog_metadata_dataset1)
+    )
+    assert all("exception" not in r for r in res)
+    assert not demo_catalog.manifest.exists()
+    assert len(manifest_versions(demo_catalog)) == 1
+    assert demo_catalog.manifest.exists()
@@ -0,0 +1,157 @@
+"""Differential tests of the jq-based and pure-Python translation paths"""
+import copy
+import json
+from pathlib import Path
+
+import pytest
+
+from datalad_catalog.jsonl import iter_jsonl
+from datalad_catalog.translators.bids_dataset_translator import (
+    BIDSDatasetTranslator,
+)
+from datalad_catalog.translators.datacite_gin_translator import (
+    DataciteGINTranslator,
+)
+from datalad_catalog.translators.metalad_core_translator import (
+    MetaladCoreTranslator,
+)
+from datalad_catalog.translators.metalad_studyminimeta_translator import (
+    MetaladStudyminimetaTranslator,
+)
+
+data_path = Path(__file__).resolve().parent / "data"
+
+translators = {
+    "bids_dataset": BIDSDatasetTranslator(),
+    "datacite_gin": DataciteGINTranslator(),
+    "metalad_core": MetaladCoreTranslator(),
+    "metalad_studyminimeta": MetaladStudyminimetaTranslator(),
+}
+
+
+def load_fixture_records():
+    """Return all metadata records of the test data that can be translated
+    by one of the bundled translators"""
+    records = []
+    for path in sorted(data_path.glob("metadata_*.json*")):
+        text = path.read_text()
+        try:
+            items = [json.loads(text)]
+        except ValueError:
+            items = list(iter_jsonl(path))
+        for item in items:
+            for record in item if isinstance(item, list) else [item]:
+                if (
+                    isinstance(record, dict)
+                    and record.get("extractor_name") in translators
+                ):
+                    records.append(pytest.param(record, id=path.name))
+    return records
+
+
+def iter_mutations(record):
+    """Yield variants of a record with (nested) values removed or replaced,
+    to compare both paths on incomplete and malformed metadata too"""
+    extracted = record["extracted_metadata"]
+    for key in list(extracted):
+        for value in (None, [], {}, "", "DOI:x", [None], [{}], 1):
+            mutated = copy.deepcopy(record)
+            if value is None:
+                del mutated["extracted_metadata"][key]
+            else:
+                mutated["extracted_metadata"][key] = value
+            yield mutated
+    for key in ("extractor_version", "agent_email", "extraction_time"):
+        mutated = copy.deepcopy(record)
+        mutated.pop(key, None)
+        yield mutated
+    graph = extracted.get("@graph")
+    if not isinstance(graph, list):
+        return
+    for i, node in enumerate(graph):
+        if not isinstance(node, dict):
+            continue
+        for key in list(node):
+            for value in (None, [], "datalad:x\ndatalad:y", [{}], True):
+                mutated = copy.deepcopy(record)
+                if value is None:
+                    del mutated["extracted_metadata"]["@graph"][i][key]
+                else:
+                    mutated["extracted_metadata"]["@graph"][i][key] = value
+                yield mutated
+
+
+def translate_both(record):
+    """Return the results of both paths, as (serialized output, None) or
+    (None, exception type)"""
+    translator = translators[record["extractor_name"]]
+    results = []
+    for translate in (translator.translate, translator.translate_native):
+        try:
+            results.append((json.dumps(translate(copy.deepcopy(record))), None))
+        except Exception as e:
+            results.append((None, e))
+    return results
+
+
+@pytest.mark.parametrize("record", load_fixture_records())
+def test_native_translation_identical(record):
+    (jq_output, jq_error), (native_output, native_error) = translate_both(
+        record
+    )
+    assert jq_error is None and native_error is None
+    assert native_output == jq_output
+
+
+@pytest.mark.parametrize("record", load_fixture_records())
+def test_native_translation_identical_mutated(record):
+    records = [record]
+    if record["extractor_name"] == "metalad_core":
+        # metalad_core file-level records
+        records.append(
+            dict(
+                record,
+                type="file",
+                path="sub/file.txt",
+                extracted_metadata={
+                    "contentbytesize": 7,
+                    "distribution": {"url": ["https://example.com/file"]},
+                },
+            )
+        )
+    n_compared = 0
+    for original in records:
+        for mutated in iter_mutations(original):
+            (jq_output, jq_error), (
+                native_output,
+                native_error,
+            ) = translate_both(mutated)
+            # both paths fail, or produce identical output
+            assert (jq_error is None) == (native_error is None), (
+                jq_error,
+                native_error,
+                mutated,
+            )
+            assert native_output == jq_output, mutated
+            n_compared += 1
+    assert n_compared > 0
+
+
+def test_catalog_translate_native(demo_catalog, test_data):
+    from datalad_catalog.translate import MetaTranslate
+
+    catalog_translate = MetaTranslate()
+    res = [
+        catalog_translate(
+            catalog=demo_catalog,
+            metadata=test_data.demo_metafile_datacite_2items,
+            native=native,
+            on_failure="ignore",
+            return_type="list",
+        )
+        for native in (False, True)
+    ]
+    assert [r["status"] for r in res[1]] == ["ok", "ok"]
+    assert [r["translated_metadata"] for r in res[1]] == [
+        r["translated_metadata"] for r in res[0]
+    ]
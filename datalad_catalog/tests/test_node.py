@@ -131,3 +131,54 @@ def test_add_child_existing(demo_node_directory: Node):
     assert (
         demo_node_directory.children[0][cnst.NAME] == test_child_file[cnst.NAME]
     )
+
+
+def test_add_child_index(demo_node_directory: Node):
+    """
+    Test that children are looked up via an index that keeps insertion
+    order and follows replacement of the children list
+    """
+    names = [f"file{i}" for i in range(5)] + ["file0", "file3"]
+    for name in names:
+        demo_node_directory.add_child(
+            {cnst.TYPE: cnst.TYPE_FILE, cnst.NAME: name}
+        )
+    assert [c[cnst.NAME] for c in demo_node_directory.children] == names[:5]
+    assert demo_node_directory.get_child(cnst.TYPE_FILE, "file3") is (
+        demo_node_directory.children[3]
+    )
+    assert demo_node_directory.get_child(cnst.TYPE_DIRECTORY, "file3") is None
+    # e.g. set_attributes_from_file replaces the list
+    demo_node_directory.children = [
+        {cnst.TYPE: cnst.TYPE_DIRECTORY, cnst.NAME: "file3"}
+    ]
+    assert demo_node_directory.get_child(cnst.TYPE_FILE, "file3") is None
+    demo_node_directory.add_child(
+        {cnst.TYPE: cnst.TYPE_FILE, cnst.NAME: "file3"}
+    )
+    demo_node_directory.add_child(
+        {cnst.TYPE: cnst.TYPE_DIRECTORY, cnst.NAME: "file3"}
+    )
+    assert len(demo_node_directory.children) == 2
+
+
+def test_add_metadata_source_index(demo_node_dataset: Node):
+    """
+    Test that metadata sources are deduplicated by name and version, and
+    that merged key sources keep their order
+    """
+    for name, version in [("a", "1"), ("b", "1"), ("a", "1"), ("a", "2")]:
+        demo_node_dataset.add_metadata_source(
+            {cnst.SOURCE_NAME: name, cnst.SOURCE_VERSION: version}
+        )
+    assert [
+        (s[cnst.SOURCE_NAME], s[cnst.SOURCE_VERSION])
+        for s in demo_node_dataset.metadata_sources[cnst.SOURCES]
+    ] == [("a", "1"), ("b", "1"), ("a", "2")]
+    assert demo_node_dataset.get_metadata_source("b", "1") is (
+        demo_node_dataset.metadata_sources[cnst.SOURCES][1]
+    )
+    assert demo_node_dataset.get_metadata_source("b", "2") is None
+    for name in ["c", "a", "b", "a", "c"]:
+        demo_node_dataset.add_source_map_entry("keywords", name, "merge")
+    assert demo_node_dataset.get_source_map_entry("keywords") == ["c", "a", "b"]
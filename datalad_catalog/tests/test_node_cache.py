@@ -0,0 +1,136 @@
+from datalad_catalog.add import Add
+from datalad_catalog.jsonl import iter_jsonl
+from datalad_catalog.node import Node
+from datalad_catalog.node_cache import NodeCache
+from datalad_catalog.utils import md5sum_from_id_version_path
+from datalad_catalog.webcatalog import WebCatalog
+
+from pathlib import Path
+
+catalog_add = Add()
+
+ds_id = "deabeb9b-7a37-4062-a1e0-8fcef7909609"
+ds_v = "0321dbde969d2f5d6b533e35b5c5c51ac0b15758"
+
+
+def test_node_cache_lru(demo_catalog):
+    """Least recently used nodes are evicted, and dirty nodes are written
+    to file on eviction"""
+    cache = NodeCache(maxsize=2)
+    nodes = [
+        Node(
+            catalog=demo_catalog,
+            type="directory",
+            dataset_id=ds_id,
+            dataset_version=ds_v,
+            node_path=Path(f"dir{i}"),
+        )
+        for i in range(3)
+    ]
+    cache.mark_dirty(nodes[0])
+    cache.put(nodes[1])
+    # access first node to make the second one least recently used
+    assert cache.get(nodes[0].md5_hash) is nodes[0]
+    cache.put(nodes[2])
+    assert len(cache) == 2
+    assert nodes[1].md5_hash not in cache
+    assert not nodes[0].is_created()
+    # now evict the dirty first node
+    cache.put(nodes[1])
+    assert nodes[0].md5_hash not in cache
+    assert nodes[0].is_created()
+    assert not nodes[1].is_created()
+
+
+def test_node_cache_flush(demo_catalog):
+    """Flushing writes dirty nodes only"""
+    cache = NodeCache()
+    node_instance = Node(
+        catalog=demo_catalog,
+        type="directory",
+        dataset_id=ds_id,
+        dataset_version=ds_v,
+        node_path=Path("dir"),
+    )
+    cache.put(node_instance)
+    cache.flush()
+    assert not node_instance.is_created()
+    cache.mark_dirty(node_instance)
+    assert cache.is_dirty(node_instance.md5_hash)
+    cache.flush()
+    assert node_instance.is_created()
+    assert not cache.is_dirty(node_instance.md5_hash)
+    # the instance remains usable after being written
+    assert node_instance.parent_catalog is demo_catalog
+
+
+def test_catalog_node_cache(demo_catalog, test_data):
+    """Nodes are reused by the catalog instead of being read again"""
+    catalog_add(
+        catalog=demo_catalog,
+        metadata=test_data.catalog_metadata_dataset1,
+        on_failure="ignore",
+        return_type="list",
+    )
+    node_hash = md5sum_from_id_version_path(ds_id, ds_v)
+    assert node_hash in demo_catalog.node_cache
+    node_instance = demo_catalog.get_node("dataset", ds_id, ds_v)
+    assert node_instance is demo_catalog.node_cache.get(node_hash)
+    record = demo_catalog.get_record(ds_id, ds_v)
+    assert record["dataset_id"] == ds_id
+    # modifying the returned record does not modify the cached node
+    record["name"] = "something else"
+    record["metadata_sources"]["sources"].append({})
+    record["children"].append({})
+    assert node_instance.name != "something else"
+    assert len(demo_catalog.get_record(ds_id, ds_v)["children"]) == len(
+        node_instance.children
+    )
+    assert record["metadata_sources"] != node_instance.metadata_sources
+    assert record["parent_catalog"] is demo_catalog
+    # invalidating the cache yields a new instance on the next request
+    demo_catalog.node_cache.invalidate(ds_id, ds_v)
+    assert node_hash not in demo_catalog.node_cache
+    assert demo_catalog.get_node("dataset", ds_id, ds_v) is not node_instance
+
+
+def test_node_cache_pin(demo_catalog):
+    """Pinned nodes are not evicted, also not if they are dirty"""
+    cache = NodeCache(maxsize=1)
+    nodes = [
+        Node(
+            catalog=demo_catalog,
+            type="directory",
+            dataset_id=ds_id,
+            dataset_version=ds_v,
+            node_path=Path(f"dir{i}"),
+        )
+        for i in range(3)
+    ]
+    with cache.pin([n.md5_hash for n in nodes[:2]]):
+        for node_instance in nodes:
+            cache.mark_dirty(node_instance)
+        assert all(n.md5_hash in cache for n in nodes[:2])
+        assert not any(n.is_created() for n in nodes[:2])
+        cache.flush(journal=None)
+    # once unpinned, the cache shrinks to its maxsize again
+    assert len(cache) == 1
+
+
+def test_add_group_larger_than_node_cache(demo_catalog, test_data):
+    """A group of records that touches more nodes than fit into the node
+    cache is still written as a single transaction"""
+    catalog = WebCatalog(location=demo_catalog.location, node_cache_size=2)
+    catalog.add_records(list(iter_jsonl(test_data.catalog_metadata_dataset1)))
+    node_files = sorted(catalog.metadata_path.rglob("*.json"))
+    file_record = next(iter_jsonl(test_data.catalog_metadata_file1))
+    records = [dict(file_record, path=f"dir{i}/file.txt") for i in range(5)]
+
+    def failing_transaction():
+        raise RuntimeError("transaction failed")
+
+    catalog.store.transaction = failing_transaction
+    results = catalog.add_records(records)
+    assert all("exception" in record_props for record_props in results)
+    # none of the directory nodes were written
+    assert sorted(catalog.metadata_path.rglob("*.json")) == node_files
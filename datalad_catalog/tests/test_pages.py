@@ -0,0 +1,198 @@
+import json
+
+import pytest
+
+from datalad_catalog.bundle import BUNDLE_INDEX_FILENAME
+from datalad_catalog.jsonl import iter_jsonl
+from datalad_catalog.pages import (
+    get_children_page_size,
+    get_page_path,
+    join_children,
+    paginate_children,
+)
+from datalad_catalog.utils import (
+    get_node_file_path,
+    load_config_file,
+    md5sum_from_id_version_path,
+)
+from datalad_catalog.webcatalog import WebCatalog
+
+PAGE_SIZE = 10
+N_FILES = 25
+DIRECTORY = "derivatives/many"
+
+
+@pytest.fixture(params=["files", "sqlite"])
+def paged_catalog(request, tmp_path, test_data) -> WebCatalog:
+    """A WebCatalog instance that paginates the children of nodes"""
+    config = load_config_file(test_data.demo_config_path_catalog)
+    config["children_page_size"] = PAGE_SIZE
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps(config))
+    catalog = WebCatalog(location=tmp_path / "paged_catalog")
+    catalog.create(config_file=str(config_path), storage=request.param)
+    return catalog
+
+
+@pytest.fixture
+def file_records(test_data):
+    """Records of N_FILES files in the same directory"""
+    record = next(iter_jsonl(test_data.catalog_metadata_file1))
+    return [
+        dict(record, path=f"{DIRECTORY}/file{i:02d}.txt")
+        for i in range(N_FILES)
+    ]
+
+
+@pytest.fixture
+def paged_catalog_with_files(paged_catalog, test_data, file_records):
+    paged_catalog.add_records(
+        list(iter_jsonl(test_data.catalog_metadata_dataset1))
+    )
+    paged_catalog.add_records(file_records)
+    return paged_catalog
+
+
+def test_children_page_size():
+    assert get_children_page_size({}) is None
+    assert get_children_page_size({"children_page_size": 100}) == 100
+    # invalid values are ignored
+    for page_size in (0, -1, "100", True):
+        assert get_children_page_size({"children_page_size": page_size}) is None
+
+
+def test_paginate_children():
+    content = dict(type="directory", children=[dict(name=i) for i in range(5)])
+    assert paginate_children(content, None) == (content, [])
+    assert paginate_children(content, 5) == (content, [])
+    node, pages = paginate_children(content, 2)
+    assert node == dict(
+        type="directory",
+        children=content["children"][:2],
+        children_count=5,
+        children_pages=3,
+        children_page_size=2,
+    )
+    assert pages == [
+        dict(children=content["children"][2:4]),
+        dict(children=content["children"][4:]),
+    ]
+    assert join_children(node, lambda page: pages[page - 1]) == content
+
+
+def test_paginated_children(paged_catalog_with_files, file_records):
+    paged_catalog = paged_catalog_with_files
+    paged_catalog.store.export()
+    d_id = file_records[0]["dataset_id"]
+    d_version = file_records[0]["dataset_version"]
+    node_file = get_node_file_path(
+        paged_catalog.metadata_path,
+        d_id,
+        d_version,
+        md5sum_from_id_version_path(d_id, d_version, DIRECTORY),
+    )
+    # the node file holds the first page, the counts, and the page size
+    node = json.loads(node_file.read_text())
+    assert len(node["children"]) == PAGE_SIZE
+    assert node["children_count"] == N_FILES
+    assert node["children_pages"] == 3
+    assert node["children_page_size"] == PAGE_SIZE
+    pages = [
+        json.loads(get_page_path(node_file, page).read_text())
+        for page in (1, 2)
+    ]
+    assert [len(page["children"]) for page in pages] == [10, 5]
+    paths = [record["path"] for record in file_records]
+    # records are reassembled from all pages, also in a new instance
+    for catalog in (paged_catalog, WebCatalog(location=paged_catalog.location)):
+        record = catalog.get_record(d_id, d_version, "directory", DIRECTORY)
+        assert [c["path"] for c in record["children"]] == paths
+        assert "children_pages" not in record
+        assert (
+            catalog.get_record(d_id, d_version, "file", paths[-1])["path"]
+            == paths[-1]
+        )
+        assert [
+            c["path"] for c in catalog.iter_children(d_id, d_version, DIRECTORY)
+        ] == paths
+    # updates rewrite all pages
+    paged_catalog.add_records(
+        [dict(file_records[0], path=f"{DIRECTORY}/file{N_FILES}.txt")]
+    )
+    paged_catalog.store.export()
+    assert json.loads(node_file.read_text())["children_count"] == N_FILES + 1
+    assert (
+        json.loads(get_page_path(node_file, 2).read_text())["children"][-1][
+            "path"
+        ]
+        == f"{DIRECTORY}/file{N_FILES}.txt"
+    )
+
+
+def test_paginated_bundle(paged_catalog_with_files, file_records):
+    paged_catalog = paged_catalog_with_files
+    paged_catalog.store.export(bundle=True)
+    d_id = file_records[0]["dataset_id"]
+    d_version = file_records[0]["dataset_version"]
+    md5_hash = md5sum_from_id_version_path(d_id, d_version, DIRECTORY)
+    index_path = (
+        paged_catalog.metadata_path / d_id / d_version / BUNDLE_INDEX_FILENAME
+    )
+    index = json.loads(index_path.read_text())
+
+    def read_entry(key):
+        shard, offset, length = index["nodes"][key]
+        with open(index_path.parent / index["shards"][shard], "rb") as f:
+            f.seek(offset)
+            return json.loads(f.read(length))
+
+    # pages are bundled as "<md5 hash>/<page>"
+    node = read_entry(md5_hash)
+    assert node["children_pages"] == 3
+    children = node["children"]
+    for page in (1, 2):
+        children += read_entry(f"{md5_hash}/{page}")["children"]
+    assert [c["path"] for c in children] == [r["path"] for r in file_records]
+
+
+def test_paginated_file_count(paged_catalog_with_files, file_records):
+    """Pages of children are not counted as metadata files of a dataset
+    version, neither when the manifest is updated nor when it is rebuilt"""
+    paged_catalog = paged_catalog_with_files
+    paged_catalog.store.export()
+    updated = paged_catalog.manifest.read()
+    assert paged_catalog.manifest.rebuild() == updated
+    d_id = file_records[0]["dataset_id"]
+    d_version = file_records[0]["dataset_version"]
+    assert updated[0]["file_count"] == paged_catalog.store.count_files(
+        d_id, d_version
+    )
+
+
+def test_stale_pages_removed(paged_catalog_with_files, file_records):
+    """Pages beyond the current number of pages of a node are removed,
+    together with their precompressed siblings"""
+    paged_catalog = paged_catalog_with_files
+    paged_catalog.store.export()
+    d_id = file_records[0]["dataset_id"]
+    d_version = file_records[0]["dataset_version"]
+    node_file = get_node_file_path(
+        paged_catalog.metadata_path,
+        d_id,
+        d_version,
+        md5sum_from_id_version_path(d_id, d_version, DIRECTORY),
+    )
+    stale_page = get_page_path(node_file, 2)
+    stale_sibling = stale_page.with_name(stale_page.name + ".gz")
+    stale_sibling.write_bytes(b"")
+    paged_catalog.children_page_size = 20
+    paged_catalog.add_records(
+        [dict(file_records[0], path=f"{DIRECTORY}/file{N_FILES}.txt")]
+    )
+    paged_catalog.store.export()
+    assert json.loads(node_file.read_text())["children_pages"] == 2
+    assert get_page_path(node_file, 1).is_file()
+    assert not stale_page.exists()
+    assert not stale_sibling.exists()
+    record = paged_catalog.get_record(d_id, d_version, "directory", DIRECTORY)
+    assert len(record["children"]) == N_FILES + 1
@@ -0,0 +1,60 @@
+import json
+import os
+
+import datalad_catalog.constants as cnst
+from datalad_catalog import schema_registry
+from datalad_catalog.webcatalog import WebCatalog
+
+
+def _clear_caches():
+    schema_registry._stores.clear()
+    schema_registry._store_hashes.clear()
+    schema_registry._validators.clear()
+
+
+def test_validator_shared(demo_catalog):
+    """Catalog instances share their schema store and validator"""
+    other_catalog = WebCatalog(location=demo_catalog.location)
+    assert other_catalog.schema_store is demo_catalog.schema_store
+    assert other_catalog.schema_validator is demo_catalog.schema_validator
+    # a store with the same content yields the same validator
+    store_copy = json.loads(json.dumps(demo_catalog.schema_store))
+    assert (
+        schema_registry.get_schema_validator(store_copy)
+        is demo_catalog.schema_validator
+    )
+
+
+def test_persisted_store(demo_catalog, monkeypatch):
+    """The schema store is persisted in the datalad cache directory, and
+    used by other processes if the schema files are unchanged"""
+    schema_dir = demo_catalog.location / "schema"
+    persisted_path = schema_registry.get_schema_store_path(schema_dir.resolve())
+    assert persisted_path.exists()
+    # neither in the catalog nor in the package
+    assert not list(demo_catalog.location.glob(".schema_store*"))
+    schema_registry.get_schema_store()
+    assert not list(cnst.catalog_path.glob(".schema_store*"))
+    store = demo_catalog.schema_store
+    content_hash = schema_registry.get_content_hash(store)
+    # simulate a new process, which does not need to read schema files
+    _clear_caches()
+
+    def fail(*args):
+        raise AssertionError("schema files should not be read")
+
+    with monkeypatch.context() as m:
+        m.setattr(schema_registry, "_load_store", fail)
+        new_store = schema_registry.get_schema_store(schema_dir)
+    assert new_store == store
+    assert schema_registry.get_content_hash(new_store) == content_hash
+    # modified schema files are detected
+    _clear_caches()
+    schema_path = schema_dir / "jsonschema_authors.json"
+    schema = json.loads(schema_path.read_text())
+    schema["description"] = "modified"
+    schema_path.write_text(json.dumps(schema))
+    os.utime(schema_path, ns=(0, 0))
+    modified_store = schema_registry.get_schema_store(schema_dir)
+    assert schema_registry.get_content_hash(modified_store) != content_hash
+    assert modified_store[schema["$id"]]["description"] == "modified"
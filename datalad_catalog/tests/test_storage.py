@@ -0,0 +1,123 @@
+import json
+
+import pytest
+
+from datalad_catalog.export import Export
+from datalad_catalog.jsonl import iter_jsonl
+from datalad_catalog.remove import Remove
+from datalad_catalog.storage import (
+    FileStore,
+    SQLiteStore,
+)
+from datalad_catalog.webcatalog import WebCatalog
+
+catalog_export = Export()
+catalog_remove = Remove()
+
+
+def load_records(*paths):
+    return [record for path in paths for record in iter_jsonl(path)]
+
+
+def read_metadata_files(catalog):
+    """Return the content of all files in the metadata directory, by path"""
+    return {
+        str(p.relative_to(catalog.metadata_path)): json.loads(p.read_text())
+        for p in catalog.metadata_path.rglob("*.json")
+    }
+
+
+@pytest.fixture
+def sqlite_catalog(tmp_path, test_data) -> WebCatalog:
+    """A WebCatalog instance storing metadata in SQLite"""
+    catalog = WebCatalog(location=tmp_path / "sqlite_catalog")
+    catalog.create(
+        config_file=str(test_data.demo_config_path_catalog), storage="sqlite"
+    )
+    return catalog
+
+
+@pytest.fixture
+def metadata_records(test_data):
+    return load_records(
+        test_data.catalog_metadata_dataset1,
+        test_data.catalog_metadata_dataset2,
+        test_data.catalog_metadata_file1,
+    )
+
+
+def test_storage_detection(demo_catalog, sqlite_catalog):
+    assert isinstance(demo_catalog.store, FileStore)
+    assert isinstance(sqlite_catalog.store, SQLiteStore)
+    assert (sqlite_catalog.location / "metadata.sqlite").is_file()
+    # reopened catalogs use the storage backend they were created with
+    assert isinstance(
+        WebCatalog(location=demo_catalog.location).store, FileStore
+    )
+    assert isinstance(
+        WebCatalog(location=sqlite_catalog.location).store, SQLiteStore
+    )
+
+
+def test_sqlite_export(demo_catalog, sqlite_catalog, metadata_records):
+    """Exporting a SQLite catalog writes the same metadata files as a
+    file catalog"""
+    for catalog in (demo_catalog, sqlite_catalog):
+        catalog.add_records(metadata_records)
+    # nothing is written to the metadata directory before export
+    assert read_metadata_files(sqlite_catalog) == {}
+    # but records can be read
+    reopened = WebCatalog(location=sqlite_catalog.location)
+    record = metadata_records[0]
+    d_id, d_version = record["dataset_id"], record["dataset_version"]
+    assert reopened.get_node("dataset", d_id, d_version).load_file() == (
+        demo_catalog.get_node("dataset", d_id, d_version).load_file()
+    )
+    assert reopened.get_dataset_versions() == (
+        demo_catalog.get_dataset_versions()
+    )
+    res = catalog_export(
+        catalog=sqlite_catalog, on_failure="ignore", return_type="list"
+    )
+    assert res[0]["status"] == "ok"
+    expected = read_metadata_files(demo_catalog)
+    assert res[0]["exported_files"] == len(expected)
+    assert read_metadata_files(sqlite_catalog) == expected
+    # only changes are exported
+    assert sqlite_catalog.store.export() == 0
+    sqlite_catalog.add_records(metadata_records[:1])
+    assert 0 < sqlite_catalog.store.export() < len(expected)
+    assert read_metadata_files(sqlite_catalog) == expected
+
+
+def test_sqlite_remove(sqlite_catalog, metadata_records):
+    sqlite_catalog.add_records(metadata_records)
+    sqlite_catalog.store.export()
+    record = metadata_records[0]
+    key = (record["dataset_id"], record["dataset_version"])
+    res = catalog_remove(
+        catalog=sqlite_catalog,
+        dataset_id=key[0],
+        dataset_version=key[1],
+        reckless=True,
+        on_failure="ignore",
+        return_type="list",
+    )
+    assert res[0]["status"] == "ok"
+    assert not sqlite_catalog.has_dataset_version(*key)
+    assert sqlite_catalog.store.count_files(*key) == 0
+    # files are removed on export
+    assert (sqlite_catalog.metadata_path / key[0]).is_dir()
+    sqlite_catalog.store.export()
+    assert not (sqlite_catalog.metadata_path / key[0]).exists()
+    assert len(read_metadata_files(sqlite_catalog)) > 0
+
+
+def test_sqlite_rollback(sqlite_catalog, metadata_records):
+    """Metadata written in a failed transaction is rolled back"""
+    store = sqlite_catalog.store
+    with pytest.raises(RuntimeError):
+        with store.transaction() as transaction:
+            store.write_dataset_config("abc", "1", {}, transaction)
+            raise RuntimeError
+    assert store.get_dataset_config_stamp("abc", "1") is None
@@ -1,11 +1,25 @@
+from datalad_catalog.jsonl import iter_jsonl
 from datalad_catalog.translate import (
     MetaTranslate,
+    Translate,
+    TranslatorImplementationBase,
 )
+from datalad_catalog.translators.bids_dataset_translator import (
+    BIDSTranslator,
+)
+from datalad_catalog.translators.datacite_gin_translator import (
+    DataciteGINTranslator,
+)
+from datalad_catalog.translators.metalad_core_translator import (
+    CoreTranslator,
+)
+from datalad_catalog.utils import get_available_entrypoints
 from datalad.tests.utils_pytest import (
     assert_in_results,
     assert_result_count,
 )
 from datalad_next.constraints.exceptions import CommandParametrizationError
+import jq
 import pytest
 import os
 
@@ -109,3 +123,103 @@ def test_multiline_translation(demo_catalog, test_data):
         action="catalog_translate",
         status="ok",
     )
+
+
+def test_compiled_jq_programs(test_data, monkeypatch):
+    """Translators reuse compiled jq programs, with the same results as
+    jq.first()"""
+    data_path = test_data.demo_metafile_datacite.parent
+    records = [
+        record
+        for name in ("metadata_core.jsonl", "metadata_bids_dataset.jsonl")
+        for record in iter_jsonl(data_path / name)
+    ]
+    translators = dict(metalad_core=CoreTranslator, bids_dataset=BIDSTranslator)
+
+    def translate_all():
+        return [
+            translators[r["extractor_name"]](r).translate() for r in records
+        ]
+
+    res = translate_all()
+    n_programs = len(TranslatorImplementationBase._jq_programs)
+    assert n_programs > 0
+    assert translate_all() == res
+    assert len(TranslatorImplementationBase._jq_programs) == n_programs
+    monkeypatch.setattr(
+        TranslatorImplementationBase,
+        "jq_first",
+        lambda self, program, value: jq.first(program, value),
+    )
+    assert translate_all() == res
+
+
+def test_parallel_translation(demo_catalog, test_data, tmp_path, monkeypatch):
+    """Parallel translation reports the same results, in input order"""
+    import datalad_catalog.translate as translate_mod
+
+    # send every record to the workers in its own chunk
+    monkeypatch.setattr(translate_mod, "TRANSLATE_CHUNK_SIZE", 1)
+    metadata = tmp_path / "metadata.jsonl"
+    metadata.write_text(
+        "\n".join(
+            path.read_text().strip()
+            for path in (
+                test_data.demo_metafile_datacite_2items,
+                test_data.demo_metafile_wrongname,
+                test_data.demo_metafile_nonsense,
+                test_data.demo_metafile_datacite,
+            )
+        )
+    )
+    res_serial = catalog_translate(
+        catalog=demo_catalog,
+        metadata=metadata,
+        on_failure="ignore",
+        return_type="list",
+    )
+    res = catalog_translate(
+        catalog=demo_catalog,
+        metadata=metadata,
+        jobs=2,
+        on_failure="ignore",
+        return_type="list",
+    )
+    assert len(res) == len(res_serial) > 4
+    for r, r_serial in zip(res, res_serial):
+        assert r["status"] == r_serial["status"]
+        assert r.get("translated_metadata") == r_serial.get(
+            "translated_metadata"
+        )
+    assert_result_count(res, 3, action="catalog_translate", status="ok")
+
+
+def test_deprecated_translator_arguments(test_data):
+    """The arguments of Translate before the translator registry are still
+    accepted, with a deprecation warning"""
+    record = next(iter_jsonl(test_data.demo_metafile_datacite))
+    schema_version = DataciteGINTranslator.get_supported_schema_version()
+    available_translators = get_available_entrypoints(group="translators")
+    loaded_translators = []
+    with pytest.warns(DeprecationWarning):
+        translator = Translate(
+            meta_record=record,
+            schema_version=schema_version,
+            available_translators=available_translators,
+            loaded_translators=loaded_translators,
+        ).translator
+    assert isinstance(translator, DataciteGINTranslator)
+    # matches are recorded, and reused
+    assert [t["translator_instance"] for t in loaded_translators] == [
+        translator
+    ]
+    with pytest.warns(DeprecationWarning):
+        assert (
+            Translate(
+                meta_record=record,
+                schema_version=schema_version,
+                loaded_translators=loaded_translators,
+            ).translator
+            is translator
+        )
+    assert len(loaded_translators) == 1
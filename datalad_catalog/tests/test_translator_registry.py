@@ -0,0 +1,77 @@
+import json
+import os
+import sys
+
+from datalad_catalog.translator_registry import TranslatorRegistry
+from datalad_catalog.translators.datacite_gin_translator import (
+    DataciteGINTranslator,
+)
+
+schema_version = DataciteGINTranslator.get_supported_schema_version()
+datacite_key = (
+    schema_version,
+    DataciteGINTranslator.get_supported_extractor_name(),
+    DataciteGINTranslator.get_supported_extractor_version(),
+)
+unknown_key = (schema_version, "unknown_extractor", "0.1")
+
+
+def test_translators_loaded_lazily(tmp_path):
+    registry = TranslatorRegistry(table_path=tmp_path / "table.json")
+    assert registry._instances == {}
+    translator = registry.get_translator(*datacite_key)
+    assert isinstance(translator, DataciteGINTranslator)
+    # the same instance is returned for subsequent records
+    assert registry.get_translator(*datacite_key) is translator
+
+
+def test_negative_matches_cached(tmp_path, monkeypatch):
+    registry = TranslatorRegistry(table_path=tmp_path / "table.json")
+    assert registry.get_translator(*unknown_key) is None
+    n_loaded = len(registry._instances)
+    assert n_loaded == len(registry.entry_points)
+    probes = []
+    monkeypatch.setattr(
+        registry, "_match", lambda key: probes.append(key) or None
+    )
+    assert registry.get_translator(*unknown_key) is None
+    assert probes == []
+
+
+def test_dispatch_table_persisted(tmp_path):
+    table_path = tmp_path / "table.json"
+    registry = TranslatorRegistry(table_path=table_path)
+    registry.get_translator(*datacite_key)
+    registry.get_translator(*unknown_key)
+    registry.save()
+    # a new registry (e.g. in the next run) does not probe translators
+    registry = TranslatorRegistry(table_path=table_path)
+    assert registry._table == {
+        datacite_key: "datacite_gin_translator",
+        unknown_key: None,
+    }
+    assert isinstance(
+        registry.get_translator(*datacite_key), DataciteGINTranslator
+    )
+    assert registry.get_translator(*unknown_key) is None
+    assert list(registry._instances) == ["datacite_gin_translator"]
+    # a changed set of installed translators invalidates the table
+    persisted = json.loads(table_path.read_text())
+    persisted["fingerprint"] = persisted["fingerprint"][1:]
+    table_path.write_text(json.dumps(persisted))
+    assert TranslatorRegistry(table_path=table_path)._table == {}
+    # a modified translator module invalidates the table, e.g. after
+    # changing its match() in an editable install
+    registry = TranslatorRegistry(table_path=table_path)
+    registry.get_translator(*unknown_key)
+    registry.save()
+    assert TranslatorRegistry(table_path=table_path)._table == {
+        unknown_key: None
+    }
+    module_path = sys.modules[DataciteGINTranslator.__module__].__file__
+    stat = os.stat(module_path)
+    try:
+        os.utime(module_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        assert TranslatorRegistry(table_path=table_path)._table == {}
+    finally:
+        os.utime(module_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
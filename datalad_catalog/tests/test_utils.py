@@ -1,4 +1,14 @@
-from datalad_catalog.utils import find_duplicate_object_in_list, merge_lists
+import random
+import uuid
+from pathlib import Path
+
+from datalad_catalog.utils import (
+    find_duplicate_object_in_list,
+    freeze,
+    jsonify,
+    merge_lists,
+    parse_byte_range,
+)
 
 test_list = [
     {"source": "metalad_studyminimeta", "content": ["mini1", "mini2", "mini3"]},
@@ -70,3 +80,84 @@ def test_merge_lists():
     assert {"key1": "valc1"} in c_g
     assert {"key1": "valc2"} in c_g
     assert {"key1": "valg1"} in c_g
+
+
+def test_merge_lists_order():
+    """Merging keeps the order in which elements are first seen"""
+    assert merge_lists(["b", "a"], ["c", "a", "b", "d", "c"]) == [
+        "b",
+        "a",
+        "c",
+        "d",
+    ]
+    existing = [{"name": "x", "email": "x@a"}, {"name": "y"}]
+    merged = merge_lists(
+        existing,
+        [{"name": "z"}, {"name": "x"}, {"email": "x@a"}, {"name": "z"}, {}],
+    )
+    # objects that match a subset of an existing object are duplicates
+    assert merged == [
+        {"name": "x", "email": "x@a"},
+        {"name": "y"},
+        {"name": "z"},
+    ]
+    # nested values are compared structurally
+    merged = merge_lists(
+        [{"name": "x", "ids": [{"a": 1}, {"b": [2]}]}],
+        [{"ids": [{"a": 1}, {"b": [2]}]}, {"ids": [{"b": [2]}, {"a": 1}]}],
+    )
+    assert len(merged) == 2
+
+
+def test_merge_lists_differential():
+    """Merging objects gives the same result as checking each new object
+    against the list with find_duplicate_object_in_list"""
+    rng = random.Random(42)
+    values = ["a", "b", 1, [1, 2], {"n": "a"}]
+
+    def random_object():
+        return {
+            key: rng.choice(values)
+            for key in rng.sample(["k1", "k2", "k3"], rng.randint(0, 3))
+        }
+
+    for _ in range(50):
+        existing = [random_object() for _ in range(rng.randint(1, 10))]
+        new = [random_object() for _ in range(rng.randint(1, 10))]
+        expected = list(existing)
+        for new_object in new:
+            if (
+                find_duplicate_object_in_list(
+                    expected, new_object, new_object.keys()
+                )
+                is None
+            ):
+                expected.append(new_object)
+        assert merge_lists(list(existing), list(new)) == expected
+
+
+def test_freeze():
+    assert freeze({"a": [1, {"b": 2}]}) == freeze({"a": [1, {"b": 2}]})
+    assert freeze({"a": [1, 2]}) != freeze({"a": [2, 1]})
+    assert hash(freeze({"a": [1, {"b": 2}]}))
+
+
+def test_jsonify():
+    ds_id = uuid.uuid4()
+    record = {"id": ds_id, "paths": (Path("a"), "b"), "n": 1, "x": None}
+    assert jsonify(record) == {
+        "id": str(ds_id),
+        "paths": ["a", "b"],
+        "n": 1,
+        "x": None,
+    }
+
+
+def test_parse_byte_range():
+    assert parse_byte_range("bytes=0-499") == (0, 499)
+    assert parse_byte_range("bytes=500-") == (500, None)
+    # unsupported or invalid ranges
+    assert parse_byte_range("bytes=-500") is None
+    assert parse_byte_range("bytes=0-1,5-9") is None
+    assert parse_byte_range("bytes=9-5") is None
+    assert parse_byte_range(None) is None
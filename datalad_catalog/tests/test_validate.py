@@ -113,3 +113,28 @@ def test_validate_metadata_dict(demo_catalog):
         status="ok",
         path=demo_catalog.location,
     )
+
+
+def test_validate_parallel(demo_catalog, test_data, monkeypatch):
+    """Parallel validation reports the same results, in input order"""
+    import datalad_catalog.validate as validate_mod
+
+    # send every record to the workers in its own chunk
+    monkeypatch.setattr(validate_mod, "VALIDATE_CHUNK_SIZE", 1)
+    res_serial = catalog_validate(
+        catalog=demo_catalog,
+        metadata=test_data.catalog_metadata_valid_invalid,
+        on_failure="ignore",
+        return_type="list",
+    )
+    res = catalog_validate(
+        catalog=demo_catalog,
+        metadata=test_data.catalog_metadata_valid_invalid,
+        jobs=2,
+        on_failure="ignore",
+        return_type="list",
+    )
+    assert [(r["status"], r.get("message")) for r in res] == [
+        (r["status"], r.get("message")) for r in res_serial
+    ]
+    assert_result_count(res, 2, action="catalog_validate", status="ok")
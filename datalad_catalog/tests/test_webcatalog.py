@@ -1,4 +1,9 @@
+import copy
+
 from datalad_catalog.add import Add
+from datalad_catalog.jsonl import iter_jsonl
+from datalad_catalog.node import Node
+from datalad_catalog.webcatalog import WebCatalog
 
 from pathlib import Path
 import pytest
@@ -92,6 +97,15 @@ def test_get_record(demo_catalog, test_data):
     assert ds_rec["dataset_version"] == ds_v
     assert "path" in ds_rec
     assert ds_rec["path"] == file2
+    # modifying the returned record does not modify the catalog
+    ds_rec["path"] = "modified"
+    ds_rec["url"].append("modified")
+    assert demo_catalog.get_record(
+        dataset_id=ds_id,
+        dataset_version=ds_v,
+        record_type="file",
+        relpath=file2,
+    )["url"] == [u for u in ds_rec["url"] if u != "modified"]
     # Test nonexisting file record
     ds_rec = demo_catalog.get_record(
         dataset_id=ds_id,
@@ -100,3 +114,71 @@ def test_get_record(demo_catalog, test_data):
         relpath="derivatives/fmriprep/sub-CSI1/anat/blah.txt",
     )
     assert ds_rec is None
+
+
+def test_add_records_partial_failure(demo_catalog, test_data, monkeypatch):
+    """A record that fails while it is merged into the Node instances of
+    its group leaves no trace, and the other records are added"""
+    ds_record = next(iter_jsonl(test_data.catalog_metadata_dataset1))
+    file_record = next(iter_jsonl(test_data.catalog_metadata_file1))
+    ds_id = ds_record["dataset_id"]
+    ds_v = ds_record["dataset_version"]
+    records = [ds_record] + [
+        dict(file_record, path=path)
+        for path in ("dir1/a.txt", "dir2/sub/bad.txt", "dir2/c.txt")
+    ]
+    add_child = Node.add_child
+
+    def failing_add_child(self, meta_dict):
+        if meta_dict["name"] == "bad.txt":
+            raise RuntimeError("cannot add child")
+        add_child(self, meta_dict)
+
+    monkeypatch.setattr(Node, "add_child", failing_add_child)
+    results = demo_catalog.add_records(records)
+    assert ["exception" in r for r in results] == [False, False, True, False]
+    # a new instance reads the written metadata
+    catalog = WebCatalog(location=demo_catalog.location)
+    dir2 = catalog.get_record(ds_id, ds_v, "directory", "dir2")
+    assert [c["name"] for c in dir2["children"]] == ["c.txt"]
+    assert catalog.get_record(ds_id, ds_v, "directory", "dir2/sub") is None
+    assert catalog.get_record(ds_id, ds_v, "file", "dir1/a.txt") is not None
+
+
+def test_add_records_leaves_input_unchanged(
+    demo_catalog_default_config, test_data
+):
+    """Merging records into the Node instances does not modify the records
+    that were added before"""
+    r1 = next(iter_jsonl(test_data.catalog_metadata_dataset1))
+    r2 = copy.deepcopy(r1)
+    r2["metadata_sources"]["sources"][0]["source_name"] = "other_source"
+    r2["authors"] = [dict(name="Other Author")]
+    file_record = next(iter_jsonl(test_data.catalog_metadata_file1))
+    records = [r1, r2, file_record]
+    expected = copy.deepcopy(records)
+    results = demo_catalog_default_config.add_records(records)
+    assert all("exception" not in r for r in results)
+    assert records == expected
+    record = demo_catalog_default_config.get_record(
+        r1["dataset_id"], r1["dataset_version"]
+    )
+    assert len(record["authors"]) == len(r1["authors"]) + 1
+
+
+def test_get_record_updated_elsewhere(demo_catalog, test_data):
+    """Cached records are not returned once another WebCatalog instance
+    updated the dataset version"""
+    ds_record = next(iter_jsonl(test_data.catalog_metadata_dataset1))
+    file_record = next(iter_jsonl(test_data.catalog_metadata_file1))
+    ds_id = ds_record["dataset_id"]
+    ds_v = ds_record["dataset_version"]
+    demo_catalog.add_records([ds_record, dict(file_record, path="a.txt")])
+    dataset = demo_catalog.get_record(ds_id, ds_v)
+    children = [c["name"] for c in dataset["children"]]
+    assert "a.txt" in children and "b.txt" not in children
+    other_catalog = WebCatalog(location=demo_catalog.location)
+    other_catalog.add_records([dict(file_record, path="b.txt")])
+    dataset = demo_catalog.get_record(ds_id, ds_v)
+    children = [c["name"] for c in dataset["children"]]
+    assert "a.txt" in children and "b.txt" in children
@@ -7,8 +7,11 @@ from datalad_catalog.webcatalog import (
     WebCatalog,
     Node,
 )
+from datalad_catalog import workflow
 from datalad_catalog.workflow import (
     Workflow,
+    dataset_workflow,
+    parallel_dataset_workflow,
     super_workflow,
 )
 from datalad.tests.utils_pytest import (
@@ -44,7 +47,9 @@ catalog_paths = [
     sys.platform == "win32", reason="jq does not build on windows"
 )
 @skip_if_adjusted_branch
-def test_workflow_new(test_data, workflow_catalog_path, workflow_dataset_path):
+def test_workflow_new(
+    test_data, workflow_catalog_path, workflow_dataset_path, tmp_path
+):
     cat_path = workflow_catalog_path
     super_path = workflow_dataset_path
     ckwa = dict(result_renderer="disabled")
@@ -72,14 +77,17 @@ def test_workflow_new(test_data, workflow_catalog_path, workflow_dataset_path):
         "metalad_studyminimeta",
         "datacite_gin",
     ]
-    tuple(super_workflow(super_ds, cat, extractors))
-    # TODO: test interim workflow outputs, including:
-    # - extracted metadata file (amount of lines?)
-    # - translated metadata file (amount of lines?)
-    assert (Path(super_ds.path) / "extracted_meta.json").exists()
-    assert (Path(sub_ds.path) / "extracted_meta.json").exists()
-    assert (Path(super_ds.path) / "translated_meta.json").exists()
-    assert (Path(sub_ds.path) / "translated_meta.json").exists()
+    spill_dir = tmp_path / "spill"
+    tuple(super_workflow(super_ds, cat, extractors, spill_dir=spill_dir))
+    # Interim workflow outputs are only written to the spill directory,
+    # and not to the datasets
+    for ds, n_records in ((super_ds, 2), (sub_ds, 2)):
+        assert not (Path(ds.path) / "extracted_meta.json").exists()
+        assert not (Path(ds.path) / "translated_meta.json").exists()
+        for name in ("extracted_meta.jsonl", "translated_meta.jsonl"):
+            lines = (spill_dir / ds.id / name).read_text().splitlines()
+            assert len(lines) == n_records
+    assert_repo_status(super_ds.path)
 
     # Test final workflow outputs
     # - metadata directory
@@ -344,3 +352,177 @@ def assert_sub_variable_values_equal(
         dict_to_test["metadata_sources"]["sources"][1]["source_name"],
         "datacite_gin",
     )
+
+
+@pytest.mark.skipif(
+    sys.platform == "win32", reason="jq does not build on windows"
+)
+def test_dataset_workflow_in_memory(tmp_path):
+    """Metadata is passed from extraction via translation to the catalog
+    without intermediate files, unless they are requested"""
+    ckwa = dict(result_renderer="disabled")
+    ds = create(tmp_path / "ds", annex=False, **ckwa)
+    catalog = WebCatalog(location=tmp_path / "cat")
+    catalog.create()
+    spill_dir = tmp_path / "spill"
+    res = list(
+        dataset_workflow(ds, catalog, ["metalad_core"], spill_dir=spill_dir)
+    )
+    assert res
+    assert all(r["status"] == "ok" for r in res)
+    assert_repo_status(ds.path)
+    assert not (Path(ds.path) / "extracted_meta.json").exists()
+    assert not (Path(ds.path) / "translated_meta.json").exists()
+    for name in ("extracted_meta.jsonl", "translated_meta.jsonl"):
+        lines = (spill_dir / ds.id / name).read_text().splitlines()
+        assert len(lines) == 1
+        assert json.loads(lines[0])["dataset_id"] == ds.id
+    node_path = get_node_path(
+        catalog.metadata_path, ds.id, ds.repo.get_hexsha()
+    )
+    assert node_path.exists()
+
+
+@pytest.mark.skipif(
+    sys.platform == "win32", reason="jq does not build on windows"
+)
+def test_parallel_dataset_workflow(tmp_path):
+    """Processing datasets in worker processes gives the same catalog"""
+    ckwa = dict(result_renderer="disabled")
+    super_ds = create(tmp_path / "super", annex=False, **ckwa)
+    datasets = [super_ds] + [
+        super_ds.create(name, annex=False, **ckwa)
+        for name in ("sub1", "sub2", "sub3")
+    ]
+    metadata = []
+    for parallel in (False, True):
+        catalog = WebCatalog(location=tmp_path / f"cat-{parallel}")
+        catalog.create()
+        if parallel:
+            res = list(
+                parallel_dataset_workflow(
+                    datasets,
+                    catalog=catalog,
+                    extractors=["metalad_core"],
+                    jobs=2,
+                )
+            )
+        else:
+            res = [
+                r
+                for ds in datasets
+                for r in dataset_workflow(ds, catalog, ["metalad_core"])
+            ]
+        assert len(res) == len(datasets)
+        assert all(r["status"] == "ok" for r in res)
+        nodes = {}
+        for p in catalog.metadata_path.rglob("*.json"):
+            node = read_json_file(p)
+            # extraction times differ between runs
+            for source in node["metadata_sources"]["sources"]:
+                del source["source_time"]
+            nodes[p.relative_to(catalog.metadata_path)] = node
+        metadata.append(nodes)
+    # a node per dataset
+    assert len(metadata[0]) == len(datasets)
+    assert metadata[1] == metadata[0]
+
+
+@pytest.mark.skipif(
+    sys.platform == "win32", reason="jq does not build on windows"
+)
+@pytest.mark.parametrize("jobs", [None, 2])
+def test_super_workflow_incremental(tmp_path, jobs):
+    """Only dataset versions that are not yet in the catalog are processed"""
+    ckwa = dict(result_renderer="disabled")
+    super_ds = create(tmp_path / "super", annex=False, **ckwa)
+    subdatasets = [
+        super_ds.create(name, annex=False, **ckwa)
+        for name in ("sub1", "sub2", "sub3")
+    ]
+    catalog = WebCatalog(location=tmp_path / "cat")
+
+    def run_workflow():
+        res = list(
+            super_workflow(
+                ds=super_ds,
+                cat=catalog,
+                extractors=["metalad_core"],
+                jobs=jobs,
+                incremental=True,
+                action="catalog_workflow",
+                path=catalog.location,
+            )
+        )
+        assert res[-1]["status"] == "ok"
+        notneeded = sorted(r["path"] for r in res if r["status"] == "notneeded")
+        added = [r for r in res[:-1] if r["status"] == "ok"]
+        return notneeded, added, res[-1]["message"]
+
+    notneeded, added, message = run_workflow()
+    assert notneeded == []
+    assert len(added) == 4
+    assert message.endswith("skipped 0 unchanged dataset version(s)")
+    for ds in [super_ds] + subdatasets:
+        assert catalog.has_dataset_version(ds.id, ds.repo.get_hexsha())
+    # nothing changed
+    notneeded, added, message = run_workflow()
+    assert notneeded == sorted(ds.path for ds in [super_ds] + subdatasets)
+    assert added == []
+    assert message.endswith("skipped 4 unchanged dataset version(s)")
+    # a new version of a subdataset, recorded in a new superdataset version
+    (Path(subdatasets[0].path) / "file.txt").write_text("content")
+    subdatasets[0].save(**ckwa)
+    super_ds.save(**ckwa)
+    notneeded, added, message = run_workflow()
+    assert notneeded == sorted(ds.path for ds in subdatasets[1:])
+    assert len(added) == 2
+    assert message.endswith("skipped 2 unchanged dataset version(s)")
+    assert catalog.get_main_dataset() == {
+        "dataset_id": super_ds.id,
+        "dataset_version": super_ds.repo.get_hexsha(),
+    }
+
+
+@pytest.mark.skipif(
+    sys.platform == "win32", reason="jq does not build on windows"
+)
+@pytest.mark.parametrize("jobs", [None, 2])
+def test_super_workflow_incremental_failure(tmp_path, monkeypatch, jobs):
+    """A dataset whose metadata cannot be extracted is reported as an error,
+    and the other datasets are still processed"""
+    ckwa = dict(result_renderer="disabled")
+    super_ds = create(tmp_path / "super", annex=False, **ckwa)
+    subdatasets = [
+        super_ds.create(name, annex=False, **ckwa) for name in ("sub1", "sub2")
+    ]
+    extract_translate = workflow.extract_translate
+
+    def failing_extract_translate(ds, *args, **kwargs):
+        if Path(ds.path).name == "sub1":
+            raise RuntimeError("extraction failed")
+        return extract_translate(ds, *args, **kwargs)
+
+    monkeypatch.setattr(
+        workflow, "extract_translate", failing_extract_translate
+    )
+    catalog = WebCatalog(location=tmp_path / "cat")
+    res = list(
+        super_workflow(
+            ds=super_ds,
+            cat=catalog,
+            extractors=["metalad_core"],
+            jobs=jobs,
+            incremental=True,
+            action="catalog_workflow",
+            path=catalog.location,
+        )
+    )
+    errors = [r for r in res if r["status"] == "error"]
+    assert [r["path"] for r in errors] == [subdatasets[0].path]
+    assert res[-1]["status"] == "ok"
+    for ds in (super_ds, subdatasets[1]):
+        assert catalog.has_dataset_version(ds.id, ds.repo.get_hexsha())
+    assert not catalog.has_dataset_version(
+        subdatasets[0].id, subdatasets[0].repo.get_hexsha()
+    )
@@ -13,10 +13,17 @@ from datalad_catalog.constraints import (
     EnsureWebCatalog,
     metadata_constraint,
 )
+from datalad_catalog.jqlike import get_value
+from datalad_catalog.jsonl import json_loads
+from datalad_catalog.translator_registry import (
+    TranslatorRegistry,
+    get_translator_registry,
+)
 from datalad_catalog.utils import (
     EntryPointsNotFoundError,
-    get_available_entrypoints,
+    iter_chunks,
     jsEncoder,
+    map_chunks_ordered,
 )
 from datalad_catalog.validate import get_schema_store
 from datalad_catalog.webcatalog import (
@@ -30,15 +37,24 @@ from datalad_next.commands import (
     eval_results,
     get_status_dict,
 )
+from datalad_next.constraints import (
+    EnsureBool,
+    EnsureInt,
+    EnsureRange,
+)
 from datalad_next.exceptions import CapturedException
 from datalad_next.uis import ui_switcher
 from datalad.support.exceptions import InsufficientArgumentsError
 
 import abc
+from functools import partial
 import json
 import jq
 import logging
 import os
+import pickle
+from types import SimpleNamespace
+import warnings
 
 
 __docformat__ = "restructuredtext"
@@ -54,6 +70,8 @@ class MetaTranslateParameterValidator(EnsureCommandParameterization):
             param_constraints=dict(
                 catalog=EnsureWebCatalog(),
                 metadata=metadata_constraint,
+                native=EnsureBool(),
+                jobs=EnsureInt() & EnsureRange(min=1),
             ),
             joint_constraints=dict(),
         )
@@ -100,6 +118,27 @@ class MetaTranslate(ValidatedInterface):
             - JSON lines from STDIN
             - a JSON serialized string""",
         ),
+        native=Parameter(
+            # cmdline argument definitions, incl aliases
+            args=("--native",),
+            action="store_true",
+            # documentation
+            doc="""Translate metadata with the pure-Python implementation of
+            a translator, if it provides one, instead of with jq programs.
+            Both produce the same output for the bundled translators, but the
+            pure-Python implementation is considerably faster for large
+            numbers of records.""",
+            default=False,
+        ),
+        jobs=Parameter(
+            # cmdline argument definitions, incl aliases
+            args=("-J", "--jobs"),
+            # documentation
+            doc="""Number of parallel processes used to translate metadata
+            records. Records are sent to the processes in chunks, and results
+            are reported (and rendered as JSON lines) in input order. By
+            default, records are translated in the current process.""",
+        ),
     )
 
     _examples_ = [
@@ -117,12 +156,24 @@ class MetaTranslate(ValidatedInterface):
                 "datalad catalog-translate -c /tmp/my-cat -m path/to/metadata.jsonl"
             ),
         ),
+        dict(
+            text=(
+                "Translate a large file of metalad-extracted metadata items "
+                "using 8 processes, and write the translated items to a file"
+            ),
+            code_cmd=(
+                "datalad catalog-translate -J 8 path/to/metadata.jsonl "
+                "> path/to/translated.jsonl"
+            ),
+        ),
     ]
 
     @staticmethod
     def custom_result_renderer(res, **kwargs):
         """This result renderer dumps the value of the 'output' key
         in the result record in JSON-line format -- only if status==ok"""
+        if res.get("status") != "ok":
+            return
         ui = ui_switcher.ui
         ui.message(
             json.dumps(
@@ -141,6 +192,8 @@ class MetaTranslate(ValidatedInterface):
     def __call__(
         metadata,
         catalog=None,
+        native: bool = False,
+        jobs: int = None,
     ):
         # 1. Argument handling
         # 1a. metadata
@@ -163,10 +216,15 @@ class MetaTranslate(ValidatedInterface):
         schema_store = get_schema_store(catalog)
         schema_id = cnst.CATALOG_SCHEMA_IDS[cnst.CATALOG]
         schema_version = schema_store[schema_id][cnst.VERSION]
-        # 2. Get all available translators via entrypoints:
+        # 2. Prepare standard arguments for result record
+        res_kwargs = dict(
+            action="catalog_translate",
+            path=catalog.location if catalog is not None else os.getcwd(),
+        )
+        # 3. Get the registry of available translators (via entrypoints),
+        # which loads translators lazily and caches matches
         try:
-            all_translators = get_available_entrypoints(group="translators")
-            loaded_translators = []
+            translators = get_translator_registry()
         except EntryPointsNotFoundError as e:
             err_msg = (
                 "No translators found: there are no translators available "
@@ -180,63 +238,109 @@ class MetaTranslate(ValidatedInterface):
                 message=err_msg,
                 exception=e,
             )
-        # 3. Prepare standard arguments for result record
-        res_kwargs = dict(
-            action="catalog_translate",
-            path=catalog.location if catalog is not None else os.getcwd(),
-        )
+            return
         # 4. Process each line of metadata
-        for i, line in enumerate(metadata):
-            if isinstance(line, CapturedException):
-                # the generator encountered an exception for a particular
-                # item and is relaying it as per instructions
-                # exc_mode='yield'. We report and move on. Outside
-                # flow logic will decide if processing continues
-                yield get_status_dict(
-                    **res_kwargs,
-                    status="error",
-                    exception=line,
-                )
-                continue
-            # load json object into dict
-            if isinstance(line, str):
-                meta_dict = json.loads(line.rstrip())
-            else:
-                meta_dict = line
-            # Check if line is a dict
-            if not isinstance(meta_dict, dict):
-                err_msg = (
-                    "Metadata item not of type dict: metadata items should be "
-                    "passed to datalad-catalog as JSON objects adhering to the "
-                    "catalog schema."
-                )
+        if jobs is None or jobs == 1:
+            results = _translate_items(
+                metadata, schema_version, translators, native
+            )
+        else:
+            # translate chunks of items in worker processes, which each use
+            # their own translator registry
+            results = map_chunks_ordered(
+                partial(_translate_chunk, schema_version, native),
+                iter_chunks(metadata, TRANSLATE_CHUNK_SIZE),
+                jobs,
+            )
+        try:
+            for status, message, translated_meta, exception in results:
                 yield get_status_dict(
                     **res_kwargs,
-                    status="error",
-                    message=err_msg,
+                    status=status,
+                    **(dict(message=message) if message else {}),
+                    **(
+                        dict(translated_metadata=translated_meta)
+                        if status == "ok"
+                        else {}
+                    ),
+                    **(dict(exception=exception) if exception else {}),
                 )
-                continue
-            # Translate dict
-            try:
-                translated_meta = Translate(
-                    meta_record=meta_dict,
-                    schema_version=schema_version,
-                    available_translators=all_translators,
-                    loaded_translators=loaded_translators,
-                ).run_translator()
+        finally:
+            # persist newly matched translators for subsequent runs
+            translators.save()
 
-                yield get_status_dict(
-                    **res_kwargs,
-                    status="ok",
-                    message=("Metadata successfully translated"),
-                    translated_metadata=translated_meta,
-                )
-            except Exception as e:
-                yield get_status_dict(
-                    **res_kwargs,
-                    status="error",
-                    exception=e,
-                )
+
+# Number of records per chunk sent to a worker process
+TRANSLATE_CHUNK_SIZE = 500
+
+
+def _translate_chunk(schema_version: str, native: bool, items: list) -> list:
+    """Translate a chunk of metadata items in a worker process
+
+    Returns a list with a (status, message, translated metadata, exception)
+    tuple per item, with exceptions in picklable form.
+    """
+    translators = get_translator_registry()
+    try:
+        return [
+            (status, message, translated_meta, _picklable_exception(exception))
+            for status, message, translated_meta, exception in (
+                _translate_items(items, schema_version, translators, native)
+            )
+        ]
+    finally:
+        translators.save()
+
+
+def _picklable_exception(exception):
+    """Return an exception, or a generic one with the same message if the
+    exception can not be pickled (e.g. to return it from a worker)"""
+    if exception is None:
+        return None
+    try:
+        pickle.dumps(exception)
+    except Exception:
+        return Exception(f"{type(exception).__name__}: {exception}")
+    return exception
+
+
+def _translate_items(metadata, schema_version, translators, native):
+    """Yield a (status, message, translated metadata, exception) tuple
+    for the translation of each metadata item"""
+    for line in metadata:
+        if isinstance(line, CapturedException):
+            # the generator encountered an exception for a particular
+            # item and is relaying it as per instructions
+            # exc_mode='yield'. We report and move on. Outside
+            # flow logic will decide if processing continues
+            yield "error", None, None, line
+            continue
+        # load json object into dict
+        if isinstance(line, str):
+            meta_dict = json_loads(line)
+        else:
+            meta_dict = line
+        # Check if line is a dict
+        if not isinstance(meta_dict, dict):
+            err_msg = (
+                "Metadata item not of type dict: metadata items should be "
+                "passed to datalad-catalog as JSON objects adhering to the "
+                "catalog schema."
+            )
+            yield "error", err_msg, None, None
+            continue
+        # Translate dict
+        try:
+            translated_meta = Translate(
+                meta_record=meta_dict,
+                schema_version=schema_version,
+                translators=translators,
+                native=native,
+            ).run_translator()
+        except Exception as e:
+            yield "error", None, None, e
+            continue
+        yield "ok", "Metadata successfully translated", translated_meta, None
 
 
 class Translate(object):
@@ -250,25 +354,46 @@ class Translate(object):
         self,
         meta_record: dict,
         schema_version: str,
-        available_translators: dict = {},
-        loaded_translators: list = [],
+        translators: TranslatorRegistry = None,
+        native: bool = False,
+        available_translators: dict = None,
+        loaded_translators: list = None,
     ) -> None:
         """"""
         # instantiate
         self.meta_record = meta_record
         self.schema_version = schema_version
-        self.available_translators = available_translators
-        self.loaded_translators = loaded_translators
+        if available_translators is not None or loaded_translators is not None:
+            warnings.warn(
+                "The 'available_translators' and 'loaded_translators' "
+                "arguments of Translate are deprecated, use 'translators' "
+                "(a TranslatorRegistry) instead",
+                DeprecationWarning,
+                stacklevel=2,
+            )
+            if translators is None:
+                translators = _get_legacy_registry(
+                    available_translators, loaded_translators
+                )
+        self.translators = translators or get_translator_registry()
+        self.native = native
         self.match_translator()
+        if loaded_translators is not None:
+            # matched translators were recorded in this list by callers
+            _record_legacy_match(
+                loaded_translators,
+                self.translators,
+                self.schema_version,
+                self.meta_record,
+                self.translator,
+            )
 
     def match_translator(self):
         """Match an extracted metadata record with an appropriate translator
 
-        Parameters
-        ----------
-        meta_record : dict
-            A dictionary containing metadata that was extracted from a file or dataset
-            using datalad-metalad
+        Translators are looked up in the dispatch table of the translator
+        registry, so that each combination of metadata source and schema
+        version is matched against the available translators only once.
 
         Returns
         ------
@@ -278,57 +403,80 @@ class Translate(object):
         # First get source name and version from record
         source_name = self.meta_record.get(cnst.EXTRACTOR_NAME)
         source_version = self.meta_record.get(cnst.EXTRACTOR_VERSION)
-        # If the relevant translator has already been matched and loaded,
-        # access it
-        matched_loaded = [
-            t
-            for t in self.loaded_translators
-            if t.get("source_name") == source_name
-            and t.get("source_version") == source_version
-            and t.get("schema_version") == self.schema_version
-        ]
-        if len(matched_loaded) > 0:
-            self.translator = matched_loaded[0].get("translator_instance")
-        else:
-            # Else run through all translators and run their matching methods
-            matched_translators = []
-            for (
-                translator_name,
-                translator_dict,
-            ) in self.available_translators.items():
-                translator_class = translator_dict["loader"]()
-                translator_instance = translator_class()
-                if translator_instance.match(
-                    self.schema_version, source_name, source_version
-                ):
-                    # break on first match
-                    matched_translators.append(translator_instance)
-                    break
-            # Raise error if there was no match
-            if not matched_translators:
-                self.translator = None
-                raise TranslatorNotFoundError(
-                    "Metadata translator not found for metadata source "
-                    f"{source_name} and version {source_version}"
-                )
-            # if for some reason more than one entry points are returned
-            # select first one
-            self.translator = matched_translators[0]
-            self.loaded_translators.append(
-                {
-                    "translator_name": translator_name,
-                    "source_name": source_name,
-                    "source_version": source_version,
-                    "schema_version": self.schema_version,
-                    "translator_instance": self.translator,
-                }
+        self.translator = self.translators.get_translator(
+            self.schema_version, source_name, source_version
+        )
+        # Raise error if there was no match
+        if self.translator is None:
+            raise TranslatorNotFoundError(
+                "Metadata translator not found for metadata source "
+                f"{source_name} and version {source_version}"
             )
+        return self.translator
 
     def run_translator(self):
         """"""
+        if self.native:
+            return self.translator.translate_native(self.meta_record)
         return self.translator.translate(self.meta_record)
 
 
+def _get_legacy_registry(
+    available_translators: dict = None, loaded_translators: list = None
+) -> TranslatorRegistry:
+    """Return a TranslatorRegistry (without a persisted dispatch table) for
+    the deprecated arguments of Translate, i.e. translators as returned by
+    utils.get_available_entrypoints() and a list of previous matches"""
+    if available_translators is None:
+        translators = get_translator_registry().entry_points
+    else:
+        translators = {
+            name: SimpleNamespace(load=translator_dict["loader"])
+            for name, translator_dict in available_translators.items()
+        }
+    registry = TranslatorRegistry(translators=translators)
+    for t in loaded_translators or []:
+        registry.add_match(
+            t.get("schema_version"),
+            t.get("source_name"),
+            t.get("source_version"),
+            t.get("translator_name"),
+            t.get("translator_instance"),
+        )
+    return registry
+
+
+def _record_legacy_match(
+    loaded_translators: list,
+    registry: TranslatorRegistry,
+    schema_version: str,
+    meta_record: dict,
+    translator,
+):
+    """Append a match to a list of previous matches, as in the deprecated
+    'loaded_translators' argument of Translate"""
+    source_name = meta_record.get(cnst.EXTRACTOR_NAME)
+    source_version = meta_record.get(cnst.EXTRACTOR_VERSION)
+    if any(
+        t.get("source_name") == source_name
+        and t.get("source_version") == source_version
+        and t.get("schema_version") == schema_version
+        for t in loaded_translators
+    ):
+        return
+    loaded_translators.append(
+        {
+            "translator_name": registry.get_translator_name(
+                schema_version, source_name, source_version
+            ),
+            "source_name": source_name,
+            "source_version": source_version,
+            "schema_version": schema_version,
+            "translator_instance": translator,
+        }
+    )
+
+
 class TranslatorNotFoundError(InsufficientArgumentsError):
     pass
 
@@ -373,6 +521,16 @@ class TranslatorBase(metaclass=abc.ABCMeta):
         """
         raise NotImplementedError
 
+    def translate_native(self, metadata):
+        """
+        Translate incoming metadata to the current catalog schema without jq
+
+        Translators that use jq programs can override this method with a
+        pure-Python implementation that produces the same output. By default,
+        this is the same as translate().
+        """
+        return self.translate(metadata)
+
     @abc.abstractmethod
     def get_supported_schema_version(self):
         """
@@ -396,7 +554,29 @@ class TranslatorBase(metaclass=abc.ABCMeta):
 
 
 class TranslatorImplementationBase:
-    """Common functionality across all translator implementations"""
+    """Common functionality across all translator implementations
+
+    jq programs are compiled once per process and shared by all translator
+    instances (see compile_jq()), since compiling a program costs far more
+    than running it on a single metadata record.
+    """
+
+    # compiled jq programs: {program string: compiled program}
+    _jq_programs = {}
+
+    @classmethod
+    def compile_jq(cls, program: str):
+        """Return the compiled form of a jq program"""
+        try:
+            return cls._jq_programs[program]
+        except KeyError:
+            compiled = cls._jq_programs[program] = jq.compile(program)
+            return compiled
+
+    def jq_first(self, program: str, value):
+        """Return the first output of a jq program applied to a value,
+        like jq.first(), but using the compiled program"""
+        return self.compile_jq(program).input_value(value).first()
 
     def get_metadata_source(self):
         program = (
@@ -408,7 +588,7 @@ class TranslatorImplementationBase:
             '"agent_email": .agent_email, '
             '"agent_name": .agent_name}]}'
         )
-        result = jq.first(program, self.metadata_record)
+        result = self.jq_first(program, self.metadata_record)
         # filter out "sources" fields for only non None values
         if result:
             result["sources"] = [
@@ -418,3 +598,28 @@ class TranslatorImplementationBase:
             return result
         else:
             return None
+
+
+class NativeTranslatorMixin:
+    """Pure-Python implementations of the TranslatorImplementationBase
+    methods, for native translator implementations (see
+    TranslatorBase.translate_native())"""
+
+    def get_metadata_source(self):
+        source = {
+            "source_name": get_value(self.metadata_record, "extractor_name"),
+            "source_version": get_value(
+                self.metadata_record, "extractor_version"
+            ),
+            "source_parameter": get_value(
+                self.metadata_record, "extraction_parameter"
+            ),
+            "source_time": get_value(self.metadata_record, "extraction_time"),
+            "agent_email": get_value(self.metadata_record, "agent_email"),
+            "agent_name": get_value(self.metadata_record, "agent_name"),
+        }
+        # filter out "sources" fields for only non None values
+        return {
+            "key_source_map": {},
+            "sources": [{k: v for k, v in source.items() if v is not None}],
+        }
@@ -0,0 +1,253 @@
+"""Registry of metadata translators with a cached dispatch table
+
+Translators are exposed as entry points of the group
+'datalad.metadata.translators'. Entry points are only loaded when they are
+needed, i.e. when a translator is probed for a metadata source that has
+not been matched before.
+
+The registry maps (schema_version, source_name, source_version) keys to the
+name of the matching translator entry point, or to None if no translator
+matches (negative matches are cached too). Within a process, lookups are
+dictionary accesses. Across processes, the dispatch table is persisted in
+the datalad cache directory (see get_dispatch_table_path()), together with
+a fingerprint of the installed translator entry points and of their
+modules' files, which invalidates the table whenever translators are
+(un)installed, upgraded, or modified (e.g. in an editable install).
+"""
+import importlib.util
+import logging
+import os
+from pathlib import Path
+import sys
+
+from datalad_catalog.jsonl import json_loads
+from datalad_catalog.utils import (
+    EntryPointsNotFoundError,
+    write_json_file,
+)
+from datalad_next.exceptions import CapturedException
+
+if sys.version_info < (3, 10):
+    # 3.10 is when it was no longer provisional
+    from importlib_metadata import entry_points
+else:
+    from importlib.metadata import entry_points
+
+lgr = logging.getLogger("datalad.catalog.translator_registry")
+
+TRANSLATOR_GROUP = "datalad.metadata.translators"
+DISPATCH_TABLE_FILENAME = "translator_dispatch.json"
+# format version of the persisted dispatch table
+DISPATCH_TABLE_FORMAT = 2
+
+# shared registries: {entry point group: TranslatorRegistry}
+_registries = {}
+
+
+def get_dispatch_table_path() -> Path:
+    """Return the path of the persisted dispatch table"""
+    from datalad import cfg
+
+    return (
+        Path(cfg.obtain("datalad.locations.cache"))
+        / "catalog"
+        / DISPATCH_TABLE_FILENAME
+    )
+
+
+def get_translator_registry(group: str = TRANSLATOR_GROUP):
+    """Return the (shared) translator registry of an entry point group"""
+    registry = _registries.get(group)
+    if registry is None:
+        registry = _registries[group] = TranslatorRegistry(group)
+    return registry
+
+
+class TranslatorRegistry(object):
+    """
+    Lazily loaded translators and a dispatch table of matched translators
+
+    Arguments:
+    group -- entry point group of the translators
+    table_path -- path of the persisted dispatch table, which defaults to
+        get_dispatch_table_path(). Persistence is disabled if it is False.
+    translators -- optional {name: object with a load() method returning the
+        translator class} to use instead of the entry points of the group,
+        in which case persistence is disabled
+    """
+
+    def __init__(
+        self,
+        group: str = TRANSLATOR_GROUP,
+        table_path=None,
+        translators: dict = None,
+    ) -> None:
+        self.group = group
+        # entry points in discovery order: {name: entry point}
+        if translators is not None:
+            self.entry_points = dict(translators)
+            table_path = False
+        else:
+            self.entry_points = {
+                ep.name: ep for ep in entry_points(group=group)
+            }
+        if not self.entry_points:
+            raise EntryPointsNotFoundError(
+                f"No {group.rsplit('.', 1)[-1]} entrypoints were found"
+            )
+        self.fingerprint = (
+            [
+                [name, ep.value, _get_dist_version(ep), _get_module_stamp(ep)]
+                for name, ep in self.entry_points.items()
+            ]
+            if table_path is not False
+            else None
+        )
+        # instantiated translators: {name: instance, or None on load error}
+        self._instances = {}
+        # {(schema_version, source_name, source_version): name or None}
+        self._table = {}
+        # keys that are not persisted (see _match and add_match)
+        self._transient = set()
+        self._dirty = False
+        if table_path is None:
+            table_path = get_dispatch_table_path()
+        self.table_path = table_path
+        if self.table_path:
+            self._load_table()
+
+    def get_translator(
+        self,
+        schema_version: str,
+        source_name: str,
+        source_version: str,
+    ):
+        """Return the translator instance matching a metadata source and
+        catalog schema version, or None if no translator matches"""
+        name = self.get_translator_name(
+            schema_version, source_name, source_version
+        )
+        if name is None:
+            return None
+        return self._get_instance(name)
+
+    def get_translator_name(
+        self,
+        schema_version: str,
+        source_name: str,
+        source_version: str,
+    ):
+        """Return the name of the translator matching a metadata source and
+        catalog schema version, or None if no translator matches"""
+        key = (schema_version, source_name, source_version)
+        try:
+            return self._table[key]
+        except KeyError:
+            return self._match(key)
+
+    def add_match(
+        self,
+        schema_version: str,
+        source_name: str,
+        source_version: str,
+        name: str,
+        translator,
+    ):
+        """Record a translator instance as the match of a metadata source
+        and catalog schema version for this process (it is not persisted)"""
+        key = (schema_version, source_name, source_version)
+        self._instances[name] = translator
+        self._table[key] = name
+        self._transient.add(key)
+
+    def save(self):
+        """Persist the dispatch table, if it was changed and the location
+        is writable"""
+        if not self._dirty or not self.table_path:
+            return
+        try:
+            Path(self.table_path).parent.mkdir(parents=True, exist_ok=True)
+            write_json_file(
+                self.table_path,
+                dict(
+                    format=DISPATCH_TABLE_FORMAT,
+                    group=self.group,
+                    fingerprint=self.fingerprint,
+                    table=[
+                        [*key, name]
+                        for key, name in self._table.items()
+                        if key not in self._transient
+                    ],
+                ),
+            )
+            self._dirty = False
+        except OSError as e:
+            lgr.debug("Could not persist translator dispatch table: %s", e)
+
+    def _match(self, key):
+        """Probe translators in entry point order and record the name of
+        the first one that matches (or None)"""
+        load_error = False
+        for name in self.entry_points:
+            translator = self._get_instance(name)
+            if translator is None:
+                load_error = True
+                continue
+            if translator.match(*key):
+                break
+        else:
+            name = None
+        self._table[key] = name
+        # a negative match may be due to a (transient) load error, and is
+        # therefore only persisted if all translators could be loaded
+        if name is None and load_error:
+            self._transient.add(key)
+        else:
+            self._dirty = True
+        return name
+
+    def _get_instance(self, name):
+        try:
+            return self._instances[name]
+        except KeyError:
+            pass
+        try:
+            instance = self.entry_points[name].load()()
+        except Exception as e:
+            ce = CapturedException(e)
+            lgr.warning("Failed to load translator %s: %s", name, ce)
+            instance = None
+        self._instances[name] = instance
+        return instance
+
+    def _load_table(self):
+        try:
+            persisted = json_loads(Path(self.table_path).read_bytes())
+        except (OSError, ValueError):
+            return
+        if (
+            not isinstance(persisted, dict)
+            or persisted.get("format") != DISPATCH_TABLE_FORMAT
+            or persisted.get("group") != self.group
+            or persisted.get("fingerprint") != self.fingerprint
+        ):
+            return
+        for *key, name in persisted["table"]:
+            if name is None or name in self.entry_points:
+                self._table[tuple(key)] = name
+
+
+def _get_dist_version(ep):
+    dist = getattr(ep, "dist", None)
+    return dist.version if dist is not None else None
+
+
+def _get_module_stamp(ep):
+    """Return the modification time and size of the file of an entry
+    point's module (without importing it), or None if it has no file"""
+    try:
+        spec = importlib.util.find_spec(ep.module)
+        stat = os.stat(spec.origin)
+    except Exception:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
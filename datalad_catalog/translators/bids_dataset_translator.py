@@ -7,10 +7,17 @@
 #
 # ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
 """Translate bids_dataset-based metadata to the catalog schema"""
-import jq
 import logging
 from pathlib import Path
+from datalad_catalog.jqlike import (
+    add,
+    get_value,
+    iter_values,
+    length,
+    sub,
+)
 from datalad_catalog.translate import (
+    NativeTranslatorMixin,
     TranslatorBase,
     TranslatorImplementationBase,
 )
@@ -96,6 +103,12 @@ class BIDSDatasetTranslator(TranslatorBase):
         """
         return BIDSTranslator(metadata).translate()
 
+    def translate_native(self, metadata: dict) -> dict:
+        """
+        Translates incoming metadata into the catalog schema, without jq
+        """
+        return NativeBIDSTranslator(metadata).translate()
+
 
 class BIDSTranslator(TranslatorImplementationBase):
     """Translator for bids_dataset
@@ -119,6 +132,8 @@ class BIDSTranslator(TranslatorImplementationBase):
                 # bids_description expected format = [{"extension": "", "text": "",}]
                 # TODO: figure out which extension has priority;
                 # take 1st element for now
+                if isinstance(bids_description[0], str):
+                    return bids_description[0]
                 return bids_description[0].get("text", None)
             else:
                 return None
@@ -142,12 +157,12 @@ class BIDSTranslator(TranslatorImplementationBase):
             '{"name": $auth, "givenName":"", "familyName":"", '
             '"email":"", "honorificSuffix":"", "identifiers":[]}]'
         )
-        result = jq.first(program, self.extracted_metadata)
+        result = self.jq_first(program, self.extracted_metadata)
         return result if result is not None and len(result) > 0 else None
 
     def get_keywords(self):
         program = ". as $parent | .entities.task + .variables.dataset"
-        result = jq.first(program, self.extracted_metadata)
+        result = self.jq_first(program, self.extracted_metadata)
         return result if result is not None and len(result) > 0 else None
 
     def get_funding(self):
@@ -155,7 +170,7 @@ class BIDSTranslator(TranslatorImplementationBase):
             "[.Funding[]? as $fund | "
             '{"name": "", "grant":"", "description":$fund}]'
         )
-        result = jq.first(program, self.extracted_metadata)
+        result = self.jq_first(program, self.extracted_metadata)
         return result if result is not None and len(result) > 0 else None
 
     def get_publications(self):
@@ -169,12 +184,12 @@ class BIDSTranslator(TranslatorImplementationBase):
             '"publicationOutlet":"", '
             '"authors": []}]'
         )
-        result = jq.first(program, self.extracted_metadata)
+        result = self.jq_first(program, self.extracted_metadata)
         return result if result is not None and len(result) > 0 else None
 
     def get_additional_display(self):
         program = '[{"name": "BIDS", "content": .entities}]'
-        result = jq.first(program, self.extracted_metadata)
+        result = self.jq_first(program, self.extracted_metadata)
         return result if result is not None and len(result) > 0 else None
 
     def get_top_display(self):
@@ -184,7 +199,7 @@ class BIDSTranslator(TranslatorImplementationBase):
             '{"name": "Tasks", "value": (.entities.task | length)}, '
             '{"name": "Runs", "value": (.entities.run | length)}]'
         )
-        result = jq.first(program, self.extracted_metadata)
+        result = self.jq_first(program, self.extracted_metadata)
         return result if result is not None and len(result) > 0 else None
 
     def translate(self):
@@ -203,3 +218,81 @@ class BIDSTranslator(TranslatorImplementationBase):
             "top_display": self.get_top_display(),
         }
         return {k: v for k, v in translated_record.items() if v is not None}
+
+
+class NativeBIDSTranslator(NativeTranslatorMixin, BIDSTranslator):
+    """Translator for bids_dataset
+    Pure-Python equivalent of BIDSTranslator, with the same output.
+    """
+
+    def _iter(self, key):
+        # .key[]?
+        return iter_values(
+            get_value(self.extracted_metadata, key), optional=True
+        )
+
+    def get_authors(self):
+        result = [
+            {
+                "name": author,
+                "givenName": "",
+                "familyName": "",
+                "email": "",
+                "honorificSuffix": "",
+                "identifiers": [],
+            }
+            for author in self._iter("Authors")
+        ]
+        return result if len(result) > 0 else None
+
+    def get_keywords(self):
+        result = add(
+            get_value(get_value(self.extracted_metadata, "entities"), "task"),
+            get_value(
+                get_value(self.extracted_metadata, "variables"), "dataset"
+            ),
+        )
+        return result if result is not None and len(result) > 0 else None
+
+    def get_funding(self):
+        result = [
+            {"name": "", "grant": "", "description": funding}
+            for funding in self._iter("Funding")
+        ]
+        return result if len(result) > 0 else None
+
+    def get_publications(self):
+        result = [
+            {
+                "type": "",
+                "title": get_value(pubin, "citation"),
+                "doi": sub(
+                    get_value(pubin, "id"), "DOI:", "https://www.doi.org/"
+                ),
+                "datePublished": "",
+                "publicationOutlet": "",
+                "authors": [],
+            }
+            for pubin in self._iter("references")
+        ]
+        return result if len(result) > 0 else None
+
+    def get_additional_display(self):
+        return [
+            {
+                "name": "BIDS",
+                "content": get_value(self.extracted_metadata, "entities"),
+            }
+        ]
+
+    def get_top_display(self):
+        entities = get_value(self.extracted_metadata, "entities")
+        return [
+            {"name": name, "value": length(get_value(entities, key))}
+            for name, key in (
+                ("Subjects", "subject"),
+                ("Sessions", "session"),
+                ("Tasks", "task"),
+                ("Runs", "run"),
+            )
+        ]
@@ -7,10 +7,18 @@
 #
 # ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
 """Translate datacite_gin-based metadata to the catalog schema"""
-import jq
 import logging
 from pathlib import Path
+from datalad_catalog.jqlike import (
+    get_value,
+    has_key,
+    iter_values,
+    split,
+    sub,
+    tostring,
+)
 from datalad_catalog.translate import (
+    NativeTranslatorMixin,
     TranslatorBase,
     TranslatorImplementationBase,
 )
@@ -96,6 +104,12 @@ class DataciteGINTranslator(TranslatorBase):
         """
         return DataciteTranslator(metadata).translate()
 
+    def translate_native(self, metadata: dict) -> dict:
+        """
+        Translates incoming metadata into the catalog schema, without jq
+        """
+        return NativeDataciteTranslator(metadata).translate()
+
 
 class DataciteTranslator(TranslatorImplementationBase):
     """Translator for datacite_gin
@@ -115,7 +129,7 @@ class DataciteTranslator(TranslatorImplementationBase):
 
     def get_license(self):
         program = '.license | { "name": .name, "url": .url}'
-        result = jq.first(program, self.extracted_metadata)
+        result = self.jq_first(program, self.extracted_metadata)
         # todo check for license info missing
         return result if result is not None and len(result) > 0 else None
 
@@ -129,7 +143,7 @@ class DataciteTranslator(TranslatorImplementationBase):
             ' "identifier":(.id | tostring | split(":") | .[1])}]} '
             "else null end]"
         )
-        result = jq.first(program, self.extracted_metadata)
+        result = self.jq_first(program, self.extracted_metadata)
         return result if result is not None and len(result) > 0 else None
 
     def get_keywords(self):
@@ -140,7 +154,7 @@ class DataciteTranslator(TranslatorImplementationBase):
             "[.funding[]? as $element | "
             '{"name": $element, "identifier": "", "description": ""}]'
         )
-        result = jq.first(program, self.extracted_metadata)
+        result = self.jq_first(program, self.extracted_metadata)
         return result if result is not None and len(result) > 0 else None
 
     def get_publications(self):
@@ -154,7 +168,7 @@ class DataciteTranslator(TranslatorImplementationBase):
             '"publicationOutlet":"", '
             '"authors": []}]'
         )
-        result = jq.first(program, self.extracted_metadata)
+        result = self.jq_first(program, self.extracted_metadata)
         return result if result is not None and len(result) > 0 else None
 
     def translate(self):
@@ -172,3 +186,68 @@ class DataciteTranslator(TranslatorImplementationBase):
             "metadata_sources": self.get_metadata_source(),
         }
         return {k: v for k, v in translated_record.items() if v is not None}
+
+
+class NativeDataciteTranslator(NativeTranslatorMixin, DataciteTranslator):
+    """Translator for datacite_gin
+    Pure-Python equivalent of DataciteTranslator, with the same output.
+    """
+
+    def _iter(self, key):
+        # .key[]?
+        return iter_values(
+            get_value(self.extracted_metadata, key), optional=True
+        )
+
+    def get_license(self):
+        license = get_value(self.extracted_metadata, "license")
+        return {
+            "name": get_value(license, "name"),
+            "url": get_value(license, "url"),
+        }
+
+    def get_authors(self):
+        result = []
+        for author in self._iter("authors"):
+            translated = {
+                "name": "",
+                "givenName": get_value(author, "firstname"),
+                "familyName": get_value(author, "lastname"),
+                "email": "",
+                "honorificSuffix": "",
+            }
+            if has_key(author, "id"):
+                id_parts = split(tostring(author["id"]), ":")
+                translated["identifiers"] = [
+                    {
+                        "type": id_parts[0] if len(id_parts) > 0 else None,
+                        "identifier": id_parts[1]
+                        if len(id_parts) > 1
+                        else None,
+                    }
+                ]
+            result.append(translated)
+        return result if len(result) > 0 else None
+
+    def get_funding(self):
+        result = [
+            {"name": funding, "identifier": "", "description": ""}
+            for funding in self._iter("funding")
+        ]
+        return result if len(result) > 0 else None
+
+    def get_publications(self):
+        result = [
+            {
+                "type": "",
+                "title": get_value(pubin, "citation"),
+                "doi": sub(
+                    get_value(pubin, "id"), "(?i)DOI:", "https://doi.org/"
+                ),
+                "datePublished": "",
+                "publicationOutlet": "",
+                "authors": [],
+            }
+            for pubin in self._iter("references")
+        ]
+        return result if len(result) > 0 else None
@@ -7,10 +7,17 @@
 #
 # ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
 """Translate metalad_core-based metadata to the catalog schema"""
-import jq
 import logging
 from pathlib import Path
+from datalad_catalog.jqlike import (
+    alternative,
+    get_value,
+    has_key,
+    iter_values,
+    sub,
+)
 from datalad_catalog.translate import (
+    NativeTranslatorMixin,
     TranslatorBase,
     TranslatorImplementationBase,
 )
@@ -96,6 +103,12 @@ class MetaladCoreTranslator(TranslatorBase):
         """
         return CoreTranslator(metadata).translate()
 
+    def translate_native(self, metadata: dict) -> dict:
+        """
+        Translates incoming metadata into the catalog schema, without jq
+        """
+        return NativeCoreTranslator(metadata).translate()
+
 
 class CoreTranslator(TranslatorImplementationBase):
     """Translator for metalad_core
@@ -121,14 +134,14 @@ class CoreTranslator(TranslatorImplementationBase):
             '.[]? | select(.["@type"] == "Dataset") | '
             '[.distribution[]? | select(has("url")) | .url]'
         )
-        return jq.first(program, self.graph)
+        return self.jq_first(program, self.graph)
 
     def get_authors(self):
         program = (
             '[.[]? | select(.["@type"]=="agent")] | '
             'map(del(.["@id"], .["@type"]))'
         )
-        return jq.first(program, self.graph)
+        return self.jq_first(program, self.graph)
 
     def get_subdatasets(self):
         program = (
@@ -139,12 +152,12 @@ class CoreTranslator(TranslatorImplementationBase):
             'sub("^datalad:"; "")), "dataset_path": .["name"], '
             '"dirs_from_path": []}]'
         )
-        result = jq.first(program, self.graph)
+        result = self.jq_first(program, self.graph)
         return result if result is not None and len(result) > 0 else None
 
     def get_file_url(self):
         program = ".distribution? | .url?"
-        return jq.first(program, self.extracted_metadata)
+        return self.jq_first(program, self.extracted_metadata)
 
     def get_file_path(self):
         return self.metadata_record.get("path", None)
@@ -178,3 +191,64 @@ class CoreTranslator(TranslatorImplementationBase):
             )
 
         return {k: v for k, v in translated_record.items() if v is not None}
+
+
+class NativeCoreTranslator(NativeTranslatorMixin, CoreTranslator):
+    """Translator for metalad_core
+    Pure-Python equivalent of CoreTranslator, with the same output.
+    """
+
+    def _iter_datasets(self):
+        # .[]? | select(.["@type"] == "Dataset")
+        return (
+            x
+            for x in iter_values(self.graph, optional=True)
+            if get_value(x, "@type") == "Dataset"
+        )
+
+    def get_dataset_url(self):
+        return next(
+            [
+                get_value(d, "url")
+                for d in iter_values(
+                    get_value(x, "distribution"), optional=True
+                )
+                if has_key(d, "url")
+            ]
+            for x in self._iter_datasets()
+        )
+
+    def get_authors(self):
+        return [
+            {k: v for k, v in x.items() if k not in ("@id", "@type")}
+            for x in iter_values(self.graph, optional=True)
+            if get_value(x, "@type") == "agent"
+        ]
+
+    def get_subdatasets(self):
+        result = next(
+            [
+                {
+                    "dataset_id": sub(
+                        alternative(get_value(h, "identifier"), ""),
+                        "^datalad:",
+                        "",
+                    ),
+                    "dataset_version": sub(
+                        get_value(h, "@id"), "^datalad:", ""
+                    ),
+                    "dataset_path": get_value(h, "name"),
+                    "dirs_from_path": [],
+                }
+                for h in iter_values(get_value(x, "hasPart"), optional=True)
+            ]
+            for x in self._iter_datasets()
+        )
+        return result if result is not None and len(result) > 0 else None
+
+    def get_file_url(self):
+        # .distribution? | .url?
+        distribution = self.extracted_metadata.get("distribution")
+        if distribution is not None and not isinstance(distribution, dict):
+            raise StopIteration
+        return get_value(distribution, "url")
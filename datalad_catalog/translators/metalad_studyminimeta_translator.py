@@ -7,10 +7,16 @@
 #
 # ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
 """Translate metalad_studyminimeta-based metadata to the catalog schema"""
-import jq
 import logging
 from pathlib import Path
+from datalad_catalog.jqlike import (
+    equals,
+    get_value,
+    iter_values,
+    sub,
+)
 from datalad_catalog.translate import (
+    NativeTranslatorMixin,
     TranslatorBase,
     TranslatorImplementationBase,
 )
@@ -98,6 +104,12 @@ class MetaladStudyminimetaTranslator(TranslatorBase):
         """
         return MinimetaTranslator(metadata).translate()
 
+    def translate_native(self, metadata: dict) -> dict:
+        """
+        Translates incoming metadata into the catalog schema, without jq
+        """
+        return NativeMinimetaTranslator(metadata).translate()
+
 
 class MinimetaTranslator(TranslatorImplementationBase):
     """Translator for metalad_studyminimeta
@@ -111,7 +123,7 @@ class MinimetaTranslator(TranslatorImplementationBase):
         self.extracted_metadata = self.metadata_record["extracted_metadata"]
 
         self.graph = self.extracted_metadata["@graph"]
-        self.type_dataset = jq.first(
+        self.type_dataset = self.jq_first(
             '.[] | select(.["@type"] == "Dataset")',
             self.graph,
         )
@@ -136,7 +148,7 @@ class MinimetaTranslator(TranslatorImplementationBase):
 
     def _jq_first_or_none(self, program, entry):
         try:
-            result = jq.first(program, entry)
+            result = self.jq_first(program, entry)
         except StopIteration:
             result = None
         return result
@@ -159,7 +171,7 @@ class MinimetaTranslator(TranslatorImplementationBase):
                 '. as $parent | [.authorids[]["@id"] as $idin | '
                 '($parent.authordetails[] | select(.["@id"] == $idin))]'
             )
-            return jq.first(program, self.combinedpersonsids)
+            return self.jq_first(program, self.combinedpersonsids)
         return None
 
     def get_funding(self):
@@ -167,7 +179,7 @@ class MinimetaTranslator(TranslatorImplementationBase):
             '.[] | select(.["@type"] == "Dataset") | [.funder[]? | '
             '{"name": .name, "identifier": "", "description": ""}]'
         )
-        result = jq.first(program, self.graph)  #  [] if nothing found
+        result = self.jq_first(program, self.graph)  #  [] if nothing found
         return result if result is not None and len(result) > 0 else None
 
     def get_publications(self):
@@ -182,7 +194,7 @@ class MinimetaTranslator(TranslatorImplementationBase):
                 '"authors": ([$pubin.author[]["@id"] as $idin | '
                 '($parent.authordetails[] | select(.["@id"] == $idin))])}]'
             )
-            return jq.first(program, self.combinedpersonspubs)
+            return self.jq_first(program, self.combinedpersonspubs)
         else:
             return None
 
@@ -193,7 +205,7 @@ class MinimetaTranslator(TranslatorImplementationBase):
             '"dataset_version": (.["@id"] | sub("^datalad:"; "")), '
             '"dataset_path": .name, "dirs_from_path": []}]'
         )
-        result = jq.first(program, self.graph)  #  [] if nothing found
+        result = self.jq_first(program, self.graph)  #  [] if nothing found
         return result if result is not None and len(result) > 0 else None
 
     def translate(self):
@@ -213,3 +225,130 @@ class MinimetaTranslator(TranslatorImplementationBase):
         }
 
         return {k: v for k, v in translated_record.items() if v is not None}
+
+
+class NativeMinimetaTranslator(NativeTranslatorMixin, MinimetaTranslator):
+    """Translator for metalad_studyminimeta
+    Pure-Python equivalent of MinimetaTranslator, with the same output.
+    """
+
+    def __init__(self, metadata_record):
+        self.metadata_record = metadata_record
+        self.extracted_metadata = self.metadata_record["extracted_metadata"]
+
+        self.graph = self.extracted_metadata["@graph"]
+        self.type_dataset = next(self._select("@type", "Dataset"))
+        self.combinedpersonsids = self._first_combination(
+            authordetails=(
+                get_value(x, "@list")
+                for x in self._select("@id", "#personList")
+            ),
+            authorids=(
+                get_value(x, "author") for x in self._select("@type", "Dataset")
+            ),
+        )
+        self.combinedpersonspubs = self._first_combination(
+            authordetails=(
+                get_value(x, "@list")
+                for x in self._select("@id", "#personList")
+            ),
+            publications=(
+                get_value(x, "@list")
+                for x in self._select("@id", "#publicationList")
+            ),
+        )
+
+    def _select(self, key, value, optional=False):
+        # .[] | select(.[key] == value)
+        return (
+            x
+            for x in iter_values(self.graph, optional=optional)
+            if equals(get_value(x, key), value)
+        )
+
+    def _first_combination(self, **streams):
+        """Return the first output of an object construction with the
+        outputs of streams as values (like {key: stream, ...}), or None"""
+        combination = {}
+        for key, stream in streams.items():
+            for value in stream:
+                combination[key] = value
+                break
+            else:
+                return None
+        return combination
+
+    def _match_authors(self, authors, authordetails):
+        # [authors[]["@id"] as $idin |
+        #  ($parent.authordetails[] | select(.["@id"] == $idin))]
+        return [
+            details
+            for author in iter_values(authors)
+            for idin in (get_value(author, "@id"),)
+            for details in iter_values(authordetails)
+            if equals(get_value(details, "@id"), idin)
+        ]
+
+    def get_authors(self):
+        if self.combinedpersonsids is not None:
+            return self._match_authors(
+                self.combinedpersonsids["authorids"],
+                self.combinedpersonsids["authordetails"],
+            )
+        return None
+
+    def get_funding(self):
+        result = next(
+            [
+                {
+                    "name": get_value(funder, "name"),
+                    "identifier": "",
+                    "description": "",
+                }
+                for funder in iter_values(get_value(x, "funder"), optional=True)
+            ]
+            for x in self._select("@type", "Dataset")
+        )
+        return result if result is not None and len(result) > 0 else None
+
+    def get_publications(self):
+        if self.combinedpersonspubs is not None:
+            authordetails = self.combinedpersonspubs["authordetails"]
+            return [
+                {
+                    "type": get_value(pubin, "@type"),
+                    "title": get_value(pubin, "headline"),
+                    "doi": get_value(pubin, "sameAs"),
+                    "datePublished": get_value(pubin, "datePublished"),
+                    "publicationOutlet": get_value(
+                        get_value(pubin, "publication"), "name"
+                    ),
+                    "authors": self._match_authors(
+                        get_value(pubin, "author"), authordetails
+                    ),
+                }
+                for pubin in iter_values(
+                    self.combinedpersonspubs["publications"]
+                )
+            ]
+        else:
+            return None
+
+    def get_subdatasets(self):
+        result = next(
+            [
+                {
+                    "dataset_id": sub(
+                        get_value(h, "identifier"), "^datalad:", ""
+                    ),
+                    "dataset_version": sub(
+                        get_value(h, "@id"), "^datalad:", ""
+                    ),
+                    "dataset_path": get_value(h, "name"),
+                    "dirs_from_path": [],
+                }
+                for h in iter_values(get_value(x, "hasPart"), optional=True)
+            ]
+            for x in self._select("@type", "Dataset", optional=True)
+        )
+        return result if result is not None and len(result) > 0 else None
@@ -126,22 +126,21 @@ class Tree(ValidatedInterface):
         all_datasets = report.get("datasets")
         N_datasets = len(all_datasets)
         res_kwargs["N_datasets"] = N_datasets
+        # versions per dataset
+        ds_versions = {}
+        for dsv in report.get("versions"):
+            ds_versions.setdefault(dsv["dataset_id"], []).append(dsv)
         for i, d in enumerate(all_datasets):
             res_kwargs["i"] = i
             res_kwargs["d"] = d
 
-            found_dv = next(
-                (dv for dv in report.get("versions") if dv["dataset_id"] == d),
-                "",
-            )
+            current_ds_versions = ds_versions[d]
+            found_dv = current_ds_versions[0]
             res_kwargs["dataset_name"] = found_dv["dataset_name"]
             res_kwargs["dataset_alias"] = found_dv.get("alias", None)
             res_kwargs["result_type"] = "dataset"
             yield get_status_dict(status="ok", **res_kwargs)
 
-            current_ds_versions = [
-                dsv for dsv in report.get("versions") if dsv["dataset_id"] == d
-            ]
             res_kwargs["N_ds_versions"] = len(current_ds_versions)
             for j, cdsv in enumerate(current_ds_versions):
                 res_kwargs["j"] = j
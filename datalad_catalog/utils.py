@@ -1,9 +1,14 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 import hashlib
 import json
+import os
 from pathlib import Path
+import re
 import shutil
 import subprocess
 import sys
+import uuid
 import yaml
 
 from datalad.support.exceptions import InsufficientArgumentsError
@@ -57,6 +62,46 @@ def split_string(input_string, split_length):
     return path_left, path_right
 
 
+def get_node_file_path(
+    metadata_path: Path,
+    dataset_id: str,
+    dataset_version: str,
+    md5_hash: str,
+    split_length: int = 3,
+) -> Path:
+    """
+    Get the metadata file location of a node from its dataset id, dataset
+    version, and md5 hash, using a file system structure similar to RIA
+    stores. Format: "metadata/dataset_id/dataset_version/hash_left/
+    hash_right.json"
+    """
+    hash_path_left, hash_path_right = split_string(md5_hash, split_length)
+    return (
+        Path(metadata_path)
+        / dataset_id
+        / dataset_version
+        / hash_path_left
+        / hash_path_right
+    ).with_suffix(".json")
+
+
+def parse_byte_range(header: str):
+    """Parse the value of an HTTP Range header with a single byte range,
+    e.g. "bytes=0-499" or "bytes=500-"
+
+    Returns a tuple (start, end), with end being None for open ranges, or
+    None if the header is not of this form.
+    """
+    match = re.fullmatch(r"bytes=(\d+)-(\d*)", (header or "").strip())
+    if match is None:
+        return None
+    start = int(match.group(1))
+    end = int(match.group(2)) if match.group(2) else None
+    if end is not None and end < start:
+        return None
+    return start, end
+
+
 def load_config_file(file: Path):
     """Helper to load content from JSON or YAML file"""
     with open(file) as f:
@@ -80,6 +125,57 @@ def read_json_file(file_path):
         raise
 
 
+def get_staged_path(file_path: Path, suffix: str = None) -> Path:
+    """Return the path of a temporary file next to the provided file path,
+    to which new content can be written before it replaces the file"""
+    if suffix is None:
+        suffix = uuid.uuid4().hex
+    return file_path.with_name(f"{file_path.name}.{suffix}.tmp")
+
+
+def write_json_file(file_path: Path, content, staged_path: Path = None):
+    """Write content to a JSON file atomically
+
+    The content is first written to a temporary file in the same directory,
+    which then replaces the target file via os.replace. Readers will thus
+    either see the old or the new file content, never a truncated file.
+    If 'staged_path' is provided, the content is only written to that
+    temporary file, and replacing the target file is left to the caller.
+    """
+    file_path = Path(file_path)
+    tmp_path = staged_path or get_staged_path(file_path)
+    try:
+        with open(tmp_path, "w") as f:
+            json.dump(content, f)
+        if staged_path is None:
+            os.replace(tmp_path, file_path)
+    except BaseException:
+        remove_file(tmp_path)
+        raise
+
+
+def write_bytes_file(file_path: Path, data: bytes, staged_path: Path = None):
+    """Write bytes to a file atomically, see write_json_file()"""
+    file_path = Path(file_path)
+    tmp_path = staged_path or get_staged_path(file_path)
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        if staged_path is None:
+            os.replace(tmp_path, file_path)
+    except BaseException:
+        remove_file(tmp_path)
+        raise
+
+
+def remove_file(file_path: Path):
+    """Remove a file if it exists"""
+    try:
+        os.unlink(file_path)
+    except FileNotFoundError:
+        pass
+
+
 def find_duplicate_object_in_list(
     list_to_search: list, new_obj: object, keys_to_match
 ):
@@ -102,7 +198,10 @@ def merge_lists(existing_value, new_value):
     """Merges two lists
 
     Merges two lists of which the element types are determined
-    locally and which are handled accordingly
+    locally and which are handled accordingly. Scalars are deduplicated,
+    and objects are only added if no existing object matches all of their
+    key-value pairs (see find_duplicate_object_in_list). In both cases,
+    the order in which elements are first seen is kept.
     """
     # Return new_value if existing_value is None
     if existing_value is None:
@@ -119,19 +218,78 @@ def merge_lists(existing_value, new_value):
         existing_value = [existing_value]
     if not isinstance(new_value, list):
         new_value = [new_value]
+    if not new_value:
+        return existing_value
     # Then determine type of variable in list and handle accordingly
     if isinstance(new_value[0], (str, int)):
-        return list(set(existing_value + new_value))
-    if isinstance(new_value[0], object):
-        for new_object in new_value:
-            existing_object = find_duplicate_object_in_list(
-                existing_value, new_object, new_object.keys()
-            )
-            if existing_object is None:
-                existing_value.append(new_object)
-            else:
-                continue
-        return existing_value
+        return list(dict.fromkeys(existing_value + new_value))
+    return merge_objects(existing_value, new_value)
+
+
+def freeze(value):
+    """Return a hashable representation of a (JSON-like) value
+
+    Dicts become frozensets of (key, value) items and lists become tuples,
+    recursively, so that two values are equal if and only if their frozen
+    representations are equal.
+    """
+    if isinstance(value, dict):
+        return frozenset((k, freeze(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    if isinstance(value, set):
+        return frozenset(freeze(v) for v in value)
+    return value
+
+
+def merge_objects(existing_value: list, new_value: list) -> list:
+    """Append objects of new_value to existing_value, unless duplicate
+
+    A new dict is a duplicate if an existing (or previously appended) dict
+    has all of its keys with equal values, as determined by
+    find_duplicate_object_in_list. Instead of searching the list for every
+    new object, existing dicts are indexed once by their frozen key-value
+    pairs, so that merging takes time linear in the size of both lists.
+    Other (non-dict) elements are duplicates if an equal element exists.
+    """
+    # {(key, frozen value): {positions of dicts with that item}}
+    items_index = {}
+    # frozen elements, for a quick check for exact duplicates
+    frozen_elements = set()
+
+    def index(position, obj):
+        frozen_elements.add(freeze(obj))
+        if isinstance(obj, dict):
+            for key, value in obj.items():
+                items_index.setdefault((key, freeze(value)), set()).add(
+                    position
+                )
+
+    def is_duplicate(obj):
+        if freeze(obj) in frozen_elements:
+            return True
+        if not isinstance(obj, dict):
+            return False
+        if not obj:
+            # an empty object matches anything
+            return bool(existing_value)
+        postings = []
+        for key, value in obj.items():
+            positions = items_index.get((key, freeze(value)))
+            if not positions:
+                return False
+            postings.append(positions)
+        # intersecting starting from the smallest set is cheapest
+        postings.sort(key=len)
+        return bool(postings[0].intersection(*postings[1:]))
+
+    for position, obj in enumerate(existing_value):
+        index(position, obj)
+    for new_object in new_value:
+        if not is_duplicate(new_object):
+            index(len(existing_value), new_object)
+            existing_value.append(new_object)
+    return existing_value
 
 
 def get_entry_points(group: str) -> dict:
@@ -234,6 +392,25 @@ class jsEncoder(json.JSONEncoder):
         return json.JSONEncoder.default(self, obj)
 
 
+def jsonify(value):
+    """Return a value with JSON types only, in which other objects (e.g.
+    UUIDs or paths) are replaced by their string representation
+
+    This gives the same result as serializing the value with jsEncoder and
+    parsing the JSON text again, without the cost of doing so.
+    """
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if isinstance(value, dict):
+        return {
+            k if isinstance(k, str) else json.dumps(k): jsonify(v)
+            for k, v in value.items()
+        }
+    if isinstance(value, (list, tuple)):
+        return [jsonify(v) for v in value]
+    return str(value)
+
+
 def write_jsonline_to_file(filename, line):
     """Write a single JSON line to file"""
     with open(filename, "a") as f:
@@ -249,3 +426,34 @@ def get_gitconfig(conf_name):
         .rstrip()
     )
     return result
+
+
+def iter_chunks(iterable, size: int):
+    """Yield lists of (up to) 'size' consecutive items of an iterable"""
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def map_chunks_ordered(func, chunks, jobs: int):
+    """Apply a function to chunks in a pool of worker processes
+
+    The function must be picklable (e.g. a module-level function or a
+    functools.partial() of one) and return a list per chunk. The items of
+    these lists are yielded in input order. At most two chunks per worker
+    are in flight, so that memory use is bounded irrespective of the
+    number of chunks.
+    """
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        in_flight = deque()
+        for chunk in chunks:
+            in_flight.append(executor.submit(func, chunk))
+            if len(in_flight) >= 2 * jobs:
+                yield from in_flight.popleft().result()
+        while in_flight:
+            yield from in_flight.popleft().result()
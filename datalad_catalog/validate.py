@@ -13,13 +13,14 @@ from datalad_catalog.constraints import (
     EnsureWebCatalog,
     metadata_constraint,
 )
-from datalad_catalog.utils import read_json_file
-from datalad_catalog.webcatalog import WebCatalog
-from jsonschema import (
-    Draft202012Validator,
-    RefResolver,
-    ValidationError,
+from datalad_catalog.jsonl import json_loads
+from datalad_catalog import schema_registry
+from datalad_catalog.utils import (
+    iter_chunks,
+    map_chunks_ordered,
 )
+from datalad_catalog.webcatalog import WebCatalog
+from jsonschema import ValidationError
 from datalad_next.commands import (
     EnsureCommandParameterization,
     ValidatedInterface,
@@ -28,8 +29,12 @@ from datalad_next.commands import (
     eval_results,
     get_status_dict,
 )
+from datalad_next.constraints import (
+    EnsureInt,
+    EnsureRange,
+)
 from datalad_next.exceptions import CapturedException
-import json
+from functools import partial
 import logging
 from pathlib import Path
 
@@ -47,6 +52,7 @@ class ValidateParameterValidator(EnsureCommandParameterization):
             param_constraints=dict(
                 catalog=EnsureWebCatalog(),
                 metadata=metadata_constraint,
+                jobs=EnsureInt() & EnsureRange(min=1),
             ),
             joint_constraints=dict(),
         )
@@ -80,6 +86,15 @@ class Validate(ValidatedInterface):
              single datalad dataset.
             - A stream of JSON objects/lines""",
         ),
+        jobs=Parameter(
+            # cmdline argument definitions, incl aliases
+            args=("-J", "--jobs"),
+            # documentation
+            doc="""Number of parallel processes used to validate metadata
+            records. Records are sent to the processes in chunks, and results
+            are reported in input order. By default, records are validated
+            in the current process.""",
+        ),
     )
 
     _examples_ = [
@@ -97,6 +112,15 @@ class Validate(ValidatedInterface):
                 "-m path/to/metadata.jsonl'"
             ),
         ),
+        dict(
+            text="Validate metadata using 8 processes",
+            code_py=(
+                "catalog_validate(metadata='path/to/metadata.jsonl', jobs=8)"
+            ),
+            code_cmd=(
+                "datalad catalog-validate -m path/to/metadata.jsonl -J 8"
+            ),
+        ),
     ]
 
     @staticmethod
@@ -107,6 +131,7 @@ class Validate(ValidatedInterface):
     def __call__(
         metadata,
         catalog=None,
+        jobs: int = None,
     ):
         res_kwargs = dict(
             action="catalog_validate",
@@ -115,59 +140,107 @@ class Validate(ValidatedInterface):
         # turn non-iterable into a list for uniform processing below
         if isinstance(metadata, (str, dict)):
             metadata = [metadata]
-        # Get schema store from 1) catalog or 2) package data
-        schema_store = get_schema_store(catalog)
-        # Get subsequent Draft202012Validator validator
-        schema_validator = get_schema_validator(schema_store)
-        # Validate items in metadata
-        i = 0
-        for line in metadata:
-            i += 1
-            if isinstance(line, CapturedException):
-                # the generator encountered an exception for a particular
-                # item and is relaying it as per instructions
-                # exc_mode='yield'. We report and move on. Outside
-                # flow logic will decide if processing continues
-                yield get_status_dict(
-                    **res_kwargs,
-                    status="error",
-                    exception=line,
-                )
-                continue
-            # load json object into dict
-            if isinstance(line, str):
-                meta_dict = json.loads(line.rstrip())
-            else:
-                meta_dict = line
-            # Check if line is a dict
-            if not isinstance(meta_dict, dict):
-                err_msg = (
-                    "Metadata item not of type dict: metadata items should be "
-                    "passed to datalad catalog as JSON objects adhering to the "
-                    "catalog schema."
-                )
-                yield get_status_dict(
-                    **res_kwargs,
-                    status="impossible",
-                    message=err_msg,
-                )
-                continue
-            # Validate dict against catalog schema
+        # Get schema directory from 1) catalog or 2) package data
+        schema_dir = catalog.get_schema_dir() if catalog else cnst.schema_dir
+        if jobs is None or jobs == 1:
+            schema_validator = get_schema_validator(
+                schema_registry.get_schema_store(schema_dir)
+            )
+            results = _validate_items(schema_validator, _iter_items(metadata))
+        else:
+            # validate chunks of items in worker processes
+            results = map_chunks_ordered(
+                partial(_validate_chunk, schema_dir),
+                iter_chunks(_iter_items(metadata), VALIDATE_CHUNK_SIZE),
+                jobs,
+            )
+        for i, status, message, exception in results:
+            yield get_status_dict(
+                **res_kwargs,
+                status=status,
+                **(dict(message=message) if message else {}),
+                **(dict(exception=exception) if exception else {}),
+            )
+
+
+# Number of records per chunk sent to a worker process
+VALIDATE_CHUNK_SIZE = 1000
+
+
+def _iter_items(metadata):
+    """Yield (line number, item) for each metadata item, where item is
+    a dict, or a CapturedException of an item that could not be read"""
+    i = 0
+    for line in metadata:
+        i += 1
+        # load json object into dict
+        if isinstance(line, str):
             try:
-                schema_validator.validate(meta_dict)
-                yield get_status_dict(
-                    **res_kwargs,
-                    status="ok",
-                )
-            except ValidationError as e:
-                err_msg = f"Schema validation failed for item {i}: {e}"
-                yield get_status_dict(
-                    **res_kwargs,
-                    status="error",
-                    message=err_msg,
-                    exception=e,
-                )
-                continue
+                line = json_loads(line)
+            except ValueError as e:
+                line = CapturedException(e)
+        yield i, line
+
+
+def _validate_chunk(schema_dir: Path, items: list) -> list:
+    """Validate a chunk of metadata items in a worker process
+
+    Each worker process reuses a single validator (see schema_registry)
+    for all chunks. Validation errors are returned in picklable form.
+    """
+    schema_validator = get_schema_validator(
+        schema_registry.get_schema_store(schema_dir)
+    )
+    return [
+        (i, status, message, _picklable_error(exception))
+        if isinstance(exception, ValidationError)
+        else (i, status, message, exception)
+        for i, status, message, exception in _validate_items(
+            schema_validator, items
+        )
+    ]
+
+
+def _validate_items(schema_validator, items):
+    """Yield a (line number, status, message, exception) tuple per item"""
+    for i, meta_dict in items:
+        if isinstance(meta_dict, CapturedException):
+            # the generator encountered an exception for a particular
+            # item and is relaying it as per instructions
+            # exc_mode='yield'. We report and move on. Outside
+            # flow logic will decide if processing continues
+            yield i, "error", None, meta_dict
+            continue
+        # Check if line is a dict
+        if not isinstance(meta_dict, dict):
+            err_msg = (
+                "Metadata item not of type dict: metadata items should be "
+                "passed to datalad catalog as JSON objects adhering to the "
+                "catalog schema."
+            )
+            yield i, "impossible", err_msg, None
+            continue
+        # Validate dict against catalog schema
+        try:
+            schema_validator.validate(meta_dict)
+            yield i, "ok", None, None
+        except ValidationError as e:
+            err_msg = f"Schema validation failed for item {i}: {e}"
+            yield i, "error", err_msg, e
+
+
+def _picklable_error(e: ValidationError) -> ValidationError:
+    """Return a copy of a validation error without references to the
+    (unpicklable) validator internals, e.g. to return it from a worker"""
+    return ValidationError(
+        e.message,
+        validator=e.validator,
+        path=e.relative_path,
+        schema_path=e.relative_schema_path,
+        validator_value=e.validator_value,
+        instance=e.instance,
+        schema=e.schema,
+    )
 
 
 def get_schema_store(catalog: WebCatalog = None):
@@ -178,12 +251,8 @@ def get_schema_store(catalog: WebCatalog = None):
     schema store; else, retrieve the package default (i.e. latest) schema store
     """
     if catalog is None:
-        schema_store = {}
         # get store from package schema path
-        for schema_type, schema_id in cnst.CATALOG_SCHEMA_IDS.items():
-            schema_path = cnst.schema_dir / f"jsonschema_{schema_type}.json"
-            schema = read_json_file(schema_path)
-            schema_store[schema[cnst.DOLLARID]] = schema
+        schema_store = schema_registry.get_schema_store(cnst.schema_dir)
     else:
         schema_store = catalog.get_schema_store()
     return schema_store
@@ -191,6 +260,4 @@ def get_schema_store(catalog: WebCatalog = None):
 
 def get_schema_validator(schema_store: dict):
     """Return schema validator"""
-    catalog_schema = schema_store[cnst.CATALOG_SCHEMA_IDS[cnst.CATALOG]]
-    resolver = RefResolver.from_schema(catalog_schema, store=schema_store)
-    return Draft202012Validator(catalog_schema, resolver=resolver)
+    return schema_registry.get_schema_validator(schema_store)
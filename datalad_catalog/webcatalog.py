@@ -1,23 +1,40 @@
-import json
+from contextlib import contextmanager
+import copy
 import logging
 from pathlib import Path
 import os
-from jsonschema import (
-    Draft202012Validator,
-    RefResolver,
-)
 
 import datalad_catalog.constants as cnst
+from datalad_catalog import schema_registry
+from datalad_catalog.journal import Journal
+from datalad_catalog.locking import (
+    FileLock,
+    LockStats,
+    LockTimeoutError,
+)
+from datalad_catalog.compression import (
+    compress_path,
+    get_precompress_encodings,
+    negotiate_compressed_path,
+)
+from datalad_catalog.manifest import Manifest
 from datalad_catalog.meta_item import MetaItem
-from datalad_catalog.node import Node
+from datalad_catalog.node import (
+    Node,
+    compile_property_sources,
+)
+from datalad_catalog.node_cache import NodeCache
+from datalad_catalog.pages import get_children_page_size
+from datalad_catalog.storage import get_metadata_store
 from datalad_catalog.utils import (
     copy_overwrite_path,
     dir_exists,
     load_config_file,
     md5hash,
     md5sum_from_id_version_path,
+    parse_byte_range,
     read_json_file,
-    split_string,
+    write_json_file,
 )
 
 lgr = logging.getLogger("datalad.catalog.webcatalog")
@@ -28,12 +45,49 @@ class WebCatalog(object):
     The main catalog class.
     """
 
+    # number of lock files shared by the dataset versions (see lock())
+    _lock_stripes = 64
+
     def __init__(
         self,
         location: str,
+        node_cache_size: int = 1000,
+        lock_timeout: float = None,
+        catalog_lock: bool = False,
+        storage: str = None,
     ) -> None:
         self.location = Path(location)
         self.metadata_path = Path(self.location) / "metadata"
+        # files that are private to the processes writing to the catalog,
+        # which are not served (see serve())
+        self.private_path = Path(self.location) / ".catalog"
+        # journal of interrupted transactions (see journal.Journal)
+        self.journal_path = self.private_path / "journal"
+        # LOCKING
+        # lock files of dataset versions and of the whole catalog
+        self.locks_path = self.private_path / "locks"
+        # seconds to wait for a lock (None = indefinitely)
+        self.lock_timeout = lock_timeout
+        # lock the whole catalog instead of single dataset versions
+        self.catalog_lock = catalog_lock
+        self.lock_stats = LockStats()
+        # STORAGE
+        # backend of the Node metadata (see storage.get_metadata_store):
+        # 'files' | 'sqlite', detected from the catalog if not provided
+        self.store = get_metadata_store(self, storage)
+        # identity of dataset node files last seen by this instance:
+        # {node_hash: stamp} (see storage.MetadataStore.get_node_stamp)
+        self._node_file_stamps = {}
+        # NODE CACHE
+        self.node_cache = NodeCache(maxsize=node_cache_size)
+        # MANIFEST
+        # index of the dataset versions in the catalog
+        self.manifest = Manifest(self)
+        # CONFIG CACHE
+        # loaded config files: {path or (id, version): (stamp, config)}
+        self._config_cache = {}
+        # compiled property_sources rules: {id(config): (config, rules)}
+        self._property_rules_cache = {}
         # The following attributes should be reset on create:
         # STATE
         self.is_valid_catalog = self.is_created()
@@ -42,6 +96,10 @@ class WebCatalog(object):
         self.schema_validator = self.get_schema_validator()
         # CONFIG SETUP
         self.config = self.get_config()
+        # encodings in which catalog files are precompressed, e.g. ("gzip",)
+        self.precompress = get_precompress_encodings(self.config)
+        # maximum number of children per page of a node file, or None
+        self.children_page_size = get_children_page_size(self.config)
 
     def is_created(self) -> bool:
         """
@@ -59,9 +117,17 @@ class WebCatalog(object):
             is_created = is_created and out_dir_paths[key].exists()
         return is_created
 
-    def create(self, config_file: str = None, force: bool = False):
+    def create(
+        self,
+        config_file: str = None,
+        force: bool = False,
+        storage: str = None,
+    ):
         """Create new catalog directory with assets (JS, CSS),
         artwork, config, the main html, and html templates
+
+        If a storage backend is provided (see storage.get_metadata_store),
+        Node metadata is stored with it instead of the current one.
         """
         # TODO: validate config file
         # First determine where to get config from
@@ -71,6 +137,8 @@ class WebCatalog(object):
             self.config_path = cnst.default_config_dir / "config.json"
         # Load config from source file
         self.config = load_config_file(self.config_path)
+        self.precompress = get_precompress_encodings(self.config)
+        self.children_page_size = get_children_page_size(self.config)
         # Check logo path, if added to config
         if (
             self.config.get(cnst.LOGO_PATH) is not None
@@ -103,6 +171,18 @@ class WebCatalog(object):
             )
         # Copy / write config file
         self.write_config(force)
+        # Precompress static content, if configured
+        for path in list(out_dir_paths.values()) + [
+            Path(self.location) / "config.json"
+        ]:
+            compress_path(path, self.precompress)
+        # Set up the metadata store
+        if storage is not None and storage != self.store.name:
+            self.store = get_metadata_store(self, storage)
+        self.store.initialize()
+        # Index existing dataset versions, if any
+        if not self.manifest.exists():
+            self.manifest.rebuild()
         # Reset STATE and SCHEMA
         self.is_valid_catalog = self.is_created()
         self.schema_store = self.get_schema_store()
@@ -135,9 +215,10 @@ class WebCatalog(object):
             node_path = Path(relpath)
             if record_type == "file":
                 node_path = node_path.parent
-        # get node instance
-        node_instance = Node(
-            catalog=self,
+        # get node instance, which another process could have updated since
+        # it was cached
+        self._validate_cached_nodes(dataset_id, dataset_version)
+        node_instance = self.get_node(
             type=node_type,
             dataset_id=dataset_id,
             dataset_version=dataset_version,
@@ -148,12 +229,121 @@ class WebCatalog(object):
                 children = [
                     c for c in node_instance.children if c["path"] == relpath
                 ]
-                return children[0] if len(children) > 0 else None
+                # return a copy, since the node instance is cached
+                return copy.deepcopy(children[0]) if len(children) > 0 else None
             else:
-                return vars(node_instance)
+                # return a deep copy (without private attributes, e.g.
+                # indexes), since the node instance is cached, which still
+                # refers to this catalog instance
+                return copy.deepcopy(
+                    {
+                        key: value
+                        for key, value in vars(node_instance).items()
+                        if not key.startswith("_")
+                    },
+                    {id(self): self},
+                )
         else:
             return None
 
+    def iter_children(
+        self,
+        dataset_id: str,
+        dataset_version: str,
+        relpath: str = None,
+    ):
+        """Yield the records of the children (files, directories, and
+        subdatasets) of a dataset or directory in a catalog.
+
+        Unlike get_record(), which returns the children of all pages at
+        once (see pages.paginate_children()), pages are only read once the
+        children of the previous page were consumed, and the node is not
+        cached.
+        """
+        node_hash = md5sum_from_id_version_path(
+            dataset_id,
+            dataset_version,
+            None if relpath is None else Path(relpath),
+        )
+        yield from self.store.iter_node_children(
+            dataset_id, dataset_version, node_hash
+        )
+
+    def get_node(
+        self,
+        type: str,
+        dataset_id: str,
+        dataset_version: str,
+        node_path=None,
+    ) -> Node:
+        """Get the Node instance of a dataset or directory in the catalog
+
+        The instance is returned from the node cache if available, else it is
+        instantiated (which reads its metadata file if that exists) and added
+        to the cache.
+        """
+        node_hash = md5sum_from_id_version_path(
+            dataset_id, dataset_version, node_path
+        )
+        node_instance = self.node_cache.get(node_hash)
+        if node_instance is None:
+            node_instance = Node(
+                catalog=self,
+                type=type,
+                dataset_id=dataset_id,
+                dataset_version=dataset_version,
+                node_path=node_path,
+            )
+            self.node_cache.put(node_instance)
+        return node_instance
+
+    def has_dataset_version(
+        self, dataset_id: str, dataset_version: str
+    ) -> bool:
+        """Check if the catalog contains a dataset-level metadata file of a
+        dataset version, without reading it"""
+        if not dataset_id or not dataset_version:
+            return False
+        return self.store.has_node(
+            dataset_id,
+            dataset_version,
+            md5sum_from_id_version_path(dataset_id, dataset_version),
+        )
+
+    def flush(self):
+        """Write the metadata files of all Node instances in the node cache
+        that were modified in memory"""
+        self.node_cache.flush()
+
+    def get_journal(self):
+        """Return a new journal.Journal instance for writing multiple
+        catalog files as a single transaction"""
+        return Journal(self.journal_path)
+
+    def recover(self):
+        """Recover from interrupted transactions, e.g. after a crashed
+        'catalog-add', by rolling committed transactions forward and all
+        others back
+
+        Recovery is skipped while other processes are writing to the catalog,
+        which will then recover any interrupted transactions themselves.
+        """
+        # writers hold the catalog-wide lock in shared mode, so holding it
+        # exclusively ensures that no transaction is in progress
+        lock = FileLock(self.locks_path / "catalog.lock", timeout=0)
+        try:
+            with lock:
+                recovered = self.store.recover()
+        except LockTimeoutError:
+            lgr.debug("Catalog is in use, skipping recovery of transactions")
+            return dict(rolled_forward=0, rolled_back=0)
+        if any(recovered.values()):
+            # cached nodes might be outdated, and the manifest might not
+            # reflect the recovered transactions
+            self.node_cache.invalidate()
+            self.manifest.discard()
+        return recovered
+
     def add_record(self, metadata_record: dict, config_file: str = None):
         """Add a validated metadata record to the catalog
 
@@ -166,24 +356,221 @@ class WebCatalog(object):
         Such a config file will also be saved in a dedicated
         dataset-specific location
         """
-        # First see if related dataset record already exists
-        existing_record = self.get_record(
-            dataset_id=metadata_record[cnst.DATASET_ID],
-            dataset_version=metadata_record[cnst.DATASET_VERSION],
+        record_props = self.add_records([metadata_record], config_file)[0]
+        if "exception" in record_props:
+            raise record_props["exception"]
+        return record_props
+
+    def add_records(self, metadata_records, config_file: str = None):
+        """Add multiple validated metadata records to the catalog in bulk
+
+        Records are grouped per dataset_id and dataset_version. All records
+        of a group are translated into MetaItem instances that share a single
+        set of (cached) Node instances, so that the metadata file of each Node
+        instance is read at most once and written exactly once, irrespective
+        of how many records in the group touch it.
+
+        Returns a list (in input order) with a dict per record specifying
+        whether the record was created or updated, for reporting. If adding
+        a record failed, its dict contains the related exception under the
+        'exception' key. A failure while writing the Node files of a group
+        is reported for all records of that group.
+
+        The Node files of each group are written in a single transaction of
+        the metadata store (e.g. a journal.Journal), so that an interruption
+        never leaves a dataset version with partially updated files. Reading,
+        updating and writing the Node files of a group happens while holding
+        the lock of the dataset version (see lock()), so that concurrent
+        processes adding to the same catalog cannot lose each other's updates.
+        """
+        groups = {}
+        results = []
+        for metadata_record in metadata_records:
+            d_id = metadata_record.get(cnst.DATASET_ID)
+            d_version = metadata_record.get(cnst.DATASET_VERSION)
+            results.append(dict(type=metadata_record.get(cnst.TYPE)))
+            groups.setdefault((d_id, d_version), []).append(
+                (metadata_record, results[-1])
+            )
+        if self.catalog_lock:
+            try:
+                with self.lock():
+                    for (d_id, d_version), group in groups.items():
+                        self._add_group(d_id, d_version, group, config_file)
+            except Exception as e:
+                for record_props in results:
+                    record_props.setdefault("exception", e)
+        else:
+            for (d_id, d_version), group in groups.items():
+                try:
+                    with self.lock(d_id, d_version):
+                        self._add_group(d_id, d_version, group, config_file)
+                except Exception as e:
+                    for metadata_record, record_props in group:
+                        record_props.setdefault("exception", e)
+        return results
+
+    def _add_group(self, d_id, d_version, group, config_file: str = None):
+        """Add the records of a single dataset version, see add_records()"""
+        dataset_hash = md5sum_from_id_version_path(d_id, d_version)
+        # Another process could have updated the dataset version since its
+        # nodes were cached
+        self._validate_cached_nodes(d_id, d_version)
+        node_instances = {}
+        # records that were merged into the Node instances
+        merged_records = []
+        exists = None
+        for metadata_record, record_props in group:
+            # First translate the record into a MetaItem instance, merging
+            # it into the Node instances of its group
+            try:
+                MetaItem(
+                    catalog=self,
+                    meta_item=metadata_record,
+                    config_file=config_file,
+                    node_instances=node_instances,
+                )
+            except Exception as e:
+                record_props["exception"] = e
+                # The record could have been merged into the Node instances
+                # partially, rebuild them without it
+                node_instances = self._rebuild_group_nodes(
+                    node_instances, merged_records, config_file
+                )
+                continue
+            merged_records.append(metadata_record)
+            # A record is reported as added only if it is the first record
+            # in the group and its dataset record does not yet exist
+            if exists is None:
+                exists = node_instances[dataset_hash].is_created()
+                record_props["action"] = "update" if exists else "add"
+            else:
+                record_props["action"] = "update"
+        # Then create/update the metadata file of each Node instance once,
+        # all as part of a single transaction, i.e. the Node instances must
+        # not be written on eviction from the cache before
+        with self.node_cache.pin(list(node_instances)):
+            try:
+                for node_instance in node_instances.values():
+                    self.node_cache.mark_dirty(node_instance)
+                # a bundle of the dataset version would be outdated
+                self.store.invalidate_bundle(d_id, d_version)
+                with self.store.transaction() as journal:
+                    self.node_cache.flush(
+                        node_instances.keys(), journal=journal
+                    )
+            except Exception as e:
+                # forget about in-memory changes that could not be written
+                self.node_cache.discard(node_instances.keys())
+                self.node_cache.pop_created_files(d_id, d_version)
+                for metadata_record, record_props in group:
+                    record_props.setdefault("exception", e)
+                node_instances = {}
+        if node_instances:
+            # Record the update of the dataset version in the manifest. The
+            # records were added at this point, i.e. the manifest is rebuilt
+            # from the metadata store if it could not be updated
+            added_files = self.node_cache.pop_created_files(d_id, d_version)
+            try:
+                self.manifest.update_dataset_version(
+                    node_instances.get(dataset_hash)
+                    or self.get_node("dataset", d_id, d_version),
+                    added_files=added_files,
+                )
+            except Exception as e:
+                lgr.warning(
+                    "Could not update the catalog manifest for dataset "
+                    "version %s/%s, it will be rebuilt: %s",
+                    d_id,
+                    d_version,
+                    e,
+                )
+                try:
+                    self.manifest.discard()
+                except Exception as e:
+                    lgr.warning("Could not discard the catalog manifest: %s", e)
+        if dataset_hash in node_instances:
+            self._node_file_stamps[dataset_hash] = self._get_node_file_stamp(
+                node_instances[dataset_hash]
+            )
+
+    def _rebuild_group_nodes(
+        self, node_instances: dict, metadata_records: list, config_file
+    ) -> dict:
+        """Discard the (not yet written) Node instances of a group of records
+        from the node cache, and merge the given records into new Node
+        instances, see _add_group()"""
+        self.node_cache.discard(list(node_instances))
+        node_instances = {}
+        for metadata_record in metadata_records:
+            MetaItem(
+                catalog=self,
+                meta_item=metadata_record,
+                config_file=config_file,
+                node_instances=node_instances,
+            )
+        return node_instances
+
+    @contextmanager
+    def lock(self, dataset_id: str = None, dataset_version: str = None):
+        """Context manager holding the lock of a dataset version
+
+        Dataset versions are locked exclusively, while the catalog-wide lock
+        is held in shared mode, so that processes working on different
+        dataset versions do not block each other (except for the rare
+        dataset versions that share a lock file). If no dataset version is
+        provided, or if the catalog was instantiated with catalog_lock=True,
+        the catalog-wide lock is held exclusively instead.
+
+        Raises locking.LockTimeoutError if a lock could not be acquired
+        within the lock_timeout of the catalog.
+        """
+        exclusive = self.catalog_lock or dataset_id is None
+        with self._get_lock("catalog", shared=not exclusive):
+            if exclusive:
+                yield
+                return
+            dataset_hash = md5sum_from_id_version_path(
+                dataset_id, dataset_version
+            )
+            # dataset versions share a fixed number of lock files, so that
+            # these do not accumulate
+            stripe = int(dataset_hash, 16) % self._lock_stripes
+            with self._get_lock(f"dataset-{stripe}"):
+                yield
+
+    def _get_lock(self, name: str, shared: bool = False):
+        return FileLock(
+            self.locks_path / f"{name}.lock",
+            timeout=self.lock_timeout,
+            stats=self.lock_stats,
+            shared=shared,
         )
-        # First translate the record into a MetaItem instance
-        # that has multiple Node instances
-        meta_item = MetaItem(
-            catalog=self, meta_item=metadata_record, config_file=config_file
+
+    def _get_node_file_stamp(self, node_instance):
+        """Identify the current metadata of a Node instance, which changes
+        whenever it is written (see storage.MetadataStore.get_node_stamp)"""
+        return self.store.get_node_stamp(
+            node_instance.dataset_id,
+            node_instance.dataset_version,
+            node_instance.md5_hash,
         )
-        # Then create/update their respective metadata files
-        meta_item.write_nodes_to_files()
-        # Return a value specifying whether the record
-        # was created or updated, for reporting
-        return dict(
-            action="update" if existing_record else "add",
-            type=metadata_record.get(cnst.TYPE),
+
+    def _validate_cached_nodes(self, dataset_id: str, dataset_version: str):
+        """Drop cached Node instances of a dataset version if its dataset
+        node file changed since this instance last wrote it
+
+        The dataset node is written with every update of a dataset version,
+        so its file identifies the state of all nodes of the version. Nodes
+        cached afterwards are at least as recent as the recorded stamp.
+        """
+        dataset_hash = md5sum_from_id_version_path(dataset_id, dataset_version)
+        stamp = self.store.get_node_stamp(
+            dataset_id, dataset_version, dataset_hash
         )
+        if stamp != self._node_file_stamps.get(dataset_hash):
+            self.node_cache.invalidate(dataset_id, dataset_version)
+            self._node_file_stamps[dataset_hash] = stamp
 
     def get_main_dataset(self):
         super_path = Path(self.metadata_path) / "super.json"
@@ -205,8 +592,7 @@ class WebCatalog(object):
             cnst.DATASET_VERSION: dataset_version,
         }
         main_file = Path(self.metadata_path) / "super.json"
-        with open(main_file, "w") as f:
-            json.dump(main_obj, f)
+        write_json_file(main_file, main_obj)
         return main_file
 
     def get_logo_path(self):
@@ -232,6 +618,75 @@ class WebCatalog(object):
             return None
         return load_config_file(config_path)
 
+    def get_dataset_config(
+        self,
+        dataset_id: str,
+        dataset_version: str,
+        config_file: str = None,
+    ):
+        """Get the effective config of a dataset-version in the catalog
+
+        The config is loaded from the dataset-level config file
+        (i.e. "/metadata/dataset_id/dataset_version/config.json") if it
+        exists, else from the provided config file, else the catalog-level
+        config is used.
+
+        Returns a dict with the config (key 'config') and its source
+        (key 'source', one of 'dataset' or 'catalog'). Loaded config files
+        are cached, and only reloaded once their modification time changes.
+        """
+        # Identify the dataset-level config in the metadata store
+        stamp = self.store.get_dataset_config_stamp(dataset_id, dataset_version)
+        if stamp is not None:
+            # If dataset-level config file DOES exist, return it
+            key = (dataset_id, dataset_version)
+            cached = self._config_cache.get(key)
+            if cached is None or cached[0] != stamp:
+                cached = (
+                    stamp,
+                    self.store.read_dataset_config(dataset_id, dataset_version),
+                )
+                self._config_cache[key] = cached
+            return dict(source="dataset", config=cached[1])
+        else:
+            # If dataset-level config file DOES NOT exist:
+            if config_file is not None:
+                # If config file passed: load and return
+                return dict(
+                    source="dataset",
+                    config=self._load_config_file_cached(Path(config_file)),
+                )
+            else:
+                # If config file is not passed,
+                # only load from catalog-level config file
+                return dict(source="catalog", config=self.config)
+
+    def _load_config_file_cached(self, config_path: Path):
+        """Load a config file, or return its cached content if the file
+        was not modified since it was last loaded"""
+        stat = config_path.stat()
+        file_stamp = (stat.st_mtime_ns, stat.st_size)
+        cached = self._config_cache.get(config_path)
+        if cached is not None and cached[0] == file_stamp:
+            return cached[1]
+        config = load_config_file(config_path)
+        self._config_cache[config_path] = (file_stamp, config)
+        return config
+
+    def get_property_rules(self, config: dict):
+        """Return the 'property_sources' rules of a config as a lookup table
+        of the form {key: (config_rule, config_source)}
+
+        Rules are compiled once per config (see
+        node.compile_property_sources) and then reused.
+        """
+        cached = self._property_rules_cache.get(id(config))
+        if cached is not None and cached[0] is config:
+            return cached[1]
+        rules = compile_property_sources(config)
+        self._property_rules_cache[id(config)] = (config, rules)
+        return rules
+
     def write_config(self, force=False):
         """"""
         # Copy content specified by config
@@ -249,38 +704,29 @@ class WebCatalog(object):
             self.config[cnst.LOGO_PATH] = "artwork/" + existing_name
         # Dump json content to file
         new_config_path = Path(self.location) / "config.json"
-        with open(new_config_path, "w") as f:
-            json.dump(self.config, f)
+        write_json_file(new_config_path, self.config)
 
     def get_schema_store(self):
         """Return schema store of catalog instance, or of package
         if the former is not found"""
-        schema_store = {}
+        # The store is loaded only once per process (see schema_registry)
+        return schema_registry.get_schema_store(self.get_schema_dir())
+
+    def get_schema_dir(self) -> Path:
+        """Return the schema directory of catalog instance, or of package
+        if the former is not found"""
         # If catalog has schema files in "<catalog-name>/schema" dir, use them,
         # else use the schema files in the package default schema location
         cat_schema_dir = Path(self.location) / "schema"
         if (cat_schema_dir / "jsonschema_catalog.json").exists():
-            schema_dir = cat_schema_dir
-        else:
-            schema_dir = cnst.schema_dir
-        # Now load all schema files into store
-        for schema_type, schema_id in cnst.CATALOG_SCHEMA_IDS.items():
-            schema_path = schema_dir / f"jsonschema_{schema_type}.json"
-            schema = read_json_file(schema_path)
-            schema_store[schema[cnst.DOLLARID]] = schema
-        return schema_store
+            return cat_schema_dir
+        return cnst.schema_dir
 
     def get_schema_validator(self):
         """Return schema validator"""
         if not hasattr(self, "schema_store"):
             self.schema_store = self.get_schema_store()
-        catalog_schema = self.schema_store[
-            cnst.CATALOG_SCHEMA_IDS[cnst.CATALOG]
-        ]
-        resolver = RefResolver.from_schema(
-            catalog_schema, store=self.schema_store
-        )
-        return Draft202012Validator(catalog_schema, resolver=resolver)
+        return schema_registry.get_schema_validator(self.schema_store)
 
     def serve(
         self,
@@ -288,8 +734,13 @@ class WebCatalog(object):
         port: int = 8000,
         base: str = None,
     ):
-        """Serve a catalog via a local http server"""
+        """Serve a catalog via a local http server
 
+        Metadata that was not yet exported from the metadata store to the
+        'metadata' directory (see storage.MetadataStore.export) is exported
+        first.
+        """
+        self.store.export()
         if base and not self.location.resolve().is_relative_to(
             Path(base).resolve()
         ):
@@ -308,14 +759,64 @@ class WebCatalog(object):
         from datalad.ui import ui
         import datalad.support.ansi_colors as ac
 
+        precompress = self.precompress
+        private_path = self.private_path.resolve()
+
         class CustomHandler(SimpleHTTPRequestHandler):
             # Redirect all '/dataset' URLs to '/index.html'
             def do_GET(self):
                 if self.path.startswith(f"/{relpath}/dataset"):
                     self.path = f"/{relpath}/index.html"
+                # Never serve journals or lock files
+                if (
+                    Path(self.translate_path(self.path))
+                    .resolve()
+                    .is_relative_to(private_path)
+                ):
+                    return self.send_error(404)
+                # Serve byte ranges, e.g. of bundle shards
+                byte_range = parse_byte_range(self.headers.get("Range"))
+                file_path = self.translate_path(self.path)
+                if byte_range is not None and os.path.isfile(file_path):
+                    return self.send_byte_range(file_path, *byte_range)
+                # Serve precompressed files, if the client accepts them
+                compressed = negotiate_compressed_path(
+                    file_path, self.headers.get("Accept-Encoding"), precompress
+                )
+                if compressed is not None:
+                    return self.send_compressed(file_path, *compressed)
                 # Continue with the default behavior
                 return SimpleHTTPRequestHandler.do_GET(self)
 
+            def send_compressed(self, file_path, encoding, compressed_path):
+                with open(compressed_path, "rb") as f:
+                    data = f.read()
+                self.send_response(200)
+                self.send_header("Content-Type", self.guess_type(file_path))
+                self.send_header("Content-Encoding", encoding)
+                self.send_header("Content-Length", str(len(data)))
+                self.send_header("Vary", "Accept-Encoding")
+                self.end_headers()
+                self.wfile.write(data)
+
+            def send_byte_range(self, file_path, start, end):
+                size = os.path.getsize(file_path)
+                if start >= size:
+                    self.send_response(416)
+                    self.send_header("Content-Range", f"bytes */{size}")
+                    self.end_headers()
+                    return
+                end = size - 1 if end is None else min(end, size - 1)
+                with open(file_path, "rb") as f:
+                    f.seek(start)
+                    data = f.read(end - start + 1)
+                self.send_response(206)
+                self.send_header("Content-Type", self.guess_type(file_path))
+                self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
         try:
             with socketserver.TCPServer((host, port), CustomHandler) as httpd:
                 ui.message(
@@ -337,48 +838,32 @@ class WebCatalog(object):
     def get_dataset_versions(self):
         """Function to get all dataset-versions from a catalog,
         including several data points from each specific dataset-version
-        metadata file. This means that each dataset-level metadata file
-        in the catalog is read, which might take some time.
+        metadata file. These are read from the catalog manifest (see
+        manifest.Manifest), which is rebuilt from all dataset-level
+        metadata files in the catalog if it does not exist yet.
         """
         dataset_versions = []
-
-        for dv in self.metadata_path.glob("*/*"):
-            """"""
-            if not dv.is_dir():
-                continue
-            ds_id_path = dv.parent.relative_to(self.metadata_path)
-            ds_id = str(ds_id_path)
-            ds_version_path = dv.relative_to(self.metadata_path)
-            ds_version = dv.name
-            n = Node(
-                catalog=self,
-                type="dataset",
-                dataset_id=ds_id,
-                dataset_version=ds_version,
-                node_path=None,
-            )
-            name = alias_path = alias = None
-            if hasattr(n, "name"):
-                name = n.name
-            if hasattr(n, "alias"):
-                alias = n.alias
+        for entry in self.manifest.read():
+            ds_id = entry["dataset_id"]
+            alias = entry.get("alias")
+            alias_path = None
+            if alias is not None:
                 alias_path = str(
                     (Path(alias) / md5hash(alias)).with_suffix(".json")
                 )
             dataset_versions.append(
                 {
-                    "dataset_name": name,
+                    "dataset_name": entry.get("dataset_name"),
                     "dataset_id": ds_id,
-                    "dataset_version": ds_version,
+                    "dataset_version": entry["dataset_version"],
                     "concept_path": str(
-                        (ds_id_path / md5hash(ds_id)).with_suffix(".json")
-                    ),
-                    "metadata_path": str(
-                        n.get_location().relative_to(self.metadata_path)
+                        (Path(ds_id) / md5hash(ds_id)).with_suffix(".json")
                     ),
+                    "metadata_path": entry.get("metadata_path"),
                     "alias": alias,
                     "alias_path": alias_path,
-                    "updated_at": n.get_last_updated(),
+                    "updated_at": entry.get("updated_at"),
+                    "file_count": entry.get("file_count", 0),
                 }
             )
         return dataset_versions
@@ -387,12 +872,11 @@ class WebCatalog(object):
         """Summarize output from self.get_dataset_versions and
         some more additional stats
         """
-        files = list(self.metadata_path.rglob("*.json"))
         ds_versions = self.get_dataset_versions()
-        ds_ids = list(set([dsv["dataset_id"] for dsv in ds_versions]))
+        # dataset ids in order of their first version
+        ds_ids = list(dict.fromkeys(dsv["dataset_id"] for dsv in ds_versions))
         homepage = self.get_main_dataset()
-        homepage_node = Node(
-            catalog=self,
+        homepage_node = self.get_node(
             type="dataset",
             dataset_id=homepage.get("dataset_id"),
             dataset_version=homepage.get("dataset_version"),
@@ -407,7 +891,10 @@ class WebCatalog(object):
             ),
             "dataset_count": len(ds_ids),
             "version_count": len(ds_versions),
-            "metadata_file_count": len(files),
+            # metadata files of all dataset versions (of their nodes and
+            # configs, not of pages of children), and the homepage file
+            "metadata_file_count": sum(dsv["file_count"] for dsv in ds_versions)
+            + 1,
             "datasets": ds_ids,
             "versions": ds_versions,
         }
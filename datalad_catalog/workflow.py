@@ -10,6 +10,7 @@
 """
 
 from datalad.distribution.dataset import Dataset
+from datalad.support.annexrepo import AnnexRepo
 from datalad.support.exceptions import IncompleteResultsError
 from datalad_catalog.constraints import (
     CatalogRequired,
@@ -19,10 +20,15 @@ from datalad_catalog.webcatalog import (
     WebCatalog,
 )
 from datalad_catalog.add import Add
-from datalad_catalog.translate import MetaTranslate
+from datalad_catalog.translate import (
+    MetaTranslate,
+    _picklable_exception,
+)
 from datalad_catalog.utils import (
     get_available_entrypoints,
-    write_jsonline_to_file,
+    jsEncoder,
+    jsonify,
+    map_chunks_ordered,
 )
 from datalad_next.commands import (
     EnsureCommandParameterization,
@@ -38,9 +44,12 @@ from datalad_next.constraints import (
     EnsureInt,
     EnsureListOf,
     EnsurePath,
+    EnsureRange,
     EnsureStr,
 )
 from datalad_next.constraints.dataset import EnsureDataset
+from functools import partial
+import json
 import logging
 from pathlib import Path
 from typing import Union
@@ -86,6 +95,9 @@ class WorkflowParameterValidator(EnsureCommandParameterization):
                 extractor=EnsureListOf(EnsureStr()),
                 config_file=EnsurePath(lexists=True),
                 force=EnsureBool(),
+                spill_dir=EnsurePath(),
+                jobs=EnsureInt() & EnsureRange(min=1),
+                incremental=EnsureBool(),
             ),
             joint_constraints=dict(),
         )
@@ -180,6 +192,37 @@ class Workflow(ValidatedInterface):
             action="store_true",
             default=False,
         ),
+        spill_dir=Parameter(
+            # cmdline argument definitions, incl aliases
+            args=("--spill-dir",),
+            # documentation
+            doc="""Directory to which the extracted and translated metadata
+            of each dataset is written as JSON lines, for debugging. Metadata
+            is passed between workflow steps in memory, and by default it is
+            not written to any file.""",
+        ),
+        jobs=Parameter(
+            # cmdline argument definitions, incl aliases
+            args=("-J", "--jobs"),
+            # documentation
+            doc="""Number of parallel processes used to extract and translate
+            the metadata of datasets. Translated metadata is added to the
+            catalog by the current process only, in the order of datasets.
+            By default, datasets are processed one after the other in the
+            current process.""",
+        ),
+        incremental=Parameter(
+            # cmdline argument definitions, incl aliases
+            args=("--incremental",),
+            # documentation
+            doc="""Only process datasets whose version is not yet in the
+            catalog. A dataset version is considered to be in the catalog if
+            its dataset-level metadata file exists. For subdatasets, the
+            version is the commit recorded in the superdataset. Skipped
+            datasets are reported with status 'notneeded'.""",
+            action="store_true",
+            default=False,
+        ),
     )
     _examples_ = [
         dict(
@@ -197,6 +240,37 @@ class Workflow(ValidatedInterface):
                 "-d path/to/superdataset -e metalad_core"
             ),
         ),
+        dict(
+            text=(
+                "Run the same workflow, extracting and translating the "
+                "metadata of 8 subdatasets at a time"
+            ),
+            code_py=(
+                "catalog_workflow(mode='new', catalog='/tmp/my-cat/', "
+                "dataset='path/to/superdataset', extractor='metalad_core', "
+                "jobs=8)"
+            ),
+            code_cmd=(
+                "datalad catalog-workflow -m new -c /tmp/my-cat "
+                "-d path/to/superdataset -e metalad_core -J 8"
+            ),
+        ),
+        dict(
+            text=(
+                "Refresh a catalog with the metadata of new versions of the "
+                "superdataset and its subdatasets, skipping all dataset "
+                "versions that are already in the catalog"
+            ),
+            code_py=(
+                "catalog_workflow(mode='new', catalog='/tmp/my-cat/', "
+                "dataset='path/to/superdataset', extractor='metalad_core', "
+                "incremental=True)"
+            ),
+            code_cmd=(
+                "datalad catalog-workflow -m new -c /tmp/my-cat "
+                "-d path/to/superdataset -e metalad_core --incremental"
+            ),
+        ),
         dict(
             text=(
                 "Run a workflow for updating a catalog after registering a "
@@ -229,6 +303,9 @@ class Workflow(ValidatedInterface):
         extractor=["metalad_core"],
         config_file=None,
         force: bool = False,
+        spill_dir: Path = None,
+        jobs: int = None,
+        incremental: bool = False,
     ):
         # Instantiate WebCatalog class if necessary
         if isinstance(catalog, WebCatalog):
@@ -249,6 +326,9 @@ class Workflow(ValidatedInterface):
                 extractors=extractor,
                 config_file=config_file,
                 force=force,
+                spill_dir=spill_dir,
+                jobs=jobs,
+                incremental=incremental,
                 **res_kwargs,
             )
         if mode == "update":
@@ -257,6 +337,9 @@ class Workflow(ValidatedInterface):
                 subds=subdataset.ds,
                 catalog=catalog,
                 extractors=extractor,
+                spill_dir=spill_dir,
+                jobs=jobs,
+                incremental=incremental,
                 **res_kwargs,
             )
 
@@ -267,6 +350,9 @@ def super_workflow(
     extractors: list,
     config_file=None,
     force=False,
+    spill_dir: Path = None,
+    jobs: int = None,
+    incremental: bool = False,
     **kwargs,
 ):
     """Run a workflow from scratch on a dataset and all its subdatasets
@@ -279,6 +365,13 @@ def super_workflow(
       - extracted metadata translation
       - adding translated metadata to the catalog
     - Setting the super-dataset of catalog
+
+    If 'jobs' is larger than 1, extraction and translation run for several
+    datasets at a time in worker processes, see parallel_dataset_workflow().
+
+    If 'incremental' is True, datasets are skipped if their version (for
+    subdatasets: the commit recorded in the superdataset) is already in the
+    catalog.
     """
     # Install super and subdatasets
     ds.get(
@@ -291,11 +384,155 @@ def super_workflow(
     if not cat.is_created():
         cat.create(config_file, force)
 
+    main_version = _get_main_version(ds)
+    skipped = 0
+    if incremental or (jobs is not None and jobs > 1):
+        # the superdataset and all installed top-level subdatasets, with
+        # the versions of subdatasets recorded in the superdataset
+        datasets = [(ds, ds.id, main_version)] + [
+            (
+                Dataset(res["path"]),
+                res.get("gitmodule_datalad-id"),
+                res.get("gitshasum"),
+            )
+            for res in ds.subdatasets(
+                state="present",
+                result_renderer="disabled",
+                return_type="generator",
+                on_failure="ignore",
+            )
+            if res.get("status") == "ok"
+        ]
+        if incremental:
+            datasets, unchanged = _split_unchanged(cat, datasets)
+            skipped = len(unchanged)
+            yield from _report_unchanged(unchanged, **kwargs)
+        yield from _run_dataset_workflows(
+            [d for d, _, _ in datasets],
+            catalog=cat,
+            extractors=extractors,
+            spill_dir=spill_dir,
+            jobs=jobs,
+            **kwargs,
+        )
+    else:
+        yield from _foreach_dataset_workflow(
+            ds, cat, extractors, spill_dir, **kwargs
+        )
+    # Set super dataset of catalog
+    main_id = ds.id
+    cat.set_main_dataset(main_id, main_version)
+    yield get_status_dict(
+        **kwargs,
+        status="ok",
+        message=(
+            "Workflow-new successfully completed"
+            + (
+                f", skipped {skipped} unchanged dataset version(s)"
+                if incremental
+                else ""
+            )
+        ),
+    )
+
+
+def _get_main_version(ds: Dataset) -> str:
+    """Return the version of a dataset, as set for the catalog's main
+    dataset"""
+    # - sync possible adjusted branch (only git-annex repositories have them)
+    if isinstance(ds.repo, AnnexRepo):
+        ds.repo.localsync()
+    # - account for possibility of being on adjusted branch:
+    return ds.repo.get_hexsha(ds.repo.get_corresponding_branch())
+
+
+def _split_unchanged(catalog: WebCatalog, datasets: list):
+    """Split (dataset, dataset_id, dataset_version) tuples into those of
+    dataset versions that are not yet in the catalog, and those that are"""
+    changed = []
+    unchanged = []
+    for dataset in datasets:
+        _, dataset_id, dataset_version = dataset
+        if catalog.has_dataset_version(dataset_id, dataset_version):
+            unchanged.append(dataset)
+        else:
+            changed.append(dataset)
+    return changed, unchanged
+
+
+def _report_unchanged(unchanged: list, **kwargs):
+    """Yield a 'notneeded' result per skipped dataset version"""
+    for ds, dataset_id, dataset_version in unchanged:
+        yield get_status_dict(
+            **dict(kwargs, path=ds.path),
+            status="notneeded",
+            message=(
+                "Dataset version already in catalog: %s, %s",
+                dataset_id,
+                dataset_version,
+            ),
+        )
+
+
+def _run_dataset_workflows(
+    datasets: list,
+    catalog: WebCatalog,
+    extractors: list,
+    spill_dir: Path = None,
+    jobs: int = None,
+    **kwargs,
+):
+    """Run the dataset-specific workflow on a list of datasets, in
+    worker processes if 'jobs' is larger than 1"""
+    if jobs is not None and jobs > 1:
+        yield from parallel_dataset_workflow(
+            datasets,
+            catalog=catalog,
+            extractors=extractors,
+            spill_dir=spill_dir,
+            jobs=jobs,
+            **kwargs,
+        )
+    else:
+        for ds in datasets:
+            # as in parallel_dataset_workflow(), a failing dataset does not
+            # abort the workflow of the others
+            try:
+                results = dataset_workflow(
+                    ds,
+                    catalog,
+                    extractors,
+                    spill_dir=spill_dir,
+                )
+            except Exception as e:
+                yield get_status_dict(
+                    **dict(kwargs, path=ds.path),
+                    status="error",
+                    message=(
+                        "Could not extract and translate metadata of dataset "
+                        f"at {ds.path}"
+                    ),
+                    exception=e,
+                )
+                continue
+            yield from results
+
+
+def _foreach_dataset_workflow(
+    ds: Dataset, cat: WebCatalog, extractors: list, spill_dir, **kwargs
+):
+    """Run the per-dataset workflow on a dataset and its top-level
+    subdatasets, one after the other"""
+
     # Call per-dataset workflow
     def _dataset_workflow_inner(ds, refds, **kwargs):
         """Internal function to allow passing"""
         return dataset_workflow(
-            ds, catalog=cat, extractors=extractors, **kwargs
+            ds,
+            catalog=cat,
+            extractors=extractors,
+            spill_dir=spill_dir,
+            **kwargs,
         )
 
     try:
@@ -316,18 +553,6 @@ def super_workflow(
         yield get_status_dict(
             **kwargs, status="impossible", message=msg, exception=e
         )
-    # Set super dataset of catalog
-    main_id = ds.id
-    # - sync possible adjusted branch
-    ds.repo.localsync()
-    # - account for possibility of being on adjusted branch:
-    main_version = ds.repo.get_hexsha(ds.repo.get_corresponding_branch())
-    cat.set_main_dataset(main_id, main_version)
-    yield get_status_dict(
-        **kwargs,
-        status="ok",
-        message="Workflow-new successfully completed",
-    )
 
 
 def update_workflow(
@@ -335,6 +560,9 @@ def update_workflow(
     subds: Dataset,
     catalog: WebCatalog,
     extractors: list,
+    spill_dir: Path = None,
+    jobs: int = None,
+    incremental: bool = False,
     **kwargs,
 ):
     """Run an update workflow on a specific subdataset and its parent
@@ -351,25 +579,29 @@ def update_workflow(
     - The subdataset has already been added as a submodule to the parent dataset
     - The parent dataset already contains the subdataset commit
     """
+    main_version = _get_main_version(superds)
     # Dataset workflow for super+subdataset
-    yield dataset_workflow(
-        superds,
-        catalog,
-        extractors,
-    )
-    yield dataset_workflow(
-        subds,
-        catalog,
-        extractors,
+    datasets = [superds, subds]
+    if incremental:
+        datasets, unchanged = _split_unchanged(
+            catalog,
+            [
+                (superds, superds.id, main_version),
+                (subds, subds.id, subds.repo.get_hexsha()),
+            ],
+        )
+        datasets = [d for d, _, _ in datasets]
+        yield from _report_unchanged(unchanged, **kwargs)
+    yield from _run_dataset_workflows(
+        datasets,
+        catalog=catalog,
+        extractors=extractors,
+        spill_dir=spill_dir,
+        jobs=jobs,
+        **kwargs,
     )
     # Set super dataset of catalog
     main_id = superds.id
-    # - sync possible adjusted branch
-    superds.repo.localsync()
-    # - account for possibility of being on adjusted branch:
-    main_version = superds.repo.get_hexsha(
-        superds.repo.get_corresponding_branch()
-    )
     catalog.set_main_dataset(main_id, main_version)
     yield get_status_dict(
         **kwargs,
@@ -378,15 +610,159 @@ def update_workflow(
     )
 
 
-def dataset_workflow(ds: Dataset, catalog, extractors, **kwargs):
+def dataset_workflow(
+    ds: Dataset, catalog, extractors, spill_dir: Path = None, **kwargs
+):
     """Run a dataset-specific catalog generation workflow.
 
     This includes:
       - dataset- and file-level metadata extraction
       - extracted metadata translation
-      - adding translated metadata to a catalog"""
+      - adding translated metadata to a catalog
+
+    Metadata records are passed from one step to the next in memory. If
+    'spill_dir' is provided, the extracted and translated records are also
+    written to JSON lines files in a dataset-specific subdirectory of it,
+    for debugging.
+
+    Returns a list of the results of translation failures and of adding
+    the translated metadata to the catalog.
+    """
+    # 1.-3. Run extraction and translation
+    # translation failures are reported, and not passed on to the catalog
+    failures = []
+    translated = extract_translate(
+        ds, catalog, extractors, failures, spill_dir=spill_dir
+    )
+    # 4. Validate translated metadata and add it to the catalog
+    return failures + add_translated(catalog, translated)
+
+
+def extract_translate(
+    ds: Dataset, catalog, extractors, failures: list, spill_dir: Path = None
+):
+    """Yield the translated metadata records of a dataset
+
+    The results of failed translations are collected in 'failures'.
+    """
+    if spill_dir is not None:
+        spill_dir = Path(spill_dir) / (ds.id or Path(ds.path).name)
+        spill_dir.mkdir(parents=True, exist_ok=True)
     # 1. Run dataset-level extraction
-    extracted_file = Path(ds.path) / "extracted_meta.json"
+    extracted = _iter_extracted(ds, extractors)
+    # 2. Run file-level extraction, add output to same stream
+    # - Not implemented yet
+    if spill_dir is not None:
+        extracted = _spill(extracted, spill_dir / "extracted_meta.jsonl")
+    # 3. Run translation
+    catalog_translate = MetaTranslate()
+    translate_results = catalog_translate(
+        catalog=catalog,
+        metadata=extracted,
+        result_renderer="disabled",
+        return_type="generator",
+        on_failure="ignore",
+    )
+    translated = _iter_translated(translate_results, failures)
+    if spill_dir is not None:
+        translated = _spill(translated, spill_dir / "translated_meta.jsonl")
+    yield from translated
+
+
+def add_translated(catalog, translated) -> list:
+    """Validate translated metadata records and add them to a catalog,
+    and return the results"""
+    catalog_add = Add()
+    return catalog_add(
+        catalog=catalog,
+        metadata=translated,
+        result_renderer="disabled",
+        on_failure="ignore",
+    )
+
+
+def parallel_dataset_workflow(
+    datasets: list,
+    catalog: WebCatalog,
+    extractors: list,
+    spill_dir: Path = None,
+    jobs: int = 2,
+    **kwargs,
+):
+    """Run the dataset-specific workflow on several datasets in parallel
+
+    Metadata of the datasets is extracted and translated in a pool of
+    'jobs' worker processes. All translated records are added to the
+    catalog by the current process, one dataset after the other in the
+    order of 'datasets', so that catalog nodes are only written by a
+    single writer.
+
+    Yields the results of translation failures and of adding the
+    translated metadata to the catalog, and an error result per dataset
+    for which extraction and translation failed.
+    """
+    results = map_chunks_ordered(
+        partial(
+            _extract_translate_chunk,
+            str(catalog.location),
+            extractors,
+            spill_dir,
+        ),
+        # one dataset per chunk, since each takes long to process
+        ([ds.path] for ds in datasets),
+        jobs,
+    )
+    for path, translated, failures, exception in results:
+        if exception is not None:
+            yield get_status_dict(
+                **dict(kwargs, path=path),
+                status="error",
+                message=(
+                    "Could not extract and translate metadata of dataset "
+                    f"at {path}"
+                ),
+                exception=exception,
+            )
+            continue
+        yield from failures
+        yield from add_translated(catalog, translated)
+
+
+def _extract_translate_chunk(
+    catalog_location: str, extractors: list, spill_dir, paths: list
+) -> list:
+    """Extract and translate the metadata of a chunk of datasets in a
+    worker process
+
+    Returns a list with a (path, translated records, translation failures,
+    exception) tuple per dataset, with exceptions in picklable form.
+    """
+    catalog = WebCatalog(location=catalog_location)
+    results = []
+    for path in paths:
+        failures = []
+        try:
+            translated = list(
+                extract_translate(
+                    Dataset(path),
+                    catalog,
+                    extractors,
+                    failures,
+                    spill_dir=spill_dir,
+                )
+            )
+        except Exception as e:
+            results.append((path, None, None, _picklable_exception(e)))
+            continue
+        for res in failures:
+            if "exception" in res:
+                res["exception"] = _picklable_exception(res["exception"])
+        results.append((path, translated, failures, None))
+    return results
+
+
+def _iter_extracted(ds: Dataset, extractors: list):
+    """Yield the dataset-level metadata records of a dataset"""
     for name in extractors:
         # these are hacks to deal with extractors no yielding
         # results in an ideal way
@@ -401,29 +777,28 @@ def dataset_workflow(ds: Dataset, catalog, extractors, **kwargs):
             and not (Path(ds.path) / "datacite.yml").exists()
         ):
             continue
-        metadata_record = extract_dataset_level(ds, name)
-        write_jsonline_to_file(extracted_file, metadata_record)
-    # 2. Run file-level extraction, add output to same file
-    # - Not implemented yet
-    # 3. Run translation
-    translated_file = Path(ds.path) / "translated_meta.json"
-    catalog_translate = MetaTranslate()
-    res = catalog_translate(
-        catalog=catalog,
-        metadata=extracted_file,
-        result_renderer="disabled",
-    )
-    for r in res:
-        write_jsonline_to_file(
-            translated_file,
-            r.get("translated_metadata"),
-        )
-    # 4. Add translated metadata to catalog
-    catalog_add = Add()
-    return catalog_add(
-        catalog=catalog,
-        metadata=translated_file,
-    )
+        # records are passed on in memory, as if they had been written
+        # to and read from a JSON lines file
+        yield jsonify(extract_dataset_level(ds, name))
+
+
+def _iter_translated(translate_results, failures: list):
+    """Yield translated records, and collect the results of failed
+    translations in 'failures'"""
+    for res in translate_results:
+        if res["status"] == "ok":
+            yield res["translated_metadata"]
+        else:
+            failures.append(res)
+
+
+def _spill(records, path: Path):
+    """Pass records through, while writing them to a JSON lines file"""
+    with open(path, "w") as f:
+        for record in records:
+            f.write(json.dumps(record, cls=jsEncoder))
+            f.write("\n")
+            yield record
 
 
 def extract_dataset_level(dataset, extractor_name):
@@ -0,0 +1,101 @@
+"""
+The benchmark_translation.py script:
+
+- reads metalad-extracted metadata records from JSON lines files (by default,
+  the metalad_core and bids_dataset records in the package test data)
+- translates every record repeatedly with the matching bundled translator,
+  once recompiling jq programs for every call (as jq.first() does), once
+  reusing compiled jq programs, and once with the pure-Python implementation
+  of the translator (see TranslatorBase.translate_native())
+- checks that all produce the same translated records, and reports the
+  time per record and the speedup
+"""
+
+from argparse import ArgumentParser
+from pathlib import Path
+import time
+
+import jq
+
+from datalad_catalog import schema_registry
+import datalad_catalog.constants as cnst
+from datalad_catalog.jsonl import iter_jsonl
+from datalad_catalog.translate import (
+    Translate,
+    TranslatorImplementationBase,
+)
+
+test_data_dir = Path(__file__).parents[1] / "datalad_catalog" / "tests" / "data"
+default_paths = [
+    test_data_dir / "metadata_core.jsonl",
+    test_data_dir / "metadata_bids_dataset.jsonl",
+]
+
+
+def load_records(paths):
+    """Return (translator, record) for all records with a matching translator"""
+    store = schema_registry.get_schema_store()
+    schema_version = store[cnst.CATALOG_SCHEMA_IDS[cnst.CATALOG]][cnst.VERSION]
+    records = []
+    for path in paths:
+        for record in iter_jsonl(path):
+            if isinstance(record, dict):
+                translator = Translate(record, schema_version).translator
+                records.append((translator, record))
+    return records
+
+
+def translate_all(records, native=False):
+    if native:
+        return [t.translate_native(record) for t, record in records]
+    return [t.translate(record) for t, record in records]
+
+
+def time_translation(records, repeat, native=False):
+    """Return the average time in seconds to translate a record"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        translate_all(records, native=native)
+    return (time.perf_counter() - start) / (repeat * len(records))
+
+
+def uncompiled_jq_first(self, program, value):
+    return jq.first(program, value)
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser()
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        type=Path,
+        help="Paths to JSON lines files with metalad-extracted metadata",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=200,
+        help="Number of times each record is translated",
+    )
+    args = parser.parse_args()
+    paths = args.paths or default_paths
+    records = load_records(paths)
+    compiled_jq_first = TranslatorImplementationBase.jq_first
+    TranslatorImplementationBase.jq_first = uncompiled_jq_first
+    expected = translate_all(records)
+    t_uncompiled = time_translation(records, args.repeat)
+    TranslatorImplementationBase.jq_first = compiled_jq_first
+    mismatches = sum(a != b for a, b in zip(expected, translate_all(records)))
+    native_mismatches = sum(
+        a != b for a, b in zip(expected, translate_all(records, native=True))
+    )
+    t_compiled = time_translation(records, args.repeat)
+    t_native = time_translation(records, args.repeat, native=True)
+    print(f"{len(records)} records from {len(paths)} files")
+    print(f"translated records differing from jq.first(): {mismatches}")
+    print(f"... with the pure-Python path: {native_mismatches}")
+    print(f"jq.first():        {t_uncompiled * 1e6:10.1f} us/record")
+    print(f"compiled programs: {t_compiled * 1e6:10.1f} us/record")
+    print(f"pure-Python:       {t_native * 1e6:10.1f} us/record")
+    print(f"speedup compiled:  {t_uncompiled / t_compiled:10.1f}x")
+    print(f"speedup native:    {t_uncompiled / t_native:10.1f}x")
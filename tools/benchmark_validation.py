@@ -0,0 +1,66 @@
+"""
+The benchmark_validation.py script:
+
+- reads catalog metadata records from JSON lines files (by default, all
+  catalog metadata files in the package test data)
+- validates every record repeatedly with the full jsonschema validator and
+  with the fast-path validator of the catalog schema
+- reports the time per record and the speedup
+"""
+
+from argparse import ArgumentParser
+from pathlib import Path
+import time
+
+from datalad_catalog import schema_registry
+from datalad_catalog.jsonl import iter_jsonl
+
+test_data_dir = Path(__file__).parents[1] / "datalad_catalog" / "tests" / "data"
+
+
+def load_records(paths):
+    """"""
+    records = []
+    for path in paths:
+        records.extend(r for r in iter_jsonl(path) if isinstance(r, dict))
+    return records
+
+
+def time_validator(validator, records, repeat):
+    """Return the average time in seconds to validate a record"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for record in records:
+            validator.is_valid(record)
+    return (time.perf_counter() - start) / (repeat * len(records))
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser()
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        type=Path,
+        help="Paths to JSON lines files with catalog metadata records",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=200,
+        help="Number of times each record is validated",
+    )
+    args = parser.parse_args()
+    paths = args.paths or sorted(test_data_dir.glob("catalog_metadata_*.jsonl"))
+    records = load_records(paths)
+    store = schema_registry.get_schema_store()
+    full = schema_registry.get_schema_validator(store, fast=False)
+    fast = schema_registry.get_schema_validator(store, fast=True)
+    n_valid = sum(full.is_valid(r) for r in records)
+    mismatches = sum(full.is_valid(r) != fast.is_valid(r) for r in records)
+    print(f"{len(records)} records ({n_valid} valid) from {len(paths)} files")
+    print(f"validation results differing between validators: {mismatches}")
+    t_full = time_validator(full, records, args.repeat)
+    t_fast = time_validator(fast, records, args.repeat)
+    print(f"full validator: {t_full * 1e6:10.1f} us/record")
+    print(f"fast validator: {t_fast * 1e6:10.1f} us/record")
+    print(f"speedup:        {t_full / t_fast:10.1f}x")